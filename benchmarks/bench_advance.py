@@ -0,0 +1,87 @@
+"""Benchmark of moving through the tokens with :meth:`tokenize.advance`.
+
+Decodes a large mixed document with the precomputed sets of token kinds
+and with the lists of the kinds built from the token classes on every
+call.
+
+Run as ``python benchmarks/bench_advance.py``.
+"""
+import timeit
+
+from corpus import literals, name
+
+import neon
+from neon import decoder
+
+NEON_MIXED = """
+{0}:
+    class: {1}Handler
+    ports: [80, 443, {{internal: 8080}}]
+    entity: Column(type=integer, size={2})
+    children:
+        - Bart
+        - Lisa
+"""
+
+
+def mixed(count):
+    """Document mixing the block and the inline syntax."""
+    return literals(count // 2) + "".join(
+        NEON_MIXED.format("mixed" + name(i), name(i).title(), i)
+        for i in range(count // 2)
+    )
+
+
+def advance_classes(self, allowed=None, skip=None):
+    """Advances the tokens building the lists of the kinds on every call."""
+    allowed = allowed and list(allowed.tokens)
+    skip = skip and list(skip.tokens)
+    kind = self.next()
+    if skip is not None:
+        skips = (
+            [Token.kind for Token in skip]
+            if isinstance(skip, (list, tuple))
+            else (skip.kind,)
+        )
+        while kind in skips:
+            kind = self.next()
+    if allowed is None:
+        return kind
+    if not isinstance(allowed, (list, tuple)):
+        allowed = [allowed]
+    if all(kind != Token.kind for Token in allowed):
+        decoder.raise_error(allowed, self)
+    return kind
+
+
+def count_tokens(document):
+    tokens = decoder.tokenize(document, scanner=decoder.Scanner("off"))
+    count = 0
+    while tokens.next() != decoder.END:
+        count += 1
+    return count
+
+
+def main(count=4000):
+    document = mixed(count)
+    tokens = count_tokens(document)
+    advance = decoder.tokenize.advance
+    for label, method in [("classes", advance_classes), ("kinds", advance)]:
+        decoder.tokenize.advance = method
+        try:
+            elapsed = min(
+                timeit.repeat(
+                    lambda: neon.decode(document, datetime="off"), number=1, repeat=3
+                )
+            )
+        finally:
+            decoder.tokenize.advance = advance
+        print(
+            "{:<12} {:>8.3f} s {:>8.2f} us/token".format(
+                label, elapsed, elapsed / tokens * 1e6
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark of the latency of an event loop decoding a large file.
+
+A ticker coroutine sleeps for a millisecond in a loop while the file is
+decoded in the event loop by :func:`neon.decode`, or by :func:`neon.aload`
+in threads and in processes. The delays of the ticker are reported.
+
+Run as ``python benchmarks/bench_aio.py``.
+"""
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from corpus import literals
+
+import neon
+
+
+async def ticker(delays, done):
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        delays.append(time.perf_counter() - start - 0.001)
+
+
+async def measure(decode):
+    delays = []
+    done = asyncio.Event()
+    task = asyncio.ensure_future(ticker(delays, done))
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await decode()
+    elapsed = time.perf_counter() - start
+    done.set()
+    await task
+    delays.sort()
+    return elapsed, delays[int(len(delays) * 0.99)], delays[-1]
+
+
+def main(count=2000):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "config.neon")
+        with open(path, "w") as fp:
+            fp.write(literals(count))
+
+        async def blocking():
+            with open(path) as fp:
+                neon.decode(fp.read())
+
+        with ProcessPoolExecutor(1) as executor:
+            executor.submit(int).result()  # start the worker
+            for label, decode in [
+                ("decode", blocking),
+                ("aload thread", lambda: neon.aload(path)),
+                ("aload process", lambda: neon.aload(path, executor)),
+            ]:
+                elapsed, p99, worst = asyncio.run(measure(decode))
+                print(
+                    "{:<14} {:>7.3f} s   p99 delay {:>8.2f} ms   max {:>8.2f} ms".format(
+                        label, elapsed, p99 * 1000, worst * 1000
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
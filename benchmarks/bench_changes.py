@@ -0,0 +1,34 @@
+"""Benchmark of the differences between large decoded trees.
+
+Decodes a large document and the same document with a single changed
+value, and compares the time of decoding with the time of listing the
+changes between the trees and applying them to the original tree.
+
+Run as ``python benchmarks/bench_changes.py``.
+"""
+import timeit
+
+from corpus import literals
+
+import neon
+
+
+def main(count=10000):
+    document = literals(count)
+    changed = document.replace("port: {}".format(8000 + count // 2), "port: 1")
+    old = neon.decode(document, datetime="off")
+    new = neon.decode(changed, datetime="off")
+    changes = neon.diff(old, new)
+    print("{} changes: {}".format(len(changes), changes))
+
+    for label, function in [
+        ("decode", lambda: neon.decode(changed, datetime="off")),
+        ("diff", lambda: neon.diff(old, new)),
+        ("patch", lambda: neon.patch(old, changes)),
+    ]:
+        elapsed = min(timeit.repeat(function, number=1, repeat=5))
+        print("{:<8} {:>10.6f} s".format(label, elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark of decoding a large file.
+
+Compares reading the file into a string, loading it from a file object
+in chunks and decoding it by path, each in a new process to report its
+peak memory.
+
+Run as ``python benchmarks/bench_decode_file.py``.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+from corpus import literals
+
+CODE = """
+import resource, time, neon
+path = {path!r}
+start = time.perf_counter()
+if {method!r} == "decode":
+    with open(path, encoding="utf-8") as fp:
+        tree = neon.decode(fp.read(), datetime="off")
+elif {method!r} == "load":
+    with open(path, encoding="utf-8") as fp:
+        tree = neon.load(fp, datetime="off")
+else:
+    tree = neon.decode_file(path, datetime="off")
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def main(count=20000):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "config.neon")
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.write(literals(count))
+        size = os.path.getsize(path) / 1024 / 1024
+        print("{:.1f} MiB file".format(size))
+        for method in ["decode", "load", "decode_file"]:
+            output = subprocess.run(
+                [sys.executable, "-c", CODE.format(path=path, method=method)],
+                stdout=subprocess.PIPE,
+                universal_newlines=True,
+                check=True,
+            ).stdout
+            elapsed, rss = output.split()
+            print(
+                "{:<12} {:>8.3f} s   peak RSS {:>8.1f} MiB".format(
+                    method, float(elapsed), int(rss) / 1024
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark of encoding deep and wide trees.
+
+Compares :func:`neon.dump` with the recursive encoder, which copies the
+encoded items at every level of nesting.
+
+Run as ``python benchmarks/bench_encode.py``.
+"""
+import io
+import sys
+import timeit
+
+from corpus import name
+
+import neon
+
+
+def format_list(list_, indent_level):
+    indent = "\t" * indent_level
+    newline = "\n" if indent_level else "\n\n"
+    return newline.join(
+        ["{}- {}".format(indent, to_string(value, indent_level + 1)) for value in list_]
+    )
+
+
+def format_dict(dict_, indent_level):
+    indent = "\t" * indent_level
+    newline = "\n" if indent_level else "\n\n"
+    return newline.join(
+        [
+            "{}{}: {}".format(indent, key, to_string(value, indent_level + 1))
+            for key, value in dict_.items()
+        ]
+    )
+
+
+def to_string(obj, indent_level=0):
+    if isinstance(obj, dict):
+        return "\n" + format_dict(obj, indent_level)
+    elif isinstance(obj, list):
+        return "\n" + format_list(obj, indent_level)
+    elif obj is None:
+        return "Null"
+    return str(obj)
+
+
+def deep(depth):
+    """Chain of nested mappings, each with a few scalar items."""
+    tree = {}
+    for i in range(depth):
+        tree = {"name": name(i), "port": 8000 + i, "child": tree}
+    return tree
+
+
+def wide(count):
+    """Mapping of ``count`` small services."""
+    return {
+        "service" + name(i): {"class": name(i).title(), "tags": ["web", "internal"]}
+        for i in range(count)
+    }
+
+
+def main():
+    sys.setrecursionlimit(10000)
+    for label, tree in [
+        ("deep 100", deep(100)),
+        ("deep 1000", deep(1000)),
+        ("wide 20000", wide(20000)),
+    ]:
+        recursive = timeit.timeit(lambda: to_string(tree), number=3) / 3
+        streamed = timeit.timeit(lambda: neon.dump(tree, io.StringIO()), number=3) / 3
+        print(
+            "{:<12} recursive {:>8.4f} s   dump {:>8.4f} s".format(
+                label, recursive, streamed
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Benchmark of building frozen containers with the hooks.
+
+Decodes a large document and converts the tree to frozen mappings and
+tuples by a second traversal, and decodes the same document with the
+hooks building the frozen containers directly.
+
+Run as ``python benchmarks/bench_hooks.py``.
+"""
+import timeit
+import types
+
+from corpus import literals
+
+import neon
+
+
+def freeze(value):
+    """Copies the tree into frozen mappings and tuples."""
+    if isinstance(value, dict):
+        return types.MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def frozen(pairs):
+    return types.MappingProxyType(dict(pairs))
+
+
+def main(count=2000):
+    document = literals(count)
+    for label, function in [
+        ("plain", lambda: neon.decode(document)),
+        ("copy", lambda: freeze(neon.decode(document))),
+        (
+            "hooks",
+            lambda: neon.decode(document, object_pairs_hook=frozen, list_hook=tuple),
+        ),
+    ]:
+        elapsed = min(timeit.repeat(function, number=1, repeat=5))
+        print("{:<8} {:>8.3f} s".format(label, elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark of the time needed to import neon.
+
+Reports the cumulative import time of the ``neon`` package measured by
+``python -X importtime`` and the time of the first decode, which
+compiles the scanner.
+
+Run as ``python benchmarks/bench_import.py``.
+"""
+import statistics
+import subprocess
+import sys
+
+FIRST_DECODE = """
+import time
+start = time.perf_counter()
+import neon
+neon.decode("a: [b, 5, yes, null]")
+print(time.perf_counter() - start)
+"""
+
+
+def import_time():
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import neon"],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    for line in process.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if name.strip() == "neon":
+            return int(cumulative) / 1e6
+
+
+def first_decode_time():
+    process = subprocess.run(
+        [sys.executable, "-c", FIRST_DECODE],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    return float(process.stdout)
+
+
+def main(repeat=10):
+    imports = [import_time() for _ in range(repeat)]
+    decodes = [first_decode_time() for _ in range(repeat)]
+    print("import neon          {:>8.1f} ms".format(statistics.median(imports) * 1e3))
+    print("import and decode    {:>8.1f} ms".format(statistics.median(decodes) * 1e3))
+
+
+if __name__ == "__main__":
+    main()
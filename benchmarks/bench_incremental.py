@@ -0,0 +1,38 @@
+"""Benchmark of re-parsing a large document after small edits.
+
+Decodes a large document, then repeatedly changes a single value in the
+middle of it and compares the time of decoding the whole edited text
+with the time of an incremental edit.
+
+Run as ``python benchmarks/bench_incremental.py``.
+"""
+import timeit
+
+from corpus import literals
+
+import neon
+
+
+def main(count=10000):
+    text = literals(count)
+    old = "port: {}".format(8000 + count // 2)
+    offset = text.index(old)
+    document = neon.decode_incremental(text, datetime="off")
+    values = iter(range(10**9))
+
+    def edit():
+        value = "port: {:05d}".format(next(values) % 100000)
+        document.edit(offset, len(value), value)
+        return document.tree
+
+    assert edit() == neon.decode(document.source, datetime="off")
+    for label, function in [
+        ("decode", lambda: neon.decode(document.source, datetime="off")),
+        ("edit", edit),
+    ]:
+        elapsed = min(timeit.repeat(function, number=1, repeat=5))
+        print("{:<8} {:>10.6f} s".format(label, elapsed))
+
+
+if __name__ == "__main__":
+    main()
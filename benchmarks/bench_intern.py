@@ -0,0 +1,56 @@
+"""Benchmark of interning the strings of a decoded document.
+
+Decodes a large document of services with the same keys and repeated
+values with and without interning, and reports the time, the memory
+taken by the decoded tree and the memory saved as counted by the
+statistics.
+
+Run as ``python benchmarks/bench_intern.py``.
+"""
+import gc
+import timeit
+import tracemalloc
+
+from corpus import literals
+
+import neon
+
+
+def tree_size(document, intern):
+    """Memory allocated by the decoding and kept by the decoded tree."""
+    gc.collect()
+    tracemalloc.start()
+    tree = neon.decode(document, datetime="off", intern=intern)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del tree
+    return size
+
+
+def main(count=4000):
+    document = literals(count)
+    for intern in [False, True]:
+        elapsed = min(
+            timeit.repeat(
+                lambda: neon.decode(document, datetime="off", intern=intern),
+                number=1,
+                repeat=3,
+            )
+        )
+        size = tree_size(document, intern)
+        print(
+            "intern={!s:<6} {:>8.3f} s {:>8.1f} MiB tree".format(
+                intern, elapsed, size / 1024 / 1024
+            )
+        )
+    stats = neon.ParseStats()
+    neon.decode(document, datetime="off", intern=True, stats=stats)
+    print(
+        "interned {} strings, {:.1f} MiB saved".format(
+            stats.interned, stats.interned_bytes / 1024 / 1024
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
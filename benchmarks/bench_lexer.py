@@ -0,0 +1,58 @@
+"""Benchmark of the scanners of the tokens.
+
+Compares the throughput of scanning a large document by the compiled
+lexicon of the token patterns and by the linear-time lexer, and the
+time of scanning documents that the lexicon scans in quadratic time,
+runs of blank lines and a multi-line string read in chunks.
+
+Run as ``python benchmarks/bench_lexer.py``.
+"""
+import io
+import timeit
+
+from corpus import literals
+
+from neon.decoder import END, LEXERS, Scanner, tokenize
+
+
+def scan(document, lexer, chunk_size=64 * 1024):
+    if chunk_size < len(document):
+        document = io.StringIO(document)
+    tokens = tokenize(document, chunk_size, Scanner(infer=False, lexer=lexer))
+    count = 0
+    while tokens.advance() != END:
+        count += 1
+    return count
+
+
+def main(count=4000):
+    document = literals(count)
+    size = len(document) / 1024 / 1024
+    for lexer in LEXERS:
+        elapsed = min(timeit.repeat(lambda: scan(document, lexer), number=1, repeat=5))
+        print("{:<8} {:>8.2f} MiB/s".format(lexer, size / elapsed))
+
+    for lines in [5000, 10000, 20000]:
+        for label, document, chunk_size in [
+            ("blank lines", "k: 1" + "\n " * lines + "\nx: 1", 64 * 1024),
+            ("string", 'k: "' + "a\n" * lines * 10 + '"', 1024),
+        ]:
+            times = [
+                min(
+                    timeit.repeat(
+                        lambda: scan(document, lexer, chunk_size),
+                        number=1,
+                        repeat=3,
+                    )
+                )
+                for lexer in LEXERS
+            ]
+            print(
+                "{:<12} {:>6} lines {:>8.3f} s re {:>8.3f} s linear".format(
+                    label, document.count("\n"), *times
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
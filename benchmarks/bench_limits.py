@@ -0,0 +1,86 @@
+"""Benchmark of decoding adversarial documents with and without limits.
+
+Decodes documents crafted to take long, long literals with many inner
+spaces, deep nesting of brackets and indented blocks, and reports the
+time of decoding them without limits and with the limits of a service
+decoding small uploaded configs. The documents fit the limit of the
+size, so they are stopped by the other limits. The overhead of checking the limits is
+measured on a regular document.
+
+Run as ``python benchmarks/bench_limits.py``.
+"""
+import io
+import timeit
+
+from corpus import literals
+
+import neon
+from neon import errors
+
+#: Limits of a service decoding uploaded configs.
+LIMITS = neon.Limits(
+    max_depth=64, max_tokens=100000, max_bytes=1024 * 1024, max_length=4096
+)
+
+
+def documents(size):
+    """Adversarial documents of about ``size`` characters."""
+    return [
+        ("spaced literal", "k: " + "a " * (size // 2)),
+        ("long literal", "k: " + "a" * size),
+        ("trailing spaces", "k: a" + " " * size + ","),
+        ("deep brackets", "k: " + "[" * (size // 2) + "]" * (size // 2)),
+        ("unclosed brackets", "k: " + "[" * size),
+        ("deep indentation", "".join(" " * i + "k:\n" for i in range(size // 1000))),
+        ("many tokens", "k: [" + "1," * (size // 2) + "]"),
+    ]
+
+
+def unfinished(size):
+    """Long literal with inner spaces on a single line, a stream of it is
+    stopped by a low limit of scalars before the end of the line is read,
+    a string is scanned at once."""
+    return "k: " + "a " * size
+
+
+def decode(document, limits):
+    try:
+        neon.decode(document, datetime="off", limits=limits)
+    except (errors.ParserError, errors.TokenError) as e:
+        return type(e).__name__
+    return "ok"
+
+
+def main(size=1000 * 1000):
+    print("{:<18} {:>20} {:>26}".format("document", "no limits", "limits"))
+    for label, document in documents(size):
+        row = [label]
+        for limits in [None, LIMITS]:
+            result = decode(document, limits)
+            elapsed = min(
+                timeit.repeat(lambda: decode(document, limits), number=1, repeat=3)
+            )
+            row.append("{:.4f} s {:<11}".format(elapsed, result))
+        print("{:<18} {:>20} {:>26}".format(*row))
+
+    document = unfinished(2 * size)
+    limits = neon.Limits(max_length=100)
+    for label, read in [
+        ("string", lambda: document),
+        ("stream", lambda: io.StringIO(document)),
+    ]:
+        result = decode(read(), limits)
+        elapsed = min(timeit.repeat(lambda: decode(read(), limits), number=1, repeat=3))
+        row = "{:.4f} s {:<11}".format(elapsed, result)
+        print("{:<18} {:>20} {:>26}".format("unfinished " + label, "", row))
+
+    regular = literals(1000)
+    for limits in [None, neon.Limits(max_depth=64, max_length=4096)]:
+        elapsed = min(
+            timeit.repeat(lambda: decode(regular, limits), number=1, repeat=5)
+        )
+        print("regular document, limits={!s:<5} {:.4f} s".format(bool(limits), elapsed))
+
+
+if __name__ == "__main__":
+    main()
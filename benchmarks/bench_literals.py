@@ -0,0 +1,53 @@
+"""Benchmark of the classification of bare literals.
+
+Compares :meth:`neon.tokens.Literal.do` with the conversion chain that
+tries every type in turn, and measures decoding of a literal heavy
+document.
+
+Run as ``python benchmarks/bench_literals.py``.
+"""
+import timeit
+
+from corpus import literals, name
+
+import neon
+from neon import decoder
+from neon.tokens import Boolean, DateTime, Float, Integer, Literal, NoneValue, String
+
+
+def convert_chain(scanner, string):
+    for Type in [Integer, Float, Boolean, DateTime]:
+        value = Type.convert(string)
+        if value is not None:
+            return Type.kind, value
+    if string in NoneValue._variants:
+        return NoneValue.kind, None
+    return String.kind, string
+
+
+def main(count=2000):
+    words = [name(i).title() + "Handler" for i in range(count)]
+    words += ["Springfield", "yes", "Off", "null", "42", "1.5", "2014-01-20"] * (
+        count // 7
+    )
+    document = literals(count)
+
+    scanner = decoder.Scanner()
+    actions = decoder._compile()[1]
+    index = actions.index(Literal.do)
+    for label, convert in [("chain", convert_chain), ("classifier", Literal.do)]:
+        DateTime.cache.clear()
+        elapsed = timeit.timeit(lambda: [convert(scanner, w) for w in words], number=1)
+        print("{:<12} {:>8.1f} us/literal".format(label, elapsed / len(words) * 1e6))
+
+        DateTime.cache.clear()
+        actions[index] = convert
+        try:
+            elapsed = timeit.timeit(lambda: neon.decode(document), number=1)
+        finally:
+            actions[index] = Literal.do
+        print("{:<12} {:>8.3f} s to decode {} services".format("", elapsed, count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Benchmark of decoding many files.
+
+Compares decoding the files one by one with :func:`neon.decode_many`
+using processes and threads.
+
+Run as ``python benchmarks/bench_many.py``.
+"""
+import os
+import tempfile
+import timeit
+
+from corpus import literals
+
+import neon
+
+
+def write_files(directory, count):
+    """Writes ``count`` small NEON files of a few services each."""
+    paths = []
+    for number in range(count):
+        path = os.path.join(directory, "config{}.neon".format(number))
+        with open(path, "w") as fp:
+            fp.write(literals(number % 10 + 1))
+        paths.append(path)
+    return paths
+
+
+def decode_sequential(paths):
+    results = []
+    for path in paths:
+        with open(path) as fp:
+            results.append(neon.decode(fp.read()))
+    return results
+
+
+def main(count=2000):
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_files(directory, count)
+        for label, decode in [
+            ("sequential", decode_sequential),
+            ("process", lambda paths: neon.decode_many(paths)),
+            ("thread", lambda paths: neon.decode_many(paths, executor="thread")),
+        ]:
+            elapsed = min(timeit.repeat(lambda: decode(paths), number=1, repeat=3))
+            print("{:<12} {:>8.3f} s for {} files".format(label, elapsed, count))
+        print("{} processors".format(os.cpu_count()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark of decoding deep and wide documents.
+
+Run as ``python benchmarks/bench_nesting.py``.
+"""
+import timeit
+
+from corpus import name
+
+import neon
+
+
+def deep_brackets(depth):
+    """Inline mappings and lists nested ``depth`` levels deep."""
+    return "a: " + "{b: [" * (depth // 2) + "c" + "]}" * (depth // 2)
+
+
+def deep_indent(depth):
+    """Block mappings nested ``depth`` levels deep."""
+    return "\n".join(" " * i + name(i) + ":" for i in range(depth)) + " c"
+
+
+def wide(count):
+    """Mapping of ``count`` small services."""
+    return "\n".join(
+        "{}: {{class: {}, port: {}, tags: [web, internal]}}".format(
+            name(i), name(i).title(), 8000 + i
+        )
+        for i in range(count)
+    )
+
+
+def main():
+    for label, document, values in [
+        ("deep brackets 10000", deep_brackets(10000), 10000),
+        ("deep indent 2000", deep_indent(2000), 2000),
+        ("wide 20000", wide(20000), 20000 * 6),
+    ]:
+        elapsed = min(
+            timeit.repeat(
+                lambda: neon.decode(document, datetime="off"), number=1, repeat=3
+            )
+        )
+        print(
+            "{:<20} {:>8.3f} s {:>8.2f} us/value".format(
+                label, elapsed, elapsed / values * 1e6
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
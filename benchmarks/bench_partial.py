@@ -0,0 +1,28 @@
+"""Benchmark of decoding a single value of a large document.
+
+Compares decoding a whole large document with decoding the values of
+keys at its start, in its middle and at its end by
+:func:`neon.decode_path`.
+
+Run as ``python benchmarks/bench_partial.py``.
+"""
+import timeit
+
+from corpus import literals
+
+import neon
+
+
+def main(count=10000):
+    document = literals(count)
+    cases = [("decode", lambda: neon.decode(document))]
+    for number in [0, count // 2, count - 1]:
+        path = "service{}.port".format(number)
+        cases.append((path, lambda path=path: neon.decode_path(document, path)))
+    for label, function in cases:
+        elapsed = min(timeit.repeat(function, number=1, repeat=3))
+        print("{:<18} {:>10.6f} s".format(label, elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark of decoding into dataclasses with a schema.
+
+Decodes a large document of services and converts the decoded mappings
+to dataclasses afterwards, and decodes the same document with the
+dataclasses as a schema, where the string fields are never inferred.
+
+Run as ``python benchmarks/bench_schema.py``.
+"""
+import dataclasses
+import datetime
+import timeit
+from typing import Dict, List
+
+from corpus import name
+
+import neon
+
+NEON_SERVICE = """
+service{0}:
+    handler: App\\Service\\{1}Handler
+    city: Springfield
+    owner: Homer Simpson
+    version: 2014-01-{2:02d}
+    port: {3}
+    enabled: yes
+    created: 2014-01-{2:02d}
+    tags: [web, internal, Maggie, Lisa, Bart]
+"""
+
+
+@dataclasses.dataclass
+class Service:
+    handler: str
+    city: str
+    owner: str
+    version: str
+    port: int
+    enabled: bool
+    created: datetime.datetime
+    tags: List[str]
+
+
+def services(count):
+    return "".join(
+        NEON_SERVICE.format(i, name(i).title(), i % 28 + 1, 8000 + i)
+        for i in range(count)
+    )
+
+
+def post_process(document):
+    tree = neon.decode(document)
+    for key, value in tree.items():
+        value["version"] = str(value["version"].date())
+        tree[key] = Service(**value)
+    return tree
+
+
+def main(count=2000):
+    document = services(count)
+    schema = Dict[str, Service]
+    assert post_process(document) == neon.decode(document, schema=schema)
+    for label, function in [
+        ("post-process", lambda: post_process(document)),
+        ("schema", lambda: neon.decode(document, schema=schema)),
+    ]:
+        elapsed = min(timeit.repeat(function, number=1, repeat=5))
+        print("{:<14} {:>8.3f} s".format(label, elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark of the memory of workers reading a config published in
+shared memory.
+
+Every worker of a pool either decodes the same document into its own
+tree or attaches to the document published once by the parent, then
+reads all of its values. Reports the private memory each worker gained,
+from ``/proc/self/smaps_rollup`` (Linux only), and the time of reading
+all the values and of looking up a single key.
+
+Run as ``python benchmarks/bench_shared.py``.
+"""
+import multiprocessing
+import time
+
+from corpus import literals
+
+import neon
+
+
+def private_memory():
+    """Private memory of the process in KiB."""
+    total = 0
+    with open("/proc/self/smaps_rollup") as fp:
+        for line in fp:
+            if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                total += int(line.split()[1])
+    return total
+
+
+def walk(value):
+    """Reads all the values of the tree."""
+    if isinstance(value, dict) or hasattr(value, "items"):
+        for key, item in value.items():
+            walk(item)
+    elif isinstance(value, (list, tuple)) or hasattr(value, "__len__"):
+        if not isinstance(value, str):
+            for item in value:
+                walk(item)
+
+
+def worker(source):
+    before = private_memory()
+    if isinstance(source, str):
+        tree = neon.decode(source)
+    else:
+        tree = source.tree
+    start = time.perf_counter()
+    walk(tree)
+    elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(1000):
+        tree["service1999"]["port"]
+    lookup = (time.perf_counter() - start) / 1000
+    return private_memory() - before, elapsed, lookup
+
+
+def main(count=4000, workers=8):
+    document = literals(count)
+    published = neon.publish(document)
+    print(
+        "{} KiB of NEON, {} KiB published".format(
+            len(document) // 1024, published.size // 1024
+        )
+    )
+    context = multiprocessing.get_context("spawn")
+    try:
+        for name, source in [("decode", document), ("shared", published)]:
+            with context.Pool(workers) as pool:
+                results = pool.map(worker, [source] * workers)
+            memory = sum(result[0] for result in results) / workers
+            walking = min(result[1] for result in results)
+            lookup = min(result[2] for result in results)
+            print(
+                "{:>6} {:>8.0f} KiB per worker, read all {:>6.3f} s, "
+                "lookup {:>5.2f} us".format(name, memory, walking, lookup * 1e6)
+            )
+    finally:
+        published.close()
+        published.unlink()
+
+
+if __name__ == "__main__":
+    main()
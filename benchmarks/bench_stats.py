@@ -0,0 +1,32 @@
+"""Benchmark of collecting statistics of parsing.
+
+Decodes a large document without statistics and with them, and prints
+the collected statistics.
+
+Run as ``python benchmarks/bench_stats.py``.
+"""
+import timeit
+
+from corpus import literals
+
+import neon
+
+
+def main(count=2000):
+    document = literals(count)
+    for label, make_stats in [("disabled", lambda: None), ("enabled", neon.ParseStats)]:
+        elapsed = min(
+            timeit.repeat(
+                lambda: neon.decode(document, stats=make_stats()), number=1, repeat=5
+            )
+        )
+        print("{:<12} {:>8.3f} s".format(label, elapsed))
+
+    stats = neon.ParseStats()
+    neon.decode(document, stats=stats)
+    for name, value in stats.info().items():
+        print("  {:<24} {}".format(name, value))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Benchmark of decoding from many threads at once.
+
+Decodes the same number of small documents, e.g. per-tenant configs of
+a WSGI application, by thread pools of growing size and reports the
+throughput relative to a single thread. On builds with the GIL the
+throughput stays flat, threads only overlap on free-threaded builds.
+
+Run as ``python benchmarks/bench_threads.py``.
+"""
+import os
+import sys
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+
+from corpus import literals
+
+import neon
+
+
+def main(count=400, threads=(1, 2, 4, 8)):
+    documents = [literals(number % 10 + 1) for number in range(count)]
+    base = None
+    for workers in threads:
+        with ThreadPoolExecutor(workers) as executor:
+            elapsed = min(
+                timeit.repeat(
+                    lambda: list(executor.map(neon.decode, documents)),
+                    number=1,
+                    repeat=3,
+                )
+            )
+        throughput = count / elapsed
+        base = base or throughput
+        print(
+            "{:>2} threads {:>10.0f} documents/s {:>6.2f}x".format(
+                workers, throughput, throughput / base
+            )
+        )
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print("{} processors, GIL {}".format(os.cpu_count(), "on" if gil else "off"))
+
+
+if __name__ == "__main__":
+    main()
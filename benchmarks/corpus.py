@@ -0,0 +1,26 @@
+"""Generators of NEON documents used by the benchmarks."""
+
+
+def name(number):
+    """Unique name without digits, e.g. ``bcd`` for 123."""
+    return "".join(chr(ord("a") + int(digit)) for digit in str(number))
+
+
+def literals(count):
+    """Document of ``count`` services with mostly bare literal values."""
+    return "\n".join(
+        """
+service{0}:
+    class: App\\Service\\{3}Handler
+    city: Springfield
+    owner: Homer Simpson
+    port: {1}
+    ratio: 0.{0}
+    enabled: yes
+    created: 2014-01-{2:02d}
+    tags: [web, internal, Maggie, Lisa, Bart]
+""".format(
+            i, 8000 + i, i % 28 + 1, name(i).title()
+        )
+        for i in range(count)
+    )
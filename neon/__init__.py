@@ -1,18 +1,164 @@
 __author__ = "Pavel Dedik"
-from .decoder import parse
+from .changes import diff, patch
+from .decoder import CHUNK_SIZE, iterparse, parse, parse_file
+from .encoder import dump as dump_tree
 from .encoder import to_string
+from .incremental import IncrementalDocument
+from .lazy import LazyDocument
+from .limits import Limits
+from .parallel import decode_many as decode_files
+from .partial import decode_path as find_path
+from .snapshot import load_file as load_snapshot
+from .stats import ParseStats
 from .version import version as __version__
 
-__all__ = ("decode", "encode")
+__all__ = (
+    "Limits",
+    "ParseStats",
+    "adump",
+    "aload",
+    "attach",
+    "decode",
+    "decode_file",
+    "decode_incremental",
+    "decode_lazy",
+    "decode_many",
+    "decode_path",
+    "diff",
+    "dump",
+    "encode",
+    "iterparse",
+    "load",
+    "load_file",
+    "patch",
+    "publish",
+)
 
 
-def decode(config):
-    try:
-        string = config.read()
-    except AttributeError:
-        string = config
-    return parse(string)
+def _check_hooks(*hooks):
+    # A schema builds its own tree, the hooks would be silently ignored.
+    if any(hook is not None for hook in hooks):
+        raise TypeError("Hooks cannot be combined with a schema.")
+
+
+def decode(
+    config,
+    datetime="dateutil",
+    stats=None,
+    schema=None,
+    object_pairs_hook=None,
+    list_hook=None,
+    entity_hook=None,
+    intern=False,
+    limits=None,
+    lexer="re",
+):
+    if schema is not None:
+        _check_hooks(object_pairs_hook, list_hook, entity_hook)
+        from . import schema as typed  # imported on first use, it imports dataclasses
+
+        return typed.parse(
+            config, schema, CHUNK_SIZE, datetime, stats, intern, limits, lexer
+        )
+    return parse(
+        config,
+        CHUNK_SIZE,
+        datetime,
+        stats,
+        object_pairs_hook,
+        list_hook,
+        entity_hook,
+        intern,
+        limits,
+        lexer,
+    )
+
+
+def decode_file(path, chunk_size=CHUNK_SIZE, datetime="dateutil"):
+    return parse_file(path, chunk_size, datetime)
+
+
+def decode_incremental(config, datetime="dateutil"):
+    return IncrementalDocument(config, datetime)
+
+
+def decode_lazy(config, datetime="dateutil"):
+    return LazyDocument(config, datetime)
+
+
+def decode_many(paths, workers=None, executor="process", datetime="dateutil"):
+    return decode_files(paths, workers, executor, datetime=datetime)
+
+
+def decode_path(config, path, datetime="dateutil"):
+    return find_path(config, path, datetime)
+
+
+def load(
+    fp,
+    chunk_size=CHUNK_SIZE,
+    datetime="dateutil",
+    stats=None,
+    schema=None,
+    object_pairs_hook=None,
+    list_hook=None,
+    entity_hook=None,
+    intern=False,
+    limits=None,
+    lexer="re",
+):
+    if schema is not None:
+        _check_hooks(object_pairs_hook, list_hook, entity_hook)
+        from . import schema as typed
+
+        return typed.parse(
+            fp, schema, chunk_size, datetime, stats, intern, limits, lexer
+        )
+    return parse(
+        fp,
+        chunk_size,
+        datetime,
+        stats,
+        object_pairs_hook,
+        list_hook,
+        entity_hook,
+        intern,
+        limits,
+        lexer,
+    )
+
+
+def load_file(path, cache_dir=None, datetime="dateutil"):
+    return load_snapshot(path, cache_dir, datetime=datetime)
+
+
+def publish(config, name=None, datetime="dateutil"):
+    from . import shared  # imported on first use, multiprocessing is slow to import
+
+    return shared.publish(parse(config, datetime=datetime), name)
+
+
+def attach(name):
+    from . import shared
+
+    return shared.attach(name)
+
+
+def dump(tree, fp, chunk_size=CHUNK_SIZE):
+    dump_tree(tree, fp, chunk_size)
 
 
 def encode(tree):
     return to_string(tree)
+
+
+async def aload(path, executor=None, datetime="dateutil"):
+    from . import aio  # imported on first use, asyncio is slow to import
+
+    return await aio.aload(path, executor, datetime)
+
+
+async def adump(tree, path, executor=None, chunk_size=CHUNK_SIZE):
+    from . import aio
+
+    await aio.adump(tree, path, executor, chunk_size)
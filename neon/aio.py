@@ -0,0 +1,94 @@
+"""Decoding and encoding of files for :mod:`asyncio` applications.
+
+The files are read, decoded, encoded and written by an executor, so
+that the event loop is not blocked. Decodings of the same file that are
+requested while the file is being decoded share a single decoding.
+"""
+import asyncio
+import functools
+import os
+
+from .decoder import CHUNK_SIZE, parse
+from .encoder import dump
+
+#: Decodings in progress, pairs (future, number of waiters) by the event
+#: loop, the path and the options of decoding.
+_pending = {}
+
+
+def load_path(path, datetime="dateutil"):
+    """Reads and decodes a file.
+
+    :param path: Path to the NEON file.
+    :param datetime: Engine used to convert literals to datetimes.
+    :return: Decoded tree.
+    """
+    with open(path, encoding="utf-8") as fp:
+        return parse(fp, datetime=datetime)
+
+
+def dump_path(tree, path, chunk_size=CHUNK_SIZE):
+    """Encodes a tree and writes it to a file.
+
+    :param tree: Tree to encode.
+    :param path: Path to the NEON file.
+    :param chunk_size: Number of characters written at once.
+    :type chunk_size: int
+    """
+    with open(path, "w", encoding="utf-8") as fp:
+        dump(tree, fp, chunk_size)
+
+
+def _forget(key, entry, future):
+    if _pending.get(key) is entry:
+        del _pending[key]
+
+
+async def aload(path, executor=None, datetime="dateutil"):
+    """Decodes a file in an executor.
+
+    Concurrent calls with the same path and options wait for the same
+    decoding and get the same tree. Cancelling a call cancels the
+    decoding only if no other call waits for it and it has not started
+    yet.
+
+    :param path: Path to the NEON file.
+    :param executor: Executor decoding the file, the default executor
+        of the event loop if :obj:`None`.
+    :type executor: :class:`concurrent.futures.Executor`
+    :param datetime: Engine used to convert literals to datetimes.
+    :type datetime: str
+    :return: Decoded tree.
+    """
+    loop = asyncio.get_running_loop()
+    key = (loop, os.path.abspath(path), datetime)
+    entry = _pending.get(key)
+    if entry is None:
+        future = loop.run_in_executor(executor, load_path, path, datetime)
+        entry = _pending[key] = [future, 0]
+        future.add_done_callback(functools.partial(_forget, key, entry))
+
+    entry[1] += 1
+    try:
+        return await asyncio.shield(entry[0])
+    except asyncio.CancelledError:
+        if entry[1] == 1:
+            entry[0].cancel()
+        raise
+    finally:
+        entry[1] -= 1
+
+
+async def adump(tree, path, executor=None, chunk_size=CHUNK_SIZE):
+    """Encodes a tree and writes it to a file in an executor.
+
+    :param tree: Tree to encode.
+    :param path: Path to the NEON file.
+    :param executor: Executor encoding the tree, the default executor
+        of the event loop if :obj:`None`.
+    :type executor: :class:`concurrent.futures.Executor`
+    :param chunk_size: Number of characters written at once.
+    :type chunk_size: int
+    """
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(executor, dump_path, tree, path, chunk_size)
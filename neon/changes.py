@@ -0,0 +1,284 @@
+"""Structural differences between decoded trees.
+
+A change is a triple (operation, path, value), where the path is a tuple
+of the keys and indexes leading from the root of the tree to the changed
+value. Attributes of an entity are keyed as the items of a mapping.
+"""
+import operator
+from itertools import compress
+
+from .entity import Entity
+
+#: Operations of the changes.
+SET = "set"
+DELETE = "delete"
+SPLICE = "splice"
+
+
+def _items(value):
+    """Mapping or list of the items of a container, :obj:`None` if the
+    value is not a container."""
+    cls = value.__class__
+    if cls is dict or cls is list:
+        return value
+    if cls is Entity:
+        return value.attributes
+    return None
+
+
+#: Classes of the values whose items are compared one by one.
+_CONTAINERS = frozenset([dict, list, Entity])
+
+
+def _same(olds, news, compared=False):
+    """Tells whether all pairs of values are equal and of the same
+    classes, also in their items.
+
+    The values are compared level by level, the classes and the values
+    other than containers of a level are compared as lists in C and only
+    the containers are visited to list the items of the next level. No
+    recursion is involved, so deep trees do not exceed the recursion
+    limit.
+
+    :param olds: Original values.
+    :type olds: list
+    :param news: Changed values.
+    :type news: list
+    :param compared: Whether the pairs are known to be equal by ``==``,
+        only their classes are compared then.
+    :type compared: bool
+    :rtype: bool
+    """
+    while olds:
+        classes = list(map(type, olds))
+        if classes != list(map(type, news)):
+            return False
+        nested = list(map(_CONTAINERS.__contains__, classes))
+        if not compared and not all(nested):
+            values = list(map(operator.not_, nested))
+            if list(compress(olds, values)) != list(compress(news, values)):
+                return False
+        next_olds, next_news = [], []
+        for old, new in zip(compress(olds, nested), compress(news, nested)):
+            if old is new:
+                continue
+            cls = old.__class__
+            if cls is Entity:
+                next_olds.extend((old.value, old.attributes))
+                next_news.extend((new.value, new.attributes))
+                continue
+            if len(old) != len(new):
+                return False
+            if cls is list:
+                next_olds.extend(old)
+                next_news.extend(new)
+                continue
+            next_olds.extend(old.values())
+            try:
+                next_news.extend(map(new.__getitem__, old))
+            except KeyError:
+                return False
+        olds, news = next_olds, next_news
+    return True
+
+
+def _equal(old, new):
+    """Tells whether the values are equal and of the same classes, also
+    in their items, e.g. ``1`` and :obj:`True` are not equal."""
+    if old is new:
+        return True
+    if old.__class__ is not new.__class__:
+        return False
+    try:
+        if old != new:
+            return False
+    except AttributeError:
+        # Entity.__eq__ fails on other values.
+        return False
+    except RecursionError:
+        return _same([old], [new])
+    return _same([old], [new], True)
+
+
+def _unequal(old, new):
+    """Compares the values by ``!=``, an entity and another value are
+    different."""
+    try:
+        return old != new
+    except AttributeError:
+        return True
+
+
+def _different(olds, news):
+    """Flags the pairs of values that are not equal by :func:`_equal`.
+
+    The pairs are compared by ``==`` at once, which is done in C and finds
+    most of the different values. As it does not compare classes, the
+    classes are compared too and the remaining pairs are checked by
+    :func:`_same` together, they are checked one by one only if that
+    finds a difference.
+
+    :param olds: Original values.
+    :type olds: list
+    :param news: Changed values.
+    :type news: list
+    :return: Flags of the different pairs.
+    :rtype: list
+    :raises RecursionError: if the values are nested too deep to be
+        compared by ``==``.
+    """
+    try:
+        flags = list(map(operator.ne, olds, news))
+    except AttributeError:
+        flags = list(map(_unequal, olds, news))
+    classes = map(operator.is_not, map(type, olds), map(type, news))
+    flags = list(map(operator.or_, flags, classes))
+    equal = list(map(operator.not_, flags))
+    if not _same(list(compress(olds, equal)), list(compress(news, equal)), True):
+        flags = [
+            flag or not _same([old], [new], True)
+            for flag, old, new in zip(flags, olds, news)
+        ]
+    return flags
+
+
+def _visited(olds, news, deep):
+    """Flags the pairs of items visited by :func:`diff`.
+
+    :param olds: Original items.
+    :type olds: list
+    :param news: Changed items.
+    :type news: list
+    :param deep: Whether the items are nested too deep to be compared
+        by ``==``, all the pairs of distinct items are visited then.
+    :type deep: bool
+    :return: Flags of the pairs and whether the items are nested too
+        deep.
+    :rtype: tuple
+    """
+    if not deep:
+        try:
+            return _different(olds, news), False
+        except RecursionError:
+            pass
+    return list(map(operator.is_not, olds, news)), True
+
+
+def diff(old, new):
+    """Lists the changes turning one tree into another.
+
+    The items of a container are compared by :func:`_different` together
+    and only the different ones are visited, so the time depends mostly
+    on the size of the changed parts. A value replaced by a value of
+    another class is a change, e.g. ``1`` and :obj:`True` or ``1`` and
+    ``1.0``, as they are encoded differently. The trees are traversed
+    with an explicit stack, so they can be nested deeper than the
+    recursion limit.
+
+    :param old: Original tree.
+    :param new: Changed tree.
+    :return: List of the changes, the new values are not copied.
+    :rtype: list
+    """
+    changes = []
+    # Entries are (operation, path, old, new, deep), the pairs of values
+    # still to compare have no operation. The entries of a container are
+    # pushed in reverse, so the changes are listed in the order of the
+    # items.
+    stack = [(None, (), old, new, False)]
+    while stack:
+        operation, path, old, new, deep = stack.pop()
+        if operation is not None:
+            changes.append((operation, path, old))
+            continue
+        if old is new:
+            continue
+        cls = old.__class__
+        if cls is not new.__class__ or (
+            cls is Entity and not _equal(old.value, new.value)
+        ):
+            changes.append((SET, path, new))
+            continue
+        old_items, new_items = _items(old), _items(new)
+        if old_items is None:
+            if old != new:
+                changes.append((SET, path, new))
+            continue
+
+        entries = []
+        if old_items.__class__ is dict:
+            keys = list(filter(new_items.__contains__, old_items))
+            flags, deep = _visited(
+                list(map(old_items.__getitem__, keys)),
+                list(map(new_items.__getitem__, keys)),
+                deep,
+            )
+            flags = iter(flags)
+            for key, value in old_items.items():
+                if key not in new_items:
+                    entries.append((DELETE, path + (key,), None, None, None))
+                elif next(flags):
+                    other = new_items[key]
+                    entries.append((None, path + (key,), value, other, deep))
+            for key, value in new_items.items():
+                if key not in old_items:
+                    entries.append((SET, path + (key,), value, None, None))
+            stack.extend(reversed(entries))
+            continue
+
+        # Lists are compared after skipping the equal items at both ends,
+        # the rest is changed item by item if the length is kept and
+        # replaced by a single splice otherwise.
+        old_end, new_end = len(old_items), len(new_items)
+        end = min(old_end, new_end)
+        flags, deep = _visited(old_items[:end], new_items[:end], deep)
+        start = flags.index(True) if True in flags else end
+        if old_end != new_end:
+            tail = end - start
+            flags, deep = _visited(
+                old_items[old_end - tail :], new_items[new_end - tail :], deep
+            )
+            flags.reverse()
+            tail = flags.index(True) if True in flags else tail
+            items = new_items[start : new_end - tail]
+            changes.append((SPLICE, path, (start, old_end - tail, items)))
+            continue
+        for index in compress(range(start, end), flags[start:]):
+            value, other = old_items[index], new_items[index]
+            entries.append((None, path + (index,), value, other, deep))
+        stack.extend(reversed(entries))
+    return changes
+
+
+def patch(tree, changes):
+    """Applies the changes to the tree in place.
+
+    Mappings, lists and entities outside of the changed paths are kept,
+    so the objects of the unchanged parts of the tree stay the same.
+
+    :param tree: Tree to change.
+    :param changes: Changes as listed by :func:`diff`.
+    :return: Changed tree, a new value if the root itself is replaced.
+    """
+    for operation, path, value in changes:
+        if not path:
+            if operation == SPLICE:
+                start, stop, items = value
+                tree[start:stop] = items
+            else:
+                tree = value
+            continue
+        container = tree
+        for key in path[:-1]:
+            container = _items(container)[key]
+        key = path[-1]
+        if operation == SET:
+            _items(container)[key] = value
+        elif operation == DELETE:
+            del _items(container)[key]
+        elif operation == SPLICE:
+            start, stop, items = value
+            _items(container)[key][start:stop] = items
+        else:
+            raise ValueError("Unknown operation {!r}.".format(operation))
+    return tree
@@ -1,151 +1,881 @@
+import codecs
+import functools
+import operator
 import re
-
-from more_itertools import peekable
+import sys
+import time
+from array import array
 
 from . import errors
+from .entity import Entity
+from .lexer import Lexer
 from .tokens import (
     TOKENS,
+    Colon,
+    Comma,
+    DateTime,
     Dedent,
     End,
+    EqualSign,
+    Hyphen,
     Indent,
     LeftBrace,
     LeftRound,
     LeftSquare,
     NewLine,
+    Primitive,
     RightBrace,
     RightRound,
     RightSquare,
+    Unknown,
 )
-from .utils import lstripped
 
 #: Flags to use in the Scanner class.
 SCANNER_FLAGS = re.MULTILINE | re.UNICODE | re.VERBOSE
 
+#: Scanners of the tokens, the compiled lexicon of the token patterns or
+#: the linear-time :class:`neon.lexer.Lexer`.
+LEXERS = ("re", "linear")
+
+#: Number of characters read from a file object at once.
+CHUNK_SIZE = 64 * 1024
+
+#: Characters that may open a string spanning multiple lines.
+QUOTES = "\"'"
+
+#: Number of tokens scanned before they are handed over to the parser.
+BATCH_SIZE = 4096
+
+#: Maximum length of the strings interned by :class:`Scanner`.
+INTERN_LENGTH = 64
+
+#: Kinds of the tokens handled by the tokenizer.
+NEWLINE = NewLine.kind
+INDENT = Indent.kind
+DEDENT = Dedent.kind
+END = End.kind
+COLON = Colon.kind
+COMMA = Comma.kind
+EQUALSIGN = EqualSign.kind
+HYPHEN = Hyphen.kind
+LEFTROUND = LeftRound.kind
+LEFTSQUARE = LeftSquare.kind
+LEFTBRACE = LeftBrace.kind
+RIGHTROUND = RightRound.kind
+RIGHTSQUARE = RightSquare.kind
+RIGHTBRACE = RightBrace.kind
+
+#: Kinds of the tokens with values that may be followed by attributes.
+PRIMITIVES = frozenset(
+    TokenClass.kind for TokenClass in TOKENS if issubclass(TokenClass, Primitive)
+)
+
+#: Kinds of the tokens that open a nested value and cannot be keys.
+OPENERS = frozenset((LEFTROUND, LEFTSQUARE, LEFTBRACE, INDENT))
+
+#: Events generated by :func:`iterparse`.
+START_MAPPING = "start_mapping"
+END_MAPPING = "end_mapping"
+START_SEQUENCE = "start_sequence"
+END_SEQUENCE = "end_sequence"
+START_ENTITY = "start_entity"
+END_ENTITY = "end_entity"
+KEY = "key"
+SCALAR = "scalar"
+
+#: States of the parser in :func:`events`.
+(
+    _BLOCK,
+    _ROUND,
+    _ROUND_NAMED,
+    _ROUND_POSITIONAL,
+    _SQUARE,
+    _SQUARE_NEXT,
+    _BRACE,
+    _BRACE_NEXT,
+    _LIST,
+    _LIST_NEXT,
+    _DICT,
+    _DICT_NEXT,
+    _END_MAPPING,
+    _END_SEQUENCE,
+    _END_ENTITY,
+    _DONE,
+) = range(16)
+
+
+class Kinds(frozenset):
+    """Set of the kinds of the given tokens.
+
+    The tokens are kept in the given order to be listed in the error
+    messages of :meth:`tokenize.advance`.
+
+    :param tokens: Token classes.
+    """
+
+    __slots__ = ("tokens",)
+
+    def __new__(cls, *tokens):
+        kinds = super(Kinds, cls).__new__(cls, [Token.kind for Token in tokens])
+        kinds.tokens = tokens
+        return kinds
+
+
+#: Sets of the tokens skipped or allowed by :meth:`tokenize.advance`.
+SKIP_NEWLINE = Kinds(NewLine)
+SKIP_BLANK = Kinds(NewLine, Indent)
+EXPECT_COLON = Kinds(Colon)
+EXPECT_LINE_END = Kinds(End, NewLine, Dedent)
+EXPECT_LIST_ITEM = Kinds(Hyphen, Dedent)
+EXPECT_ROUND_ITEM = Kinds(EqualSign, Comma, RightRound)
+EXPECT_ROUND_END = Kinds(Comma, RightRound)
+EXPECT_SQUARE_END = Kinds(Comma, RightSquare)
+EXPECT_BRACE_END = Kinds(Comma, RightBrace)
+
+#: Start events, end states and states of the values in brackets
+#: by kind of the opening bracket.
+NESTED = {
+    LEFTROUND: (START_MAPPING, _END_MAPPING, _ROUND),
+    LEFTSQUARE: (START_SEQUENCE, _END_SEQUENCE, _SQUARE),
+    LEFTBRACE: (START_MAPPING, _END_MAPPING, _BRACE),
+}
+
+#: Change of the bracket depth by kind of the token.
+DEPTH = [0] * len(TOKENS)
+for TokenClass in (LeftRound, LeftSquare, LeftBrace):
+    DEPTH[TokenClass.kind] = 1
+for TokenClass in (RightRound, RightSquare, RightBrace):
+    DEPTH[TokenClass.kind] = -1
+
+#: Change of the nesting depth by kind of the token, counting the brackets
+#: and the indented blocks.
+NESTING = list(DEPTH)
+NESTING[Indent.kind] = 1
+NESTING[Dedent.kind] = -1
+
+#: Kinds of the tokens opening and closing a nesting level.
+OPENING = tuple(kind for kind, change in enumerate(NESTING) if change > 0)
+CLOSING = tuple(kind for kind, change in enumerate(NESTING) if change < 0)
+
+
+def _read(source, chunk_size):
+    """Reads the input in chunks.
+
+    :param source: String, UTF-8 encoded bytes or file object to read,
+        a binary file object or a memory map is read as UTF-8.
+    :param chunk_size: Number of characters or bytes read from a file
+        object at once.
+    :type chunk_size: int
+    :return: Iterator of strings or bytes, see :func:`_decoded`.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        yield source
+        return
+    try:
+        read = source.read
+    except AttributeError:
+        yield str(source)
+        return
+    chunk = read(chunk_size)
+    while chunk:
+        yield chunk
+        chunk = read(chunk_size)
+
+
+def _text(source):
+    """Reads the whole input as a string.
+
+    :param source: String, UTF-8 encoded bytes or file object to read,
+        a binary file object or a memory map is read as UTF-8.
+    :rtype: str
+    """
+    try:
+        read = source.read
+    except AttributeError:
+        pass
+    else:
+        source = read()
+    if isinstance(source, (bytes, bytearray)):
+        return source.decode("utf-8")
+    return str(source)
+
+
+class Scanner(object):
+    """Options of scanning passed to the actions of the tokens.
+
+    :param datetime: Engine used to convert literals to datetimes,
+        one of :attr:`DateTime.engines`.
+    :type datetime: str
+    :param infer: Whether the types of bare literals are inferred,
+        otherwise they are kept as :class:`Literal` tokens.
+    :type infer: bool
+    :param stats: Statistics to collect, if any.
+    :type stats: :class:`neon.stats.ParseStats`
+    :param strings: Table of the interned strings, keys and string values
+        of at most :data:`INTERN_LENGTH` characters are replaced by the
+        equal strings of the table, if given.
+    :type strings: dict
+    :param limits: Limits of the document, checked by :class:`tokenize`.
+    :type limits: :class:`neon.limits.Limits`
+    :param lexer: Scanner of the tokens, one of :data:`LEXERS`.
+    :type lexer: str
+    """
+
+    __slots__ = ("datetime", "infer", "stats", "strings", "limits", "lexer")
+
+    def __init__(
+        self,
+        datetime="dateutil",
+        infer=True,
+        stats=None,
+        strings=None,
+        limits=None,
+        lexer="re",
+    ):
+        if datetime not in DateTime.engines:
+            raise ValueError("Unknown datetime engine {!r}.".format(datetime))
+        if lexer not in LEXERS:
+            raise ValueError("Unknown lexer {!r}.".format(lexer))
+        self.datetime = datetime
+        self.infer = infer
+        self.stats = stats
+        self.strings = strings
+        self.limits = limits
+        self.lexer = lexer
+
+
+def _decoded(chunks):
+    """Decodes the chunks of UTF-8 encoded bytes to strings.
+
+    Bytes are decoded before they are scanned, so that the tokens are
+    the same as of the decoded string, e.g. with Unicode white-space.
+    A character split on a chunk boundary is decoded with the next chunk.
+    """
+    decoder = None
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            yield chunk
+            continue
+        if decoder is None:
+            decoder = codecs.getincrementaldecoder("utf-8")()
+        chunk = decoder.decode(chunk)
+        if chunk:
+            yield chunk
+    if decoder is not None:
+        yield decoder.decode(b"", final=True)
+
+
+def _limited(chunks, max_bytes):
+    """Reads the chunks of the input checking its size."""
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        if size > max_bytes:
+            raise errors.LimitError(
+                "Input exceeds the limit of {} bytes.".format(max_bytes)
+            )
+        yield chunk
+
+
+def _exceeded(tokens, size, count, depth, max_tokens, max_depth, max_length):
+    """Checks the limits token by token from the given index of the buffer.
+
+    :return: Nesting depth after the tokens.
+    :raises: :class:`errors.LimitError` at the first exceeding token.
+    """
+    kinds = tokens.kinds
+    starts = tokens.starts
+    ends = tokens.ends
+    for index in range(size, len(kinds)):
+        kind = kinds[index]
+        if kind == END:
+            break
+        count += 1
+        depth += NESTING[kind]
+        if count > max_tokens:
+            msg = "Document exceeds the limit of {} tokens".format(max_tokens)
+        elif depth > max_depth:
+            msg = "Nesting exceeds the limit of {} levels".format(max_depth)
+        elif kind in PRIMITIVES and ends[index] - starts[index] > max_length:
+            raise _too_long(max_length, tokens.lines[index])
+        else:
+            continue
+        raise errors.LimitError("{} on line {}.".format(msg, tokens.lines[index]))
+    return depth
+
+
+def _too_long(max_length, line):
+    """Error of a scalar exceeding the limit of its length."""
+    return errors.LimitError(
+        "Scalar exceeds the limit of {} characters on line {}.".format(max_length, line)
+    )
+
+
+def _unfinished(buffer, pos, max_length, line):
+    """Checks the length of the scalars on the unfinished line at the end
+    of the buffer, before the rest of the line is read.
+
+    The tokens are scanned from the given offset only to be measured, they
+    are scanned again once the line is complete. An unterminated string
+    is measured to the end of the buffer.
+
+    :param buffer: Unfinished line.
+    :type buffer: str
+    :param pos: Offset of a token to scan from.
+    :type pos: int
+    :param max_length: Maximum length of a scalar.
+    :type max_length: int
+    :param line: Number of the line at the start of the buffer.
+    :type line: int
+    :return: Offset of the last but one token, the last tokens may still
+        change with the rest of the line.
+    :raises: :class:`errors.LimitError` if a scalar is already longer
+        than the limit.
+    """
+    compiled, _, unknown = _compile()
+    scalars = _scalar_groups()
+    match = compiled.scanner.scanner(buffer, pos).match
+    resume = last = pos
+    m = match()
+    while m is not None:
+        start, stop = m.span()
+        if start == stop:
+            break
+        group = m.lastindex
+        if (
+            group in scalars or (group == unknown and buffer[start] in QUOTES)
+        ) and stop - start > max_length:
+            raise _too_long(max_length, line + buffer.count("\n", 0, start))
+        resume, last = last, start
+        m = match()
+    return resume
+
+
+def _limited_fill(tokens, fill, limits):
+    """Wraps the generator filling the token buffer to check the limits
+    of every scanned batch of tokens before it is parsed.
+
+    A batch is checked token by token only if counting its tokens shows
+    that it may exceed a limit.
+    """
+    unlimited = sys.maxsize
+    max_depth = unlimited if limits.max_depth is None else limits.max_depth
+    max_tokens = unlimited if limits.max_tokens is None else limits.max_tokens
+    max_length = unlimited if limits.max_length is None else limits.max_length
+    kinds = tokens.kinds
+    starts = tokens.starts
+    ends = tokens.ends
+    count = depth = 0
+    while True:
+        size = len(kinds)
+        try:
+            next(fill)
+        except StopIteration:
+            return
+        batch = kinds[size:]
+        added = len(batch) - batch.count(END)
+        opened = sum(map(batch.count, OPENING))
+        longest = 0
+        if max_length != unlimited and batch:
+            longest = max(map(operator.sub, ends[size:], starts[size:]))
+        if (
+            count + added > max_tokens
+            or depth + opened > max_depth
+            or (longest > max_length)
+        ):
+            depth = _exceeded(
+                tokens, size, count, depth, max_tokens, max_depth, max_length
+            )
+        else:
+            depth += opened - sum(map(batch.count, CLOSING))
+        count += added
+        yield
+
+
+def _measured(action, stats):
+    """Wraps the action of a token to measure the time of conversion."""
+    if action is None:
+        return None
+    clock = time.perf_counter
+    times = stats.times
+
+    def do(scanner, string):
+        start = clock()
+        try:
+            return action(scanner, string)
+        finally:
+            times["convert"] += clock() - start
+
+    return do
+
+
+def _interning(action, strings, stats=None):
+    """Wraps the action of a token to intern the short strings."""
+    if action is None:
+        return None
+    setdefault = strings.setdefault
+
+    def do(scanner, string):
+        kind, value = action(scanner, string)
+        if value.__class__ is str and len(value) <= INTERN_LENGTH:
+            value = setdefault(value, value)
+        return kind, value
+
+    def counting(scanner, string):
+        kind, value = action(scanner, string)
+        if value.__class__ is str and len(value) <= INTERN_LENGTH:
+            interned = setdefault(value, value)
+            if interned is not value:
+                stats.interned += 1
+                stats.interned_bytes += sys.getsizeof(value)
+                value = interned
+        return kind, value
+
+    return do if stats is None else counting
+
+
+@functools.lru_cache(maxsize=None)
+def _compile():
+    """Compiles the Scanner on first use.
+
+    The Scanner is instantiated with a list of re's and associated
+    functions. It is used to scan a string, returning a list of parts
+    which match the given re's.
+
+    See: http://stackoverflow.com/a/17214398/2874089
+
+    :return: Triple of the Scanner, the token actions indexed by the
+        group of the Scanner's lexicon and the group of unknown tokens.
+    """
+    lexicon = [
+        TokenClass.getscan() for TokenClass in TOKENS if TokenClass.re is not None
+    ]
+    actions = [None] + [action for _, action in lexicon]
+    unknown = actions.index(Unknown.do)
+    compiled = re.Scanner(lexicon, flags=SCANNER_FLAGS)
+    return compiled, actions, unknown
+
+
+@functools.lru_cache(maxsize=None)
+def _scalar_groups():
+    """Groups of the Scanner's lexicon matching scalars."""
+    classes = [TokenClass for TokenClass in TOKENS if TokenClass.re is not None]
+    return frozenset(
+        group
+        for group, TokenClass in enumerate(classes, 1)
+        if issubclass(TokenClass, Primitive)
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _quote_search(quote):
+    """Compiles the search of the closing quote or an escape of a string."""
+    return re.compile(r"[{}\\]".format(quote)).search
+
+
+def _string_end(text, pos, quote, escaped):
+    """Searches the text for the end of an unterminated string.
+
+    :param text: Text following the start of the string.
+    :param pos: Offset in the text to search from.
+    :type pos: int
+    :param quote: Quote of the string.
+    :type quote: str
+    :param escaped: Whether the previous text ended with a backslash.
+    :type escaped: bool
+    :return: Pair of the offset after the closing quote, -1 if the string
+        can never be terminated as a new line cannot be escaped or
+        :obj:`None` if it is not terminated in the text, and whether the
+        text ends with a backslash.
+    """
+    search = _quote_search(quote)
+    if escaped:
+        if pos >= len(text):
+            return None, True
+        if text[pos] == "\n":
+            return -1, False
+        pos += 1
+    while True:
+        found = search(text, pos)
+        if found is None:
+            return None, False
+        index = found.start()
+        if text[index] == quote:
+            return index + 1, False
+        if index + 1 == len(text):
+            return None, True
+        if text[index + 1] == "\n":
+            return -1, False
+        pos = index + 2
+
+
+def _tokenize(tokens, chunks, scanner, line=1):
+    """Scans chunks of the input string into the token buffer.
+
+    Only complete lines of the buffered input are scanned, the rest is
+    kept until the next chunk is read, so that no token is split on a
+    chunk boundary. The white-space at the end of the complete lines is
+    kept too, as a comment in the next chunk would match it. An
+    unterminated string is only searched for its end in the next chunks
+    and then scanned once. White-space at the start and at the end of the
+    input is dropped as if the input was stripped, new lines are still
+    counted in the numbers of the lines.
+
+    The generator yields whenever a batch of tokens is appended to the
+    buffer and finishes once the :class:`End` token is appended.
 
-def _tokenize(input_string):
-    position = len(lstripped(input_string)) + 1
-    tokens, _ = _scanner.scan(input_string.strip())
-    tokens = peekable(tokens)
+    :param tokens: Token buffer to fill.
+    :type tokens: :class:`tokenize`
+    :param chunks: Iterable of strings.
+    :param scanner: Options of scanning.
+    :type scanner: :class:`Scanner`
+    :param line: Number of the first line.
+    :type line: int
+    """
+    chunks = iter(chunks)
+    chunk = next(chunks, None)
+    compiled, actions, unknown = _compile()
+    lexer = None
+    if scanner.lexer == "linear":
+        lexer = Lexer(SCANNER_FLAGS)
+    if scanner.strings is not None:
+        strings, stats = scanner.strings, scanner.stats
+        actions = [_interning(action, strings, stats) for action in actions]
+    if scanner.stats is not None:
+        actions = [_measured(action, scanner.stats) for action in actions]
+    kinds = tokens.kinds
+    values = tokens.values
+    lines = tokens.lines
+    starts = tokens.starts
+    ends = tokens.ends
+
+    add_kind = kinds.append
+    add_value = values.append
+    add_line = lines.append
+    add_start = starts.append
+    add_end = ends.append
+
+    buffer = ""
+    # Chunks waiting to be scanned with the rest of the buffer, while it
+    # is an unterminated string or white-space.
+    parts = []
+    quote = None
+    escaped = False
+    offset = 0
+    line_pos = 0
+    pending = []
+    final = chunk is None
+    leading = True
 
     curr_indent = 0
     indent_stack = [0]
     newline_last = False
+    batch_size = BATCH_SIZE
     inside_bracket = 0
+    last_kind = None
+    # Scalars on an unfinished line are checked against the limit of
+    # their length before the rest of the line is read, from the offset
+    # of the last tokens that may still change.
+    limits = scanner.limits
+    max_length = None if limits is None else limits.max_length
+    resume = 0
+
+    while not final:
+        if leading:
+            stripped = chunk.lstrip()
+            skipped = len(chunk) - len(stripped)
+            line += chunk.count("\n", 0, skipped)
+            offset += skipped
+            chunk = stripped
+            leading = not chunk
+        if not parts:
+            buffer = buffer + chunk if buffer else chunk
+            waiting = False
+        elif quote is None:
+            parts.append(chunk)
+            waiting = chunk.isspace()
+        else:
+            parts.append(chunk)
+            closing, escaped = _string_end(chunk, 0, quote, escaped)
+            waiting = closing is None
+        # The next chunk is read ahead to know whether this one is final.
+        chunk = next(chunks, None)
+        final = chunk is None
+        if waiting and not final:
+            if max_length is not None and quote is not None:
+                if sum(map(len, parts)) > max_length:
+                    raise _too_long(max_length, line)
+            continue
+        if parts:
+            buffer = "".join(parts)
+            parts = []
+            quote = None
+            resume = 0
+        if final:
+            end = limit = len(buffer)
+            while limit and buffer[limit - 1].isspace():
+                limit -= 1
+        else:
+            # The comment pattern matches the white-space before it, with
+            # new lines, so the scan stops at the new line ending the last
+            # line with a token.
+            end = buffer.rfind("\n") + 1
+            if end:
+                end = buffer.find("\n", len(buffer[:end].rstrip()), end)
+            if not end:
+                if buffer.isspace():
+                    parts.append(buffer)
+                elif max_length is not None:
+                    resume = _unfinished(buffer, resume, max_length, line)
+                continue
+            limit = end
 
-    while tokens:
-        indent_change = 0
-        tok = next(tokens)
-        tok.line = position
-
-        # If inside brackets, no Indent/Dedent tokens are yielded.
-        if tok.id in (LeftRound.id, LeftSquare.id, LeftBrace.id):
-            inside_bracket += 1
-        elif tok.id in (RightRound.id, RightSquare.id, RightBrace.id):
-            inside_bracket -= 1
-
-        # Determination of current indentation and indentation change
-        # is necessary for correct generation of the Indent/Dedent tokens.
-        if newline_last and not inside_bracket:
-            indent = tok.value if tok.id == Indent.id else 0
-            if indent != curr_indent:
-                indent_change = indent - curr_indent
-                curr_indent = indent
-
-        # Here we determine the position of a token in the input string.
-        if tok.id == NewLine.id:
-            newline_last = True
-            while tokens.peek().id == NewLine.id:
-                tok.value = next(tokens).value
-            position += tok.value
+        # The shared compiled pattern is only used to create a matcher of
+        # this buffer, unlike re.Scanner.scan no state is kept on the
+        # Scanner, so tokenizing is reentrant and safe in threads.
+        if lexer is None:
+            match = compiled.scanner.scanner(buffer, 0, limit).match
         else:
-            newline_last = False
-
-        # If indentation decreased we want to generate the needed dedent
-        # tokens. These tokens are instantiated here as they cannot be
-        # matched by regular expression.
-        if indent_change < 0:
-            while indent_stack[-1] > curr_indent:
-                yield Dedent(indent_stack.pop(), line=position)
-                yield NewLine(1, line=position)
-
-        # If indentation increased we want to yield the indent token.
-        if indent_change > 0:
-            indent_stack.append(curr_indent)
-            yield tok
-
-        # We don't want to yield any other Indent tokens as our goal is
-        # to represent the left/right braces with Indent/Dedent tokens.
-        if tok.id != Indent.id and not (inside_bracket and tok.id == NewLine.id):
-            yield tok
+            match = lexer.scanner(buffer, limit)
+        m = match()
+        while m is not None:
+            start, stop = m.span()
+            if start == stop:
+                break
+            group = m.lastindex
+
+            # An unterminated quote is most likely a multi-line string
+            # that continues in the next chunk, unless it can never be
+            # terminated.
+            if group == unknown and not final and buffer[start] in QUOTES:
+                closing, escaped = _string_end(buffer, start + 1, buffer[start], False)
+                if closing != -1:
+                    if closing is None:
+                        quote = buffer[start]
+                    end = start
+                    break
+
+            m = match()
+            do = actions[group]
+            if do is None:
+                continue
+
+            kind, value = do(scanner, buffer[start:stop])
+            line += buffer.count("\n", line_pos, start)
+            line_pos = start
+
+            # Tokens in the middle of a line need no indentation handling.
+            if not pending and kind != NEWLINE and kind != INDENT:
+                inside_bracket += DEPTH[kind]
+                last_kind = kind
+                add_kind(kind)
+                add_value(value)
+                add_line(line)
+                add_start(offset + start)
+                add_end(offset + stop)
+                # Long lines are yielded in batches too, e.g. to check
+                # the limits of deeply nested brackets early.
+                if len(kinds) > batch_size:
+                    yield
+                continue
+
+            # New lines and indentation are held back until it is known
+            # that they are neither leading nor trailing.
+            if last_kind is not None:
+                pending.append((kind, value, line, offset + start, offset + stop))
+            if kind == NEWLINE or kind == INDENT:
+                continue
+
+            for kind, value, line, start, stop in pending:
+                # Consecutive new lines are merged into a single token.
+                if kind == NEWLINE and last_kind == NEWLINE:
+                    continue
+                last_kind = kind
+                indent_change = 0
+
+                # If inside brackets, no Indent/Dedent tokens are generated.
+                inside_bracket += DEPTH[kind]
+
+                # Determination of current indentation and indentation
+                # change is necessary for correct generation of the
+                # Indent/Dedent tokens.
+                if newline_last and not inside_bracket:
+                    indent = value if kind == INDENT else 0
+                    if indent != curr_indent:
+                        indent_change = indent - curr_indent
+                        curr_indent = indent
+                newline_last = kind == NEWLINE
+
+                # If indentation decreased we want to generate the needed
+                # dedent tokens. These tokens are instantiated here as they
+                # cannot be matched by regular expression.
+                if indent_change < 0:
+                    while indent_stack[-1] > curr_indent:
+                        kinds.extend((DEDENT, NEWLINE))
+                        values.extend((indent_stack.pop(), 1))
+                        lines.extend((line, line))
+                        starts.extend((start, start))
+                        ends.extend((start, start))
+
+                # If indentation increased we want to keep the indent token,
+                # any other Indent tokens are dropped as our goal is to
+                # represent the left/right braces with Indent/Dedent tokens.
+                if indent_change > 0:
+                    indent_stack.append(curr_indent)
+                elif kind == INDENT or (inside_bracket and kind == NEWLINE):
+                    continue
+
+                add_kind(kind)
+                add_value(value)
+                add_line(line)
+                add_start(start)
+                add_end(stop)
+
+            pending.clear()
+            if len(kinds) > batch_size:
+                yield
+
+        line += buffer.count("\n", line_pos, end)
+        line_pos = 0
+        offset += end
+        buffer = buffer[end:]
+        resume = 0
+        if quote is not None or buffer.isspace():
+            parts.append(buffer)
+        yield
 
     while len(indent_stack) > 1:
-        yield Dedent(indent_stack.pop(), line=position)
+        kinds.append(DEDENT)
+        values.append(indent_stack.pop())
+        lines.append(line)
+        starts.append(offset)
+        ends.append(offset)
+
+    kinds.append(END)
+    values.append(None)
+    lines.append(0)
+    starts.append(offset)
+    ends.append(offset)
+    yield
 
 
-class tokenize(peekable):
+class tokenize(object):
     """Tokenizes an input string.
 
-    :param input_string: String to be tokenized.
+    The tokens are kept in parallel arrays of kinds, values, lines and
+    start/end offsets in the input. The input is scanned lazily, a file
+    object is read in chunks as the tokens are consumed, and consumed
+    tokens are discarded from the buffer.
+
+    :param input_string: String or file object to be tokenized.
     :type input_string: str
-    :return: List of pairs (token type, value).
+    :param chunk_size: Number of characters read from a file object
+        at once.
+    :type chunk_size: int
+    :param scanner: Options of scanning.
+    :type scanner: :class:`Scanner`
+    :param line: Number of the first line.
+    :type line: int
     """
 
-    def __init__(self, input_string):
-        tokens = _tokenize(str(input_string))
-        super(tokenize, self).__init__(tokens)
+    __slots__ = ("kinds", "values", "lines", "starts", "ends", "pos", "_fill")
+
+    def __init__(self, input_string, chunk_size=CHUNK_SIZE, scanner=None, line=1):
+        self.kinds = array("b")
+        self.values = []
+        self.lines = array("q")
+        self.starts = array("q")
+        self.ends = array("q")
+        self.pos = -1
+        scanner = scanner or Scanner()
+        chunks = _read(input_string, chunk_size)
+        limits = scanner.limits
+        if limits is not None and limits.max_bytes is not None:
+            chunks = _limited(chunks, limits.max_bytes)
+        chunks = _decoded(chunks)
+        self._fill = _tokenize(self, chunks, scanner, line)
+        if limits is not None:
+            self._fill = _limited_fill(self, self._fill, limits)
+
+    @property
+    def value(self):
+        """Value of the current token."""
+        return self.values[self.pos]
+
+    @property
+    def line(self):
+        """Line of the current token, zero at the end of input."""
+        return self.lines[self.pos]
+
+    def _more(self):
+        """Scans more tokens, discarding the consumed ones.
+
+        :return: :obj:`False` if there are no more tokens to scan.
+        """
+        pos = self.pos
+        if pos > 0:
+            for items in (self.kinds, self.values, self.lines, self.starts, self.ends):
+                del items[:pos]
+            self.pos = 0
+        return next(self._fill, False) is not False
 
     def next(self):
-        try:
-            return self.__next__()
-        except (StopIteration, RuntimeError):
-            return End()
+        """Moves to the next token.
+
+        :return: Kind of the token, :class:`End` at the end of input.
+        """
+        while self.pos + 1 >= len(self.kinds):
+            if not self._more():
+                return self.kinds[self.pos]
+        self.pos += 1
+        return self.kinds[self.pos]
 
     def advance(self, allowed=None, skip=None):
         """Helper for iterating through tokens.
 
-        :param allowed: Optional list of allowed tokens. Default is
+        :param allowed: Optional set of allowed tokens. Default is
             any token. If the found token is not allowed, the function
             raises syntax error.
-        :type allowed: :class:`Token` or iterable of tokens
-        :param skip: If specified, a sequence of given token types
-            is skipped first. Default is :obj:`False`.
-        :type skip: Token | list[Token]
+        :type allowed: :class:`Kinds`
+        :param skip: If specified, the tokens of the given kinds are
+            skipped first.
+        :type skip: :class:`Kinds`
+        :return: Kind of the token.
         """
-        tok = self.next()
+        pos = self.pos + 1
+        kinds = self.kinds
+        if pos < len(kinds):
+            self.pos = pos
+            kind = kinds[pos]
+        else:
+            kind = self.next()
         if skip is not None:
-            skips = (
-                map(lambda tok: tok.id, skip)
-                if isinstance(skip, (list, tuple))
-                else {skip.id}
-            )
-            while tok.id in skips:
-                tok = self.next()
-        if allowed is None:
-            return tok
-        if not isinstance(allowed, (list, tuple)):
-            allowed = [allowed]
-        if all(tok.id != Token.id for Token in allowed):
-            raise_error(allowed, tok)
-        return tok
+            while kind in skip:
+                kind = self.next()
+        if allowed is not None and kind not in allowed:
+            raise_error(allowed.tokens, self)
+        return kind
 
     def peek(self):
-        try:
-            return super(tokenize, self).peek()
-        except (StopIteration, RuntimeError):
-            return End()
+        """Kind of the next token, :class:`End` at the end of input."""
+        while self.pos + 1 >= len(self.kinds):
+            if not self._more():
+                return END
+        return self.kinds[self.pos + 1]
 
 
-def raise_error(expected, token):
+def raise_error(expected, tokens):
     """Raises an error with some information about position etc.
 
     :param expected: List of expected tokens.
-    :param token: Received token.
+    :param tokens: Token buffer positioned at the received token.
     :raises: :class:`errors.ParserError`
     """
-    msg = "Unexpected {}".format(token.name)
-    if token.line:
-        msg += " on line {}".format(token.line)
-    if expected and token.id != Indent.id:
+    kind = tokens.kinds[tokens.pos]
+    msg = "Unexpected {}".format(TOKENS[kind].name)
+    if tokens.line:
+        msg += " on line {}".format(tokens.line)
+    if expected and kind != INDENT:
         allowed_list = [Token.name for Token in expected if Token.re]
         if allowed_list:
             tok_msg = " or ".join(allowed_list)
@@ -153,24 +883,447 @@ def raise_error(expected, token):
     raise errors.ParserError(msg + ".")
 
 
-def parse(input_string):
+def _key(tokens, kind):
+    """Value of the current token used as a key.
+
+    :param tokens: Token buffer positioned at the key.
+    :param kind: Kind of the current token.
+    :raises: :class:`errors.ParserError` if the key would not be hashable.
+    """
+    if kind in OPENERS:
+        raise_error((), tokens)
+    if kind in PRIMITIVES and tokens.peek() == LEFTROUND:
+        tokens.advance()
+        raise_error((), tokens)
+    return tokens.value
+
+
+def events(tokens):
+    """Generates events of the parsed tokens.
+
+    The grammar is implemented as a state machine with an explicit stack
+    of the states to return to once a nested value is finished, so the
+    nesting depth of the input is not limited by recursion. Keys and
+    scalars are generated while the token buffer is positioned at their
+    tokens, e.g. to tell bare literals from quoted strings.
+
+    :param tokens: Token buffer positioned before the first token.
+    :type tokens: :class:`tokenize`
+    :return: Iterator of pairs (event, value).
+    """
+    advance = tokens.advance
+    peek = tokens.peek
+    kinds = tokens.kinds
+    stack = [_DONE]
+    counters = []
+    state = _BLOCK
+
+    while state != _DONE:
+        if state == _DICT or state == _DICT_NEXT:
+            if state == _DICT_NEXT and advance(EXPECT_LINE_END) == NEWLINE:
+                advance(skip=SKIP_NEWLINE)
+            kind = kinds[tokens.pos]
+            if kind == DEDENT or kind == END:
+                state = stack.pop()
+                continue
+            yield KEY, _key(tokens, kind)
+            advance(EXPECT_COLON)
+            if advance() == NEWLINE and advance() not in (INDENT, DEDENT):
+                yield SCALAR, None
+                state = _DICT
+                continue
+            state = _DICT_NEXT
+
+        elif state == _BRACE or state == _BRACE_NEXT:
+            if state == _BRACE_NEXT and advance(EXPECT_BRACE_END) == COMMA:
+                advance(skip=SKIP_NEWLINE)
+            kind = kinds[tokens.pos]
+            if kind == RIGHTBRACE:
+                state = stack.pop()
+                continue
+            yield KEY, _key(tokens, kind)
+            advance(EXPECT_COLON)
+            advance()
+            state = _BRACE_NEXT
+
+        elif state == _SQUARE or state == _SQUARE_NEXT:
+            if state == _SQUARE_NEXT and advance(EXPECT_SQUARE_END) == COMMA:
+                advance(skip=SKIP_NEWLINE)
+            if kinds[tokens.pos] == RIGHTSQUARE:
+                state = stack.pop()
+                continue
+            state = _SQUARE_NEXT
+
+        elif state == _LIST or state == _LIST_NEXT:
+            if state == _LIST_NEXT and advance(EXPECT_LINE_END) == NEWLINE:
+                advance(EXPECT_LIST_ITEM)
+            kind = kinds[tokens.pos]
+            if kind == DEDENT or kind == END:
+                state = stack.pop()
+                continue
+            while kind == HYPHEN:
+                kind = advance(skip=SKIP_BLANK)
+                # in this case, the list looks like this:
+                # -
+                # - a
+                if kind == HYPHEN:
+                    yield SCALAR, None
+            state = _LIST_NEXT
+            if peek() == COLON:
+                key = _key(tokens, kind)
+                yield START_MAPPING, None
+                yield KEY, key
+                advance()
+                advance(skip=SKIP_NEWLINE)
+                stack.append(state)
+                state = _END_MAPPING
+
+        elif state == _ROUND or state == _ROUND_NAMED or state == _ROUND_POSITIONAL:
+            if state == _ROUND_NAMED:
+                if advance(EXPECT_ROUND_END) == COMMA:
+                    advance(skip=SKIP_NEWLINE)
+            elif state == _ROUND_POSITIONAL:
+                kind = advance(EXPECT_ROUND_ITEM)
+                # only primitive values can be keys of the attributes
+                if kind == EQUALSIGN:
+                    raise_error(EXPECT_ROUND_END.tokens, tokens)
+                if kind == COMMA:
+                    advance(skip=SKIP_NEWLINE)
+            kind = kinds[tokens.pos]
+            if kind == RIGHTROUND:
+                counters.pop()
+                state = stack.pop()
+                continue
+            if kind not in OPENERS and peek() == EQUALSIGN:
+                yield KEY, tokens.value
+                advance()
+                advance()
+                state = _ROUND_NAMED
+            else:
+                yield KEY, counters[-1]
+                state = _ROUND_POSITIONAL
+            counters[-1] += 1
+
+        elif state == _BLOCK:
+            kind = advance()
+            while kind == NEWLINE:
+                kind = advance()
+            if kind == HYPHEN:
+                yield START_SEQUENCE, None
+                state = _LIST
+                stack.append(_END_SEQUENCE)
+                continue
+            elif peek() != END:
+                yield START_MAPPING, None
+                state = _DICT
+                stack.append(_END_MAPPING)
+                continue
+            state = stack.pop()
+
+        else:
+            yield _END_EVENTS[state], None
+            state = stack.pop()
+            continue
+
+        # The current token starts a value, the state to return to once
+        # the value is finished is kept in the stack for nested values.
+        kind = kinds[tokens.pos]
+        if kind not in OPENERS and (kind not in PRIMITIVES or peek() != LEFTROUND):
+            yield SCALAR, tokens.value
+            continue
+        stack.append(state)
+        if kind == INDENT:
+            state = _BLOCK
+            continue
+        if kind in PRIMITIVES:
+            yield START_ENTITY, tokens.value
+            stack.append(_END_ENTITY)
+            advance()
+            state = _ROUND
+        else:
+            event, end, state = NESTED[kind]
+            yield event, None
+            stack.append(end)
+        if state == _ROUND:
+            counters.append(0)
+        advance(skip=SKIP_NEWLINE)
+
+
+#: Events generated by the states that finish a value.
+_END_EVENTS = {
+    _END_MAPPING: END_MAPPING,
+    _END_SEQUENCE: END_SEQUENCE,
+    _END_ENTITY: END_ENTITY,
+}
+
+
+def _build_hooked(events, object_pairs_hook, list_hook, entity_hook):
+    """Builds the tree of the parsed values calling the hooks on the
+    finished containers, see :func:`build`."""
+    entity_hook = entity_hook or Entity
+    root = container = []
+    sequence = True
+    stack = []
+    key = None
+
+    for event, value in events:
+        if event is KEY:
+            key = value
+            continue
+        if event is START_MAPPING or event is START_ENTITY:
+            stack.append((container, sequence, key, value))
+            container = [] if object_pairs_hook is not None else {}
+            sequence = False
+            continue
+        if event is START_SEQUENCE:
+            stack.append((container, sequence, key, value))
+            container = []
+            sequence = True
+            continue
+        if event is not SCALAR:
+            value = container
+            if event is END_SEQUENCE:
+                if list_hook is not None:
+                    value = list_hook(value)
+            elif object_pairs_hook is not None:
+                value = object_pairs_hook(value)
+            container, sequence, key, entity = stack.pop()
+            if event is END_ENTITY:
+                value = entity_hook(entity, value)
+        if sequence:
+            container.append(value)
+        elif object_pairs_hook is not None:
+            container.append((key, value))
+        else:
+            container[key] = value
+
+    return root[0]
+
+
+def build(events, object_pairs_hook=None, list_hook=None, entity_hook=None):
+    """Builds the tree of the parsed values from the events.
+
+    The hooks are called on every container once all its items are
+    built, their results are used in place of the containers.
+
+    :param events: Iterable of pairs (event, value) as generated by
+        :func:`events`.
+    :param object_pairs_hook: Called with the list of pairs (key, value)
+        of every mapping and attributes of an entity, in the order of
+        the document and including repeated keys.
+    :param list_hook: Called with the list of the items of every sequence.
+    :param entity_hook: Called with the value and the attributes of every
+        entity, :class:`Entity` by default.
+    :return: Parsed value.
+    """
+    if object_pairs_hook is not None or list_hook is not None or entity_hook:
+        return _build_hooked(events, object_pairs_hook, list_hook, entity_hook)
+    root = container = []
+    stack = []
+    key = None
+
+    for event, value in events:
+        if event is KEY:
+            key = value
+            continue
+        if event is START_MAPPING or event is START_ENTITY:
+            stack.append((container, key, value))
+            container = {}
+            continue
+        if event is START_SEQUENCE:
+            stack.append((container, key, value))
+            container = []
+            continue
+        if event is not SCALAR:
+            value = container
+            container, key, entity = stack.pop()
+            if event is END_ENTITY:
+                value = Entity(entity, value)
+        if container.__class__ is list:
+            container.append(value)
+        else:
+            container[key] = value
+
+    return root[0]
+
+
+def iterparse(input_string, chunk_size=CHUNK_SIZE, datetime="dateutil"):
+    """Parses given string according to NEON syntax, generating events
+    instead of building the parsed tree.
+
+    Mappings, sequences and entities generate a start event with
+    :obj:`None` (the value of the entity respectively), the events of
+    their items and an end event with :obj:`None`. Every item of
+    a mapping or entity is preceded by a :data:`KEY` event with the key,
+    positional attributes of an entity have integer keys. Primitive
+    values generate a :data:`SCALAR` event.
+
+    :param input_string: String or file object to parse.
+    :type input_string: string
+    :param chunk_size: Number of characters read from a file object
+        at once.
+    :type chunk_size: int
+    :param datetime: Engine used to convert literals to datetimes.
+    :type datetime: str
+    :return: Iterator of pairs (event, value).
+    """
+    return events(tokenize(input_string, chunk_size, Scanner(datetime)))
+
+
+def _measured_fill(tokens, fill, stats):
+    """Wraps the generator filling the token buffer to measure the time
+    of tokenizing and to count the tokens by kind."""
+    clock = time.perf_counter
+    times = stats.times
+    kinds = tokens.kinds
+    count = stats.tokens.update
+    while True:
+        size = len(kinds)
+        start = clock()
+        try:
+            next(fill)
+        except StopIteration:
+            return
+        finally:
+            times["tokenize"] += clock() - start
+        count(kinds[size:])
+        yield
+
+
+def _measured_events(events, stats):
+    """Wraps the events to measure the time of parsing and the maximum
+    nesting depth."""
+    clock = time.perf_counter
+    times = stats.times
+    depth = 0
+    while True:
+        start = clock()
+        try:
+            event, value = next(events)
+        except StopIteration:
+            return
+        finally:
+            times["parse"] += clock() - start
+        if event is START_MAPPING or event is START_SEQUENCE or event is START_ENTITY:
+            depth += 1
+            if depth > stats.max_depth:
+                stats.max_depth = depth
+        elif event is END_MAPPING or event is END_SEQUENCE or event is END_ENTITY:
+            depth -= 1
+        yield event, value
+
+
+def _measured_parse(tokens, build, stats):
+    """Parses the tokens collecting the statistics.
+
+    The wrapped phases are timed inclusively of the phases they drive,
+    which are subtracted once the parsing is finished.
+
+    :param tokens: Token buffer scanned with the statistics.
+    :type tokens: :class:`tokenize`
+    :param build: Function building the parsed value of the events.
+    :param stats: Statistics to collect.
+    :type stats: :class:`neon.stats.ParseStats`
+    :return: Parsed value.
+    """
+    clock = time.perf_counter
+    times = stats.times
+    before = dict(times)
+    start = clock()
+    try:
+        tokens._fill = _measured_fill(tokens, tokens._fill, stats)
+        return build(_measured_events(events(tokens), stats))
+    finally:
+        total = clock() - start
+        converted = times["convert"] - before["convert"]
+        tokenized = times["tokenize"] - before["tokenize"]
+        parsed = times["parse"] - before["parse"]
+        times["tokenize"] -= converted
+        times["parse"] -= tokenized
+        times["build"] += total - parsed
+        stats.total_time += total
+        stats.documents += 1
+
+
+def _strings(intern):
+    """Table of the interned strings of the ``intern`` option.
+
+    :return: Dictionary or :obj:`None` if strings are not interned.
+    """
+    if intern is True:
+        return {}
+    if intern is False:
+        return None
+    return intern
+
+
+def parse(
+    input_string,
+    chunk_size=CHUNK_SIZE,
+    datetime="dateutil",
+    stats=None,
+    object_pairs_hook=None,
+    list_hook=None,
+    entity_hook=None,
+    intern=False,
+    limits=None,
+    lexer="re",
+):
     """Parses given string according to NEON syntax.
 
-    :param input_string: String to parse.
+    :param input_string: String or file object to parse.
     :type input_string: string
+    :param chunk_size: Number of characters read from a file object
+        at once.
+    :type chunk_size: int
+    :param datetime: Engine used to convert literals to datetimes,
+        ``off`` to keep them as strings, ``iso`` for ISO 8601 dates
+        only or ``dateutil`` for any format dateutil understands.
+    :type datetime: str
+    :param stats: Statistics to collect, parsing is not measured at all
+        if :obj:`None`.
+    :type stats: :class:`neon.stats.ParseStats`
+    :param object_pairs_hook: Called with the pairs of every mapping,
+        see :func:`build`.
+    :param list_hook: Called with the items of every sequence.
+    :param entity_hook: Called with the value and the attributes of
+        every entity.
+    :param intern: Whether equal short strings of the document are
+        shared, or a dictionary used as the table of the shared strings
+        across documents.
+    :type intern: bool or dict
+    :param limits: Limits of the document, not checked if :obj:`None`.
+    :type limits: :class:`neon.limits.Limits`
+    :param lexer: Scanner of the tokens, ``re`` for the compiled lexicon
+        of the token patterns or ``linear`` for :class:`neon.lexer.Lexer`
+        scanning in linear time, e.g. for untrusted input.
+    :type lexer: str
     :return: Parsed string.
     :rtype: :class:`dict`
+    :raises: :class:`errors.LimitError` if the document exceeds the limits.
     """
-    tokens = tokenize(input_string)
-    return Indent().parse(tokens)
+    hooks = (object_pairs_hook, list_hook, entity_hook)
+    scanner = Scanner(
+        datetime, stats=stats, strings=_strings(intern), limits=limits, lexer=lexer
+    )
+    tokens = tokenize(input_string, chunk_size, scanner)
+    if stats is not None:
+        return _measured_parse(tokens, lambda events: build(events, *hooks), stats)
+    return build(events(tokens), *hooks)
 
 
-#: The Scanner is instantiated with a list of re's and associated
-#: functions. It is used to scan a string, returning a list of parts
-#: which match the given re's.
-#:
-#: See: http://stackoverflow.com/a/17214398/2874089
-_scanner = re.Scanner(
-    [TokenClass.getscan() for TokenClass in TOKENS if TokenClass.re is not None],
-    flags=SCANNER_FLAGS,
-)
+def parse_file(path, chunk_size=CHUNK_SIZE, datetime="dateutil"):
+    """Parses a UTF-8 encoded file according to NEON syntax.
+
+    A shortcut for :func:`parse` of the file opened in text mode, so
+    ``\\r\\n`` and ``\\r`` end lines as ``\\n`` does.
+
+    :param path: Path to the NEON file.
+    :param chunk_size: Number of characters read at once.
+    :type chunk_size: int
+    :param datetime: Engine used to convert literals to datetimes.
+    :type datetime: str
+    :return: Parsed file.
+    """
+    with open(path, encoding="utf-8") as fp:
+        return parse(fp, chunk_size, datetime)
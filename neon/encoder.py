@@ -1,20 +1,75 @@
-def format_list(list_, indent_level):
-    indent = "\t" * indent_level
-    newline = "\n" if indent_level else "\n\n"
-    return newline.join(
-        ["{}- {}".format(indent, to_string(value, indent_level + 1)) for value in list_]
-    )
+import io
 
+from .decoder import CHUNK_SIZE
 
-def format_dict(dict_, indent_level):
-    indent = "\t" * indent_level
-    newline = "\n" if indent_level else "\n\n"
-    return newline.join(
-        [
-            "{}{}: {}".format(indent, key, to_string(value, indent_level + 1))
-            for key, value in dict_.items()
-        ]
-    )
+
+def dump(obj, fp, chunk_size=CHUNK_SIZE, indent_level=0):
+    """Encodes given object using the NEON syntax and writes it to
+    a file object.
+
+    Nested mappings and lists are written using an explicit stack
+    of iterators, the output is buffered and written in chunks.
+
+    :param obj: Object to encode.
+    :param fp: File object to write to.
+    :param chunk_size: Number of characters written at once.
+    :type chunk_size: int
+    :param indent_level: Indentation of the nested items of the object.
+    :type indent_level: int
+    """
+    parts = []
+    append = parts.append
+    size = 0
+    stack = []
+    level = indent_level
+    value = obj
+
+    while True:
+        if isinstance(value, dict):
+            part = "\n"
+            stack.append([iter(value.items()), True, level, False])
+        elif isinstance(value, list):
+            part = "\n"
+            stack.append([iter(value), False, level, False])
+        elif value is None:
+            part = "Null"
+        else:
+            part = str(value)
+        append(part)
+        size += len(part)
+
+        # Find the next item to write, finishing the exhausted ones.
+        while stack:
+            frame = stack[-1]
+            items, mapping, level, started = frame
+            item = next(items, frame)
+            if item is frame:
+                stack.pop()
+                continue
+            if started:
+                part = "\n" if level else "\n\n"
+            else:
+                part = ""
+                frame[3] = True
+            if mapping:
+                key, value = item
+                part += "{}{}: ".format("\t" * level, key)
+            else:
+                value = item
+                part += "{}- ".format("\t" * level)
+            append(part)
+            size += len(part)
+            level += 1
+            break
+        else:
+            break
+
+        if size >= chunk_size:
+            fp.write("".join(parts))
+            parts.clear()
+            size = 0
+
+    fp.write("".join(parts))
 
 
 def to_string(obj, indent_level=0):
@@ -24,10 +79,6 @@ def to_string(obj, indent_level=0):
     :return: Encoded object.
     :rtype: string
     """
-    if isinstance(obj, dict):
-        return "\n" + format_dict(obj, indent_level)
-    elif isinstance(obj, list):
-        return "\n" + format_list(obj, indent_level)
-    elif obj is None:
-        return "Null"
-    return str(obj)
+    fp = io.StringIO()
+    dump(obj, fp, indent_level=indent_level)
+    return fp.getvalue()
@@ -4,3 +4,11 @@ class TokenError(Exception):
 
 class ParserError(Exception):
     """Raised when parsing ends up with an error."""
+
+
+class SchemaError(ParserError):
+    """Raised when a parsed value does not match the schema."""
+
+
+class LimitError(ParserError):
+    """Raised when a document exceeds the limits of decoding."""
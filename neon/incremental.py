@@ -0,0 +1,250 @@
+import bisect
+
+from . import errors
+from .decoder import (
+    END,
+    NESTING,
+    NEWLINE,
+    Scanner,
+    _text,
+    build,
+    events,
+    parse,
+    tokenize,
+)
+from .lazy import SPACING
+
+#: Number of characters scanned at once when looking for the blocks.
+CHUNK_SIZE = 4 * 1024
+
+#: Marker of a block with a syntax error or of a tree not built yet.
+_invalid = object()
+
+#: Key appended to the blocks followed by another block, so that the end
+#: of a block is tokenized as in the whole document.
+SENTINEL = "\x00"
+
+#: Line with the key appended to the blocks.
+_sentinel_line = '"{}": 0'.format(SENTINEL)
+
+
+class _Reader(object):
+    """File object reading a string from the given offset, so that only
+    the scanned part of the string is copied."""
+
+    def __init__(self, string, offset):
+        self.string = string
+        self.pos = offset
+
+    def read(self, size):
+        chunk = self.string[self.pos : self.pos + size]
+        self.pos += len(chunk)
+        return chunk
+
+
+class IncrementalDocument(object):
+    """NEON document re-parsed incrementally after edits.
+
+    The document is split into top-level blocks, each one a key of the
+    top-level mapping with its value, and every block is parsed on its
+    own. An edit re-scans the text from the start of the block before
+    the edited one until a block boundary of the original text is found
+    again after the edit, only the blocks in between are parsed again.
+    Every block starts on a new line outside of any brackets or
+    indentation, so it is scanned from the initial Indent/Dedent state
+    of the tokenizer.
+
+    Documents that are not mappings, e.g. lists, are parsed as a whole
+    on every edit.
+
+    :param input_string: String, UTF-8 encoded bytes or file object to
+        decode.
+    :param datetime: Engine used to convert literals to datetimes.
+    :type datetime: str
+    """
+
+    def __init__(self, input_string, datetime="dateutil"):
+        input_string = _text(input_string)
+        self.source = input_string
+        self.datetime = datetime
+        self._scanner = Scanner(datetime)
+        self._split_all()
+
+    def _split_all(self):
+        """Splits and parses the whole document."""
+        self._starts = []
+        self._lines = []
+        self._values = []
+        self._tree = _invalid
+        self._whole = False
+        try:
+            found, _ = self._split(0, 1)
+        except errors.TokenError:
+            self._whole = True
+            return
+        self._replace(0, 0, found, None)
+
+    def _split(self, offset, line, after=None, delta=0):
+        """Finds the top-level blocks from the offset on.
+
+        The search stops at a block starting at the same text as an
+        original block after the edit.
+
+        :param offset: Offset of the first block, or zero.
+        :param line: Number of the line at the offset.
+        :param after: Offset of the end of the inserted text, the search
+            does not stop if :obj:`None`.
+        :param delta: Change of the length of the text by the edit.
+        :return: Pair of the list of pairs (offset, line) of the found
+            blocks and the index of the original block the search stopped
+            at, :obj:`None` if it reached the end of the document.
+        """
+        source = self.source
+        tokens = tokenize(
+            _Reader(source, offset),
+            CHUNK_SIZE,
+            Scanner(self.datetime, infer=False),
+            line,
+        )
+        starts = self._starts
+        found = []
+        depth = 0
+        newline_last = True
+        kind = tokens.advance()
+        while kind != END:
+            start = offset + tokens.starts[tokens.pos]
+            # Text before the first key at the start of a line belongs to
+            # the first block, so that a syntax error in it is not lost.
+            if (
+                newline_last
+                and not depth
+                and kind not in SPACING
+                and (not found or source[start - 1] == "\n")
+            ):
+                if after is not None and start >= after:
+                    original = start - delta
+                    index = bisect.bisect_left(starts, original)
+                    if index < len(starts) and starts[index] == original:
+                        return found, index
+                found.append((start, tokens.line))
+            depth += NESTING[kind]
+            newline_last = kind == NEWLINE
+            kind = tokens.advance()
+        return found, None
+
+    def _parse(self, start, end, line, last):
+        """Parses the block.
+
+        A block followed by another one is parsed with the
+        :data:`SENTINEL` key appended, which has to end up in the
+        top-level mapping, otherwise the document is parsed as a whole.
+
+        :param last: Whether the block is the last one of the document.
+        :return: Mapping of the block, :data:`_invalid` if it has
+            a syntax error.
+        """
+        source = self.source[start:end]
+        if not last:
+            source += _sentinel_line
+        try:
+            tokens = tokenize(source, scanner=self._scanner, line=line)
+            value = build(events(tokens))
+        except (errors.ParserError, errors.TokenError):
+            return _invalid
+        if value.__class__ is not dict or not last and SENTINEL not in value:
+            self._whole = True
+        elif not last:
+            del value[SENTINEL]
+        return value
+
+    def _replace(self, first, last, found, end):
+        """Replaces the blocks from first to last with the found blocks.
+
+        :param end: Offset of the end of the last found block, the end of
+            the document if :obj:`None`.
+        """
+        values = []
+        for index, (start, line) in enumerate(found):
+            if index + 1 < len(found):
+                values.append(self._parse(start, found[index + 1][0], line, False))
+            elif end is None:
+                values.append(self._parse(start, len(self.source), line, True))
+            else:
+                values.append(self._parse(start, end, line, False))
+        self._starts[first:last] = [start for start, _ in found]
+        self._lines[first:last] = [line for _, line in found]
+        self._values[first:last] = values
+        # The block before the replaced ones may have become the last.
+        if end is None and not found and first:
+            start, line = self._starts[first - 1], self._lines[first - 1]
+            self._values[first - 1] = self._parse(start, None, line, True)
+
+    def edit(self, offset, removed, inserted):
+        """Replaces a part of the text and re-parses the changed blocks.
+
+        :param offset: Offset of the edit.
+        :type offset: int
+        :param removed: Number of characters removed at the offset.
+        :type removed: int
+        :param inserted: Text inserted at the offset.
+        :type inserted: str
+        :raises: :class:`ValueError` if the edit is out of the text.
+        """
+        original = self.source
+        end = offset + removed
+        if offset < 0 or removed < 0 or end > len(original):
+            raise ValueError("Edit out of the document.")
+        self.source = original[:offset] + inserted + original[end:]
+        self._tree = _invalid
+        if self._whole:
+            self._split_all()
+            return
+
+        delta = len(inserted) - removed
+        lines = inserted.count("\n") - original.count("\n", offset, end)
+        starts = self._starts
+        # The edit may join the edited block to the previous one, e.g.
+        # if the key of the block is indented.
+        first = bisect.bisect_right(starts, offset) - 1
+        if first > 0 and starts[first] == offset:
+            first -= 1
+        if first < 0:
+            first, scan, line = 0, 0, 1
+        else:
+            scan, line = starts[first], self._lines[first]
+
+        try:
+            found, last = self._split(scan, line, offset + len(inserted), delta)
+        except errors.TokenError:
+            self._whole = True
+            return
+        if last is None:
+            last = len(starts)
+            stop = None
+        else:
+            stop = starts[last] + delta
+            for index in range(last, len(starts)):
+                starts[index] += delta
+                self._lines[index] += lines
+        self._replace(first, last, found, stop)
+
+    @property
+    def tree(self):
+        """Decoded document.
+
+        :raises: :class:`errors.ParserError` or :class:`errors.TokenError`
+            if the document has a syntax error.
+        """
+        if self._tree is _invalid:
+            values = self._values
+            if self._whole or not values or _invalid in values:
+                self._tree = parse(self.source, datetime=self.datetime)
+            else:
+                tree = {}
+                for value in values:
+                    tree.update(value)
+                self._tree = tree
+        return self._tree
+
+    def __repr__(self):
+        return "{}({} blocks)".format(type(self).__name__, len(self._starts))
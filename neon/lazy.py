@@ -0,0 +1,142 @@
+import threading
+from collections.abc import Mapping
+
+from .decoder import EXPECT_COLON, NESTING, Scanner, _text, build, events, tokenize
+from .tokens import Dedent, End, Indent, Literal, NewLine
+
+#: Kinds of the tokens that cannot start a key.
+SPACING = (NewLine.kind, Indent.kind, Dedent.kind)
+
+
+def decode_value(source, start, end, line, scanner):
+    """Decodes the value of the key starting at the start offset.
+
+    :param source: Decoded document.
+    :type source: str
+    :param start: Offset of the key.
+    :param end: Offset of the end of the value.
+    :param line: Number of the line of the key.
+    :param scanner: Options of scanning.
+    :type scanner: :class:`neon.decoder.Scanner`
+    :return: Decoded value.
+    """
+    tokens = tokenize(source[start:end], scanner=scanner, line=line)
+    return next(iter(build(events(tokens)).values()))
+
+
+class LazyDocument(Mapping):
+    """Mapping of a NEON document decoded on access.
+
+    The top-level keys are found by a pass over the tokens without
+    inferring the types of the literals, which stops as soon as the
+    requested key is found. The value of a key is decoded the first
+    time it is accessed and then remembered. Syntax errors inside of
+    a value are raised when the value is accessed. If a key is repeated,
+    its last value is used once the document is indexed past it.
+
+    The document can be shared by threads. Indexing holds a lock, the
+    values are decoded outside of it, so different keys are decoded
+    concurrently.
+
+    :param input_string: String, UTF-8 encoded bytes or file object to
+        decode.
+    :param datetime: Engine used to convert literals to datetimes.
+    :type datetime: str
+    """
+
+    def __init__(self, input_string, datetime="dateutil"):
+        input_string = _text(input_string)
+        self._source = input_string
+        self._scanner = Scanner(datetime)
+        self._tokens = tokenize(input_string, scanner=Scanner(datetime, infer=False))
+        self._spans = {}
+        self._values = {}
+        self._last = None
+        self._done = False
+        self._lock = threading.Lock()
+
+    def _index(self):
+        """Finds the next top-level key.
+
+        :return: :obj:`False` if there are no more keys.
+        """
+        tokens = self._tokens
+        kind = tokens.advance()
+
+        # Skip the value of the previous key, the next key is the first
+        # token on a new line outside of any block or brackets.
+        depth = 0
+        newline_last = self._last is None
+        while kind != End.kind:
+            if newline_last and not depth and kind not in SPACING:
+                break
+            depth += NESTING[kind]
+            newline_last = kind == NewLine.kind
+            kind = tokens.advance()
+
+        start = tokens.starts[tokens.pos]
+        if self._last is not None:
+            self._last[1] = start
+        if kind == End.kind:
+            self._done = True
+            return False
+
+        if kind == Literal.kind:
+            key = Literal.do(self._scanner, tokens.value)[1]
+        else:
+            key = tokens.value
+        line = tokens.line
+        tokens.advance(EXPECT_COLON)
+
+        self._last = [start, len(self._source), line]
+        self._spans[key] = self._last
+        self._values.pop(key, None)
+        return True
+
+    def _find(self, key):
+        """Indexes the document until the whole value of the key is found.
+
+        :return: :obj:`True` if the key is in the document.
+        """
+        while key not in self._spans or self._spans[key] is self._last:
+            if self._done or not self._index():
+                break
+        return key in self._spans
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        with self._lock:
+            if not self._find(key):
+                raise KeyError(key)
+            span = self._spans[key]
+        start, end, line = span
+        value = decode_value(self._source, start, end, line, self._scanner)
+        with self._lock:
+            # The key may have been repeated later in the meantime.
+            if self._spans[key] is span:
+                self._values[key] = value
+        return value
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._find(key)
+
+    def _index_all(self):
+        """Indexes the whole document."""
+        with self._lock:
+            while not self._done and self._index():
+                pass
+
+    def __iter__(self):
+        self._index_all()
+        return iter(self._spans)
+
+    def __len__(self):
+        self._index_all()
+        return len(self._spans)
+
+    def __repr__(self):
+        return "{}({} keys)".format(type(self).__name__, len(self))
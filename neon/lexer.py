@@ -0,0 +1,251 @@
+"""Linear-time scanner of the tokens.
+
+The lexicon of the compiled :class:`re.Scanner` tries the patterns of the
+tokens in order at every position, and the pattern of comments scans all
+the following white-space before it fails, so a run of blank lines is
+scanned once for each of its lines. A multi-line string spanning many
+chunks of a file is also scanned again from its start for every chunk.
+
+:class:`Lexer` dispatches on the first character of a token instead,
+scans every character of the input a bounded number of times and
+resumes unterminated strings, while producing the same matches as the
+lexicon.
+"""
+import functools
+import re
+
+from .tokens import (
+    TOKENS,
+    Colon,
+    Comma,
+    Comment,
+    EqualSign,
+    Hyphen,
+    Indent,
+    LeftBrace,
+    LeftRound,
+    LeftSquare,
+    Literal,
+    NewLine,
+    RightBrace,
+    RightRound,
+    RightSquare,
+    String,
+    Unknown,
+    WhiteSpace,
+)
+
+#: Kinds of the first characters of the tokens.
+(
+    _LITERAL,
+    _STRING,
+    _SYMBOL,
+    _SYMBOL_OR_LITERAL,
+    _COMMENT,
+    _SPACE,
+    _UNKNOWN,
+) = range(7)
+
+
+@functools.lru_cache(maxsize=None)
+def _tables(flags):
+    """Patterns and dispatch table of the lexer.
+
+    :param flags: Flags of the patterns, those of the lexicon.
+    :type flags: int
+    :return: Pair of the dictionary of the patterns and the dispatch
+        table, pairs (kind of the character, group of the token) by the
+        first character of the token.
+    """
+    lexicon = [TokenClass for TokenClass in TOKENS if TokenClass.re is not None]
+    groups = dict((TokenClass, lexicon.index(TokenClass) + 1) for TokenClass in lexicon)
+
+    def compile(pattern):
+        return re.compile(pattern, flags)
+
+    table = {}
+    for code in range(0x21):
+        table[chr(code)] = (_SPACE, None)
+    for quote in "\"'":
+        table[quote] = (_STRING, groups[String])
+    for TokenClass in (
+        Comma,
+        EqualSign,
+        LeftRound,
+        RightRound,
+        LeftSquare,
+        RightSquare,
+        LeftBrace,
+        RightBrace,
+    ):
+        table[TokenClass.re.replace("\\", "")] = (_SYMBOL, groups[TokenClass])
+    table[":"] = (_SYMBOL_OR_LITERAL, groups[Colon])
+    table["-"] = (_SYMBOL_OR_LITERAL, groups[Hyphen])
+    table["#"] = (_COMMENT, groups[Comment])
+    for other in "!`":
+        table[other] = (_UNKNOWN, groups[Unknown])
+
+    patterns = {
+        "literal": compile(Literal.re).match,
+        "space": compile(r"\s*").match,
+        "newline": compile(NewLine.re).match,
+        "blank": compile(WhiteSpace.re).match,
+        "double": compile(r'["\\]').search,
+        "single": compile(r"['\\]").search,
+        "groups": groups,
+    }
+    return patterns, table
+
+
+class Lexer(object):
+    """Scanner of the tokens in linear time.
+
+    The lexer mimics the matcher of a compiled :class:`re.Scanner`, its
+    :meth:`match` returns the lexer itself with the span and the group
+    (:attr:`lastindex`) of the next token of the lexicon. One lexer scans
+    the consecutive buffers of a single input.
+
+    :param flags: Flags of the patterns, those of the lexicon.
+    :type flags: int
+    """
+
+    def __init__(self, flags):
+        patterns, self._table = _tables(flags)
+        self._literal = patterns["literal"]
+        self._space = patterns["space"]
+        self._newline = patterns["newline"]
+        self._blank = patterns["blank"]
+        self._double = patterns["double"]
+        self._single = patterns["single"]
+        groups = patterns["groups"]
+        self._literal_group = groups[Literal]
+        self._default = (_LITERAL, self._literal_group)
+        self._comment_group = groups[Comment]
+        self._indent_group = groups[Indent]
+        self._newline_group = groups[NewLine]
+        self._whitespace_group = groups[WhiteSpace]
+        self._unknown_group = groups[Unknown]
+        # Unterminated string at the end of the previous buffer, as a pair
+        # of the offset from its quote where the scan stopped and whether
+        # it can never be terminated.
+        self._resume = None
+        self._carry = None
+        self.scanner("", 0)
+
+    def scanner(self, buffer, end):
+        """Starts scanning the buffer up to the end offset.
+
+        :return: Function returning the next match.
+        """
+        self.buffer = buffer
+        self.end = end
+        self.pos = 0
+        self.start = self.stop = 0
+        self.lastindex = None
+        self._run_end = 0
+        self._carry, self._resume = self._resume, None
+        return self.match
+
+    def span(self):
+        """Offsets of the start and the end of the matched token."""
+        return self.start, self.stop
+
+    def _line_end(self, pos):
+        """Offset of the end of the line, the end of ``.*``."""
+        stop = self.buffer.find("\n", pos, self.end)
+        return self.end if stop < 0 else stop
+
+    def _string(self, pos):
+        """Scans the quoted string starting at the offset.
+
+        :return: Offset of the end of the string, :obj:`None` if it is not
+            terminated in the buffer.
+        """
+        buffer, end = self.buffer, self.end
+        quote = buffer[pos : pos + 1]
+        search = self._double if quote == '"' else self._single
+        index = pos + 1
+        if pos == 0 and self._carry is not None:
+            index, never = self._carry
+            self._carry = None
+            if never:
+                self._resume = (0, True)
+                return None
+        while True:
+            found = search(buffer, index, end)
+            if found is None:
+                self._resume = (end - pos, False)
+                return None
+            index = found.start()
+            if buffer[index : index + 1] == quote:
+                return index + 1
+            # An escaped character, a new line cannot be escaped.
+            if index + 1 >= end:
+                self._resume = (index - pos, False)
+                return None
+            if buffer[index + 1 : index + 2] == "\n":
+                self._resume = (0, True)
+                return None
+            index += 2
+
+    def match(self):
+        """Scans the next token.
+
+        :return: The lexer with the span and the group of the token, an
+            empty span at the end of the buffer.
+        """
+        buffer, end, pos = self.buffer, self.end, self.pos
+        if pos >= end:
+            self.start = self.stop = pos
+            return self
+
+        char = buffer[pos : pos + 1]
+        kind, group = self._table.get(char, self._default)
+        if kind == _LITERAL:
+            stop = self._literal(buffer, pos, end).end()
+        elif kind == _SPACE:
+            # All positions of a run of white-space end at the same offset,
+            # which tells whether the run is a part of a comment.
+            if pos >= self._run_end:
+                self._run_end = self._space(buffer, pos, end).end()
+            run_end = self._run_end
+            if pos < run_end < end and buffer[run_end : run_end + 1] == "#":
+                stop = self._line_end(run_end)
+                group = self._comment_group
+            elif char == "\n":
+                stop = pos + 1
+                if run_end > stop:
+                    stop = self._newline(buffer, pos, end).end()
+                group = self._newline_group
+            elif char in " \t":
+                stop = pos + 1
+                if run_end > stop:
+                    stop = self._blank(buffer, pos, end).end()
+                if pos and buffer[pos - 1 : pos] != "\n":
+                    group = self._whitespace_group
+                else:
+                    group = self._indent_group
+            else:
+                stop = self._line_end(pos)
+                group = self._unknown_group
+        elif kind == _SYMBOL:
+            stop = pos + 1
+        elif kind == _SYMBOL_OR_LITERAL:
+            literal = self._literal(buffer, pos, end)
+            if literal is None:
+                stop = pos + 1
+            else:
+                stop = literal.end()
+                group = self._literal_group
+        elif kind == _STRING:
+            stop = self._string(pos)
+            if stop is None:
+                stop = self._line_end(pos)
+                group = self._unknown_group
+        else:
+            stop = self._line_end(pos)
+
+        self.start = pos
+        self.stop = self.pos = stop
+        self.lastindex = group
+        return self
@@ -0,0 +1,34 @@
+"""Limits of decoding untrusted documents."""
+
+
+class Limits(object):
+    """Limits of the resources used by decoding a document.
+
+    The limits are checked while the document is tokenized, before the
+    exceeding tokens are parsed, and a document exceeding any of them
+    raises :class:`neon.errors.LimitError`. The input is checked as it is
+    read, the tokens whenever a batch of them is scanned. Limits that are
+    :obj:`None` are not checked.
+
+    :param max_depth: Maximum nesting of brackets and indented blocks.
+    :type max_depth: int
+    :param max_tokens: Maximum number of tokens, including new lines and
+        indentation.
+    :type max_tokens: int
+    :param max_bytes: Maximum size of the input, in characters of
+        a string or bytes of UTF-8 encoded input.
+    :type max_bytes: int
+    :param max_length: Maximum length of a scalar as written, e.g. with
+        the quotes of a string.
+    :type max_length: int
+    """
+
+    __slots__ = ("max_depth", "max_tokens", "max_bytes", "max_length")
+
+    def __init__(
+        self, max_depth=None, max_tokens=None, max_bytes=None, max_length=None
+    ):
+        self.max_depth = max_depth
+        self.max_tokens = max_tokens
+        self.max_bytes = max_bytes
+        self.max_length = max_length
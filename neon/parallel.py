@@ -0,0 +1,110 @@
+"""Decoding of many files in parallel."""
+import os
+
+from . import errors
+from .decoder import parse
+
+#: Executors that can be used to decode the files.
+EXECUTORS = ("process", "thread")
+
+#: Errors of the files returned in place of their trees.
+ERRORS = (OSError, UnicodeDecodeError, errors.ParserError, errors.TokenError)
+
+#: Minimum number of bytes of the files decoded by a single task.
+TASK_SIZE = 256 * 1024
+
+#: Number of tasks per worker if there are not enough files to fill them.
+TASKS_PER_WORKER = 4
+
+
+def decode_files(paths, **options):
+    """Decodes the files one by one.
+
+    :param paths: Paths to the NEON files.
+    :param options: Options of :func:`neon.decoder.parse`.
+    :return: List of the decoded trees, or the errors of the files
+        that could not be read or decoded.
+    """
+    results = []
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as fp:
+                content = fp.read()
+            results.append(parse(content, **options))
+        except ERRORS as error:
+            results.append(error)
+    return results
+
+
+def _size(path):
+    """Size of the file in bytes, zero if it cannot be read, so that its
+    error is reported by the task decoding it."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def batches(paths, sizes, task_size=TASK_SIZE):
+    """Splits the paths into batches of consecutive files, so that small
+    files are decoded together by a single task.
+
+    :param paths: Paths to the NEON files.
+    :param sizes: Sizes of the files in bytes.
+    :param task_size: Minimum number of bytes of the files in a batch.
+    :type task_size: int
+    :return: Iterator of lists of paths.
+    """
+    batch = []
+    size = 0
+    for path, file_size in zip(paths, sizes):
+        batch.append(path)
+        size += file_size
+        if size >= task_size:
+            yield batch
+            batch = []
+            size = 0
+    if batch:
+        yield batch
+
+
+def decode_many(paths, workers=None, executor="process", **options):
+    """Decodes the files in parallel.
+
+    :param paths: Paths to the NEON files.
+    :param workers: Maximum number of workers, the number of processors
+        by default.
+    :type workers: int
+    :param executor: Name of the executor running the tasks, ``process``
+        or ``thread``.
+    :type executor: str
+    :param options: Options of :func:`neon.decoder.parse`.
+    :return: List of the decoded trees in the order of the paths, or the
+        errors of the files that could not be read or decoded, e.g.
+        :class:`OSError`, :class:`UnicodeDecodeError` or
+        :class:`neon.errors.ParserError`.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError("Unknown executor {!r}.".format(executor))
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    if len(paths) <= 1 or workers == 1:
+        return decode_files(paths, **options)
+
+    sizes = [_size(path) for path in paths]
+    task_size = min(TASK_SIZE, sum(sizes) // (workers * TASKS_PER_WORKER) + 1)
+    tasks = list(batches(paths, sizes, task_size))
+
+    import concurrent.futures  # imported on first use, it is slow to import
+
+    if executor == "process":
+        Executor = concurrent.futures.ProcessPoolExecutor
+    else:
+        Executor = concurrent.futures.ThreadPoolExecutor
+
+    results = []
+    with Executor(max_workers=workers) as pool:
+        futures = [pool.submit(decode_files, batch, **options) for batch in tasks]
+        for future in futures:
+            results.extend(future.result())
+    return results
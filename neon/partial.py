@@ -0,0 +1,138 @@
+"""Decoding of a single value of a document given by a path of keys."""
+from .decoder import (
+    COLON,
+    END,
+    INDENT,
+    NESTING,
+    NEWLINE,
+    Scanner,
+    _text,
+    parse,
+    tokenize,
+)
+from .entity import Entity
+from .lazy import SPACING, decode_value
+from .tokens import Literal, String
+
+#: Kinds of the tokens that can be keys of a block mapping.
+KEYS = (Literal.kind, String.kind)
+
+
+def _keys(path):
+    """List of the keys of the path, a string is split on dots."""
+    if isinstance(path, str):
+        return path.split(".")
+    return list(path)
+
+
+def _matches(scanner, kind, string, key):
+    """Tells whether the scanned key is the key of the path.
+
+    Literals are compared as written with keys given as strings, so only
+    keys of other types are converted.
+    """
+    if key.__class__ is str:
+        return string == key
+    return kind == Literal.kind and Literal.do(scanner, string)[1] == key
+
+
+def _lookup(value, keys, path):
+    """Looks up the keys in the decoded value.
+
+    :raises: :class:`KeyError` with the path if a key is missing.
+    """
+    for key in keys:
+        if value.__class__ is Entity:
+            value = value.attributes
+        try:
+            value = value[key]
+        except (KeyError, IndexError, TypeError):
+            raise KeyError(path)
+    return value
+
+
+def _end(tokens, kind, depth, line_start, level):
+    """Skips the tokens to the end of the value of a key at the level.
+
+    :return: Offset of the first token after the value.
+    """
+    while kind != END:
+        if line_start and depth <= level and kind not in SPACING:
+            break
+        depth += NESTING[kind]
+        line_start = kind == NEWLINE or kind == INDENT
+        kind = tokens.advance()
+    return tokens.starts[tokens.pos]
+
+
+def decode_path(input_string, path, datetime="dateutil"):
+    """Decodes the value of a key path without decoding the whole document.
+
+    The keys of the path are looked up in nested block mappings by
+    scanning the tokens of the document. The values of the other keys
+    are skipped by tracking the indentation and the brackets, with the
+    types of their literals never inferred. Scanning stops once the value
+    of the path ends and only that value is decoded, so the time depends
+    on the position of the value in the document rather than on its size.
+
+    Inline mappings, entities and sequences on the path are decoded as
+    a whole and the rest of the path is looked up in the decoded value.
+    Unlike :func:`neon.decode`, which keeps the last value of a repeated
+    key, the first value is used, as the rest of the document is never
+    scanned for a repeated key. Syntax errors of the skipped values and
+    of the rest of the document are not detected.
+
+    :param input_string: String, UTF-8 encoded bytes or file object to
+        decode.
+    :param path: Keys separated by dots, e.g. ``app.version``, or
+        a sequence of keys, e.g. for keys that are not strings.
+    :param datetime: Engine used to convert literals to datetimes.
+    :type datetime: str
+    :return: Decoded value of the path.
+    :raises: :class:`KeyError` with the path if it is not in the document.
+    """
+    source = _text(input_string)
+    keys = _keys(path)
+    scanner = Scanner(datetime)
+    tokens = tokenize(source, scanner=Scanner(datetime, infer=False))
+
+    # Offsets and lines of the keys of the path found so far, the values
+    # of the keys are decoded if they are not block mappings.
+    spans = []
+    level = depth = 0
+    line_start = True
+    kind = tokens.advance()
+    while kind != END:
+        if line_start and kind not in SPACING and depth <= level:
+            if depth < level:
+                break
+            if kind not in KEYS:
+                break
+            if _matches(scanner, kind, tokens.value, keys[level]):
+                start, line = tokens.starts[tokens.pos], tokens.line
+                if tokens.advance() != COLON:
+                    break
+                spans.append((start, line))
+                level += 1
+                kind = tokens.advance()
+                if level < len(keys) and kind == NEWLINE and tokens.peek() == INDENT:
+                    line_start = True
+                    kind = tokens.advance()
+                    continue
+                end = _end(tokens, kind, depth, False, level - 1)
+                value = decode_value(source, start, end, line, scanner)
+                return _lookup(value, keys[level:], path)
+        depth += NESTING[kind]
+        line_start = kind == NEWLINE or kind == INDENT
+        kind = tokens.advance()
+
+    if kind == END or depth < level:
+        raise KeyError(path)
+    # The document or the value of the last found key is not a block
+    # mapping, e.g. a sequence of mappings.
+    if not spans:
+        return _lookup(parse(source, datetime=datetime), keys, path)
+    start, line = spans[-1]
+    end = _end(tokens, kind, depth, line_start, level - 1)
+    value = decode_value(source, start, end, line, scanner)
+    return _lookup(value, keys[level:], path)
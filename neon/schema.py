@@ -0,0 +1,543 @@
+"""Decoding of documents into typed values described by a schema.
+
+A schema is a type or a simple specification of types:
+
+- ``str``, ``int``, ``float``, ``bool``, ``datetime.datetime`` and
+  ``type(None)`` describe scalars,
+- ``list``, ``typing.List[T]`` or ``[T]`` describe sequences,
+- ``dict`` or ``typing.Dict[K, V]`` describe mappings,
+- ``{"key": T, ...}`` describes a mapping with exactly the given keys,
+- a dataclass describes a mapping of its fields, built into the dataclass,
+- ``typing.Optional[T]`` allows null in place of ``T``,
+- :class:`neon.entity.Entity` describes an entity,
+- ``typing.Any`` or ``object`` describe any value, decoded as without
+  a schema.
+
+The literals are scanned without inferring their types, each one is
+converted to the type of the schema once it is parsed and the typed
+objects are built in the same pass. Only bare literals are converted to
+types other than strings, quoted strings are accepted by string fields
+only. Keys of mappings are converted the same way.
+"""
+import dataclasses
+import datetime
+import typing
+
+from . import errors
+from .decoder import (
+    CHUNK_SIZE,
+    KEY,
+    SCALAR,
+    START_ENTITY,
+    START_MAPPING,
+    START_SEQUENCE,
+    Scanner,
+    _measured_parse,
+    _strings,
+    events,
+    tokenize,
+)
+from .entity import Entity
+from .tokens import Boolean, DateTime, Float, Integer, Literal, NoneValue
+
+#: Kind of the bare literals converted by the schema.
+LITERAL = Literal.kind
+
+#: Literals converted to :obj:`None`.
+NULLS = frozenset(NoneValue._variants)
+
+#: Marker of a literal that cannot be converted.
+_invalid = object()
+
+#: Marker of the value of a container that is not an entity, as
+#: :obj:`None` is a valid value of an entity.
+_no_entity = object()
+
+#: Names of the values started by the events, used in error messages.
+_NAMES = {
+    START_MAPPING: "mapping",
+    START_SEQUENCE: "sequence",
+    START_ENTITY: "entity",
+}
+
+
+def _error(message, line, expected=None):
+    """Raises an error of a value that does not match the schema.
+
+    :raises: :class:`errors.SchemaError`
+    """
+    if line:
+        message += " on line {}".format(line)
+    if expected:
+        message += ", expected {}".format(expected)
+    raise errors.SchemaError(message + ".")
+
+
+def _int(string):
+    value = Integer.convert(string)
+    return _invalid if value is None else value
+
+
+def _float(string):
+    value = Float.convert(string)
+    return _invalid if value is None else value
+
+
+def _bool(string):
+    kind, value = Literal._keywords.get(string, (None, None))
+    return value if kind == Boolean.kind else _invalid
+
+
+def _none(string):
+    return None if string in NULLS else _invalid
+
+
+class _Node(object):
+    """Type of a value in a compiled schema, accepting no value.
+
+    :param name: Name of the type used in error messages.
+    :type name: str
+    """
+
+    #: Node of the items of a sequence.
+    item = None
+
+    def __init__(self, name):
+        self.name = name
+
+    def scalar(self, value, literal, line):
+        """Converts a primitive value.
+
+        :param value: Parsed string, :obj:`None` if the value is empty.
+        :param literal: Whether the value is a bare literal.
+        :type literal: bool
+        :param line: Number of the line of the value.
+        :type line: int
+        :return: Converted value.
+        """
+        _error("Unexpected value {!r}".format(value), line, self.name)
+
+    def start(self, event, line):
+        """Creates the container of a mapping, sequence or entity.
+
+        :param event: Event starting the value.
+        :param line: Number of the line of the value.
+        :type line: int
+        :return: Empty :class:`dict` or :class:`list`.
+        """
+        _error("Unexpected " + _NAMES[event], line, self.name)
+
+    def entity(self, value, literal, line):
+        """Converts the value of an entity, called once :meth:`start`
+        accepted the entity, as a primitive value by default.
+
+        :return: Converted value.
+        """
+        return self.scalar(value, literal, line)
+
+    def field(self, key, literal, line):
+        """Converts the key of an item of a mapping, called once
+        :meth:`start` accepted the mapping. The key is kept and the value
+        is of the node of the items by default.
+
+        :param key: Parsed key.
+        :param literal: Whether the key is a bare literal.
+        :type literal: bool
+        :param line: Number of the line of the key.
+        :type line: int
+        :return: Pair (key, node of the value).
+        """
+        return key, self.item
+
+    def finish(self, container, entity, line):
+        """Converts the container once all its items are parsed.
+
+        :param container: Container created by :meth:`start`.
+        :param entity: Value of the entity, :data:`_no_entity` if the
+            container is not one.
+        :param line: Number of the line where the value started.
+        :type line: int
+        :return: Converted value.
+        """
+        return container
+
+
+class _Scalar(_Node):
+    """Primitive value converted by the given function.
+
+    :param convert: Function converting a string, returning
+        :data:`_invalid` if it cannot be converted.
+    :param quoted: Whether quoted strings are accepted too.
+    :type quoted: bool
+    """
+
+    def __init__(self, name, convert, quoted=False):
+        super(_Scalar, self).__init__(name)
+        self.convert = convert
+        self.quoted = quoted
+
+    def scalar(self, value, literal, line):
+        if value is not None and (literal or self.quoted):
+            converted = self.convert(value)
+            if converted is not _invalid:
+                return converted
+        _error("Invalid {} {!r}".format(self.name, value), line)
+
+
+class _Optional(_Node):
+    """Value of the given node or null."""
+
+    def __init__(self, name, node):
+        super(_Optional, self).__init__(name)
+        self.node = node
+
+    @property
+    def item(self):
+        return self.node.item
+
+    def scalar(self, value, literal, line):
+        if value is None or literal and value in NULLS:
+            return None
+        return self.node.scalar(value, literal, line)
+
+    def start(self, event, line):
+        return self.node.start(event, line)
+
+    def entity(self, value, literal, line):
+        return self.node.entity(value, literal, line)
+
+    def field(self, key, literal, line):
+        return self.node.field(key, literal, line)
+
+    def finish(self, container, entity, line):
+        return self.node.finish(container, entity, line)
+
+
+class _Sequence(_Node):
+    """Sequence of the values of the given node."""
+
+    def __init__(self, name, item):
+        super(_Sequence, self).__init__(name)
+        self.item = item
+
+    def start(self, event, line):
+        if event is not START_SEQUENCE:
+            return super(_Sequence, self).start(event, line)
+        return []
+
+
+class _Mapping(_Node):
+    """Mapping of the keys and values of the given nodes."""
+
+    def __init__(self, name, key, value):
+        super(_Mapping, self).__init__(name)
+        self.key = key
+        self.value = value
+
+    def start(self, event, line):
+        if event is not START_MAPPING:
+            return super(_Mapping, self).start(event, line)
+        return {}
+
+    def field(self, key, literal, line):
+        return self.key.scalar(key, literal, line), self.value
+
+
+class _Record(_Node):
+    """Mapping of the given keys, optionally built into an object.
+
+    The fields are set once compiled, so that a record may contain
+    itself.
+
+    :param factory: Callable building the object of the fields given
+        as keyword arguments, if any.
+    """
+
+    def __init__(self, name, factory=None):
+        super(_Record, self).__init__(name)
+        self.factory = factory
+        self.fields = {}
+        self.required = ()
+
+    def start(self, event, line):
+        if event is not START_MAPPING:
+            return super(_Record, self).start(event, line)
+        return {}
+
+    def field(self, key, literal, line):
+        node = self.fields.get(key)
+        if node is None:
+            _error("Unknown field {!r} of {}".format(key, self.name), line)
+        return key, node
+
+    def finish(self, container, entity, line):
+        for name in self.required:
+            if name not in container:
+                _error("Missing field {!r} of {}".format(name, self.name), line)
+        if self.factory is None:
+            return container
+        return self.factory(**container)
+
+
+class _Any(_Node):
+    """Any value, decoded with the types of the literals inferred.
+
+    :param scanner: Options of the inference.
+    :type scanner: :class:`neon.decoder.Scanner`
+    """
+
+    def __init__(self, name, scanner):
+        super(_Any, self).__init__(name)
+        self.scanner = scanner
+        self.item = self
+
+    def scalar(self, value, literal, line):
+        if literal:
+            return Literal.do(self.scanner, value)[1]
+        return value
+
+    entity = scalar
+
+    def start(self, event, line):
+        if event is START_SEQUENCE:
+            return []
+        return {}
+
+    def field(self, key, literal, line):
+        if literal:
+            key = Literal.do(self.scanner, key)[1]
+        return key, self
+
+    def finish(self, container, entity, line):
+        if entity is _no_entity:
+            return container
+        return Entity(entity, container)
+
+
+class _Entity(_Any):
+    """Entity with any value and attributes."""
+
+    def __init__(self, name, node):
+        super(_Entity, self).__init__(name, node.scanner)
+        self.item = node
+
+    def scalar(self, value, literal, line):
+        _error("Unexpected value {!r}".format(value), line, self.name)
+
+    def start(self, event, line):
+        if event is not START_ENTITY:
+            return _Node.start(self, event, line)
+        return {}
+
+    field = _Node.field
+
+
+class _Compiler(object):
+    """Compiles schemas into trees of nodes.
+
+    :param datetime: Engine used to convert literals to datetimes.
+    :type datetime: str
+    :param stats: Statistics of the inferred literals to collect, if any.
+    :type stats: :class:`neon.stats.ParseStats`
+    """
+
+    def __init__(self, datetime="dateutil", stats=None):
+        self.any = _Any("any", Scanner(datetime, stats=stats))
+        self.entity = _Entity("entity", self.any)
+        self.engine = datetime
+        self.stats = stats
+        self.records = {}
+
+    def _datetime(self, string):
+        value = DateTime.convert(string, self.engine, self.stats)
+        return _invalid if value is None else value
+
+    def compile(self, schema):
+        """Compiles the schema.
+
+        :param schema: Type or specification of types.
+        :return: Root node of the schema.
+        :raises: :class:`TypeError` if the schema is not supported.
+        """
+        if isinstance(schema, list):
+            if len(schema) != 1:
+                raise TypeError(
+                    "Sequence schema {!r} must have one item.".format(schema)
+                )
+            return _Sequence("list", self.compile(schema[0]))
+        if isinstance(schema, dict):
+            record = _Record("mapping")
+            record.fields = {key: self.compile(value) for key, value in schema.items()}
+            record.required = tuple(schema)
+            return record
+        if dataclasses.is_dataclass(schema) and isinstance(schema, type):
+            return self._dataclass(schema)
+
+        if schema is typing.Any or schema is object:
+            return self.any
+        if schema is Entity:
+            return self.entity
+        if schema is str:
+            return _Scalar("str", str, quoted=True)
+        if schema is int:
+            return _Scalar("int", _int)
+        if schema is float:
+            return _Scalar("float", _float)
+        if schema is bool:
+            return _Scalar("bool", _bool)
+        if schema is type(None):
+            return _Scalar("null", _none)
+        if schema is datetime.datetime:
+            return _Scalar("datetime", self._datetime)
+        if schema is list:
+            return _Sequence("list", self.any)
+        if schema is dict:
+            return _Mapping("dict", self.any, self.any)
+
+        origin = getattr(schema, "__origin__", None)
+        args = getattr(schema, "__args__", None) or ()
+        if origin is typing.Union:
+            others = [arg for arg in args if arg is not type(None)]
+            if len(others) == 1 and len(args) == 2:
+                return _Optional(str(schema), self.compile(others[0]))
+        elif origin is list:
+            item = self.compile(args[0]) if args else self.any
+            return _Sequence(str(schema), item)
+        elif origin is dict:
+            key, value = [self.compile(arg) for arg in args] or [self.any, self.any]
+            return _Mapping(str(schema), key, value)
+        raise TypeError("Unsupported schema {!r}.".format(schema))
+
+    def _dataclass(self, cls):
+        record = self.records.get(cls)
+        if record is not None:
+            return record
+        record = self.records[cls] = _Record(cls.__name__, cls)
+        hints = typing.get_type_hints(cls)
+        required = []
+        for field in dataclasses.fields(cls):
+            if not field.init:
+                continue
+            record.fields[field.name] = self.compile(hints[field.name])
+            if (
+                field.default is dataclasses.MISSING
+                and field.default_factory is dataclasses.MISSING
+            ):
+                required.append(field.name)
+        record.required = tuple(required)
+        return record
+
+
+def build(events, tokens, node):
+    """Builds the typed value of the events.
+
+    :param events: Iterable of pairs (event, value) as generated by
+        :func:`neon.decoder.events` of the tokens.
+    :param tokens: Token buffer the events are generated of, scanned
+        without inferring the types of the literals.
+    :type tokens: :class:`neon.decoder.tokenize`
+    :param node: Root node of the compiled schema.
+    :return: Parsed value.
+    :raises: :class:`errors.SchemaError` if a value does not match
+        the schema.
+    """
+    kinds = tokens.kinds
+    document = _Node("document")
+    document.item = child = node
+    node = document
+    root = container = []
+    stack = []
+    key = start = key_line = None
+    entity = _no_entity
+
+    for event, value in events:
+        line = tokens.lines[tokens.pos]
+        if event is KEY:
+            literal = value.__class__ is str and kinds[tokens.pos] == LITERAL
+            key, child = node.field(value, literal, line)
+            key_line = line
+            continue
+        if event is SCALAR:
+            literal = value is not None and kinds[tokens.pos] == LITERAL
+            # The parser is past the end of an empty value of a key.
+            if value is None and key_line is not None:
+                line = key_line
+            key_line = None
+            value = child.scalar(value, literal, line)
+        elif event is START_MAPPING or event is START_SEQUENCE or event is START_ENTITY:
+            stack.append((node, container, key, entity, start))
+            container = child.start(event, line)
+            if event is START_ENTITY:
+                entity = child.entity(value, kinds[tokens.pos] == LITERAL, line)
+            else:
+                entity = _no_entity
+            node = child
+            child = node.item
+            start = line
+            key_line = None
+            continue
+        else:
+            value = node.finish(container, entity, start)
+            node, container, key, entity, start = stack.pop()
+            child = node.item
+        if container.__class__ is list:
+            container.append(value)
+        else:
+            container[key] = value
+
+    return root[0]
+
+
+def parse(
+    input_string,
+    schema,
+    chunk_size=CHUNK_SIZE,
+    datetime="dateutil",
+    stats=None,
+    intern=False,
+    limits=None,
+    lexer="re",
+):
+    """Parses given string according to NEON syntax into the typed value
+    described by the schema.
+
+    :param input_string: String or file object to parse.
+    :type input_string: string
+    :param schema: Type or specification of types of the document.
+    :param chunk_size: Number of characters read from a file object
+        at once.
+    :type chunk_size: int
+    :param datetime: Engine used to convert literals to datetimes, in
+        values of any type and in datetime fields, where ``off`` stands
+        for ``dateutil``.
+    :type datetime: str
+    :param stats: Statistics to collect, if any.
+    :type stats: :class:`neon.stats.ParseStats`
+    :param intern: Whether equal short strings of the document are
+        shared, or a dictionary used as the table of the shared strings.
+    :type intern: bool or dict
+    :param limits: Limits of the document, if any.
+    :type limits: :class:`neon.limits.Limits`
+    :param lexer: Scanner of the tokens, ``re`` or ``linear``.
+    :type lexer: str
+    :return: Parsed value.
+    :raises: :class:`errors.SchemaError` if the document does not match
+        the schema.
+    """
+    node = _Compiler(datetime, stats).compile(schema)
+    scanner = Scanner(
+        datetime,
+        infer=False,
+        stats=stats,
+        strings=_strings(intern),
+        limits=limits,
+        lexer=lexer,
+    )
+    tokens = tokenize(input_string, chunk_size, scanner)
+
+    def build_typed(events):
+        return build(events, tokens, node)
+
+    if stats is not None:
+        return _measured_parse(tokens, build_typed, stats)
+    return build_typed(events(tokens))
@@ -0,0 +1,513 @@
+"""Decoded documents published in shared memory for pools of processes.
+
+A published document is encoded once into an immutable binary layout in
+:mod:`multiprocessing.shared_memory`. Other processes attach to it by name
+and read it through read-only views, which decode the values from the
+shared buffer when they are accessed, so the document is never copied
+into the private memory of the processes.
+
+The layout starts with a header of :data:`MAGIC`, the offset of the root
+value and the size of the layout, followed by the records of the values.
+A record is a tag byte followed by:
+
+* nothing for :obj:`None` and booleans,
+* a signed 64-bit integer, a double or a 32-bit length and the UTF-8
+  encoded text of strings, datetimes and integers that do not fit in
+  64 bits,
+* the number of the items and the offsets of their records for
+  sequences,
+* the number of the items, the offsets of the keys and values in the
+  order of the mapping and a hash table of pairs of the hashes of the
+  keys and the positions of the items plus one, with linear probing and
+  twice as many slots as items rounded up to a power of two, for
+  mappings,
+* the offsets of the value and the attributes of entities.
+
+All numbers are little-endian, equal strings are stored only once.
+Publishing and attaching require Python 3.8 or later, the layout itself
+can be encoded by any version.
+"""
+import datetime
+import struct
+import zlib
+from collections.abc import ItemsView, Mapping, Sequence, ValuesView
+
+from .entity import Entity
+
+#: Marks the start of a published document, changed with the layout.
+MAGIC = b"NEONSHM\x01"
+
+#: Header of the layout, the magic, the offset of the root and the size.
+HEADER = struct.Struct("<8sII")
+
+#: Maximum size of the layout, offsets are 32-bit.
+MAX_SIZE = 0xFFFFFFFF
+
+#: Tags of the records.
+_NONE, _TRUE, _FALSE, _INT, _BIGINT, _FLOAT, _STR, _DATETIME = b"NTFiIfsd"
+_MAPPING, _SEQUENCE, _ENTITY = b"mle"
+
+_U32 = struct.Struct("<I")
+_PAIR = struct.Struct("<II")
+_INT64 = struct.Struct("<q")
+_FLOAT64 = struct.Struct("<d")
+
+#: Size of the tag and the number of the items of containers.
+_COUNTED = 1 + _U32.size
+
+
+def _hash(key):
+    """Hash of a key of a mapping, stable across processes.
+
+    Keys equal in Python have equal hashes, e.g. ``1``, ``1.0`` and
+    :obj:`True`.
+
+    :return: Unsigned 32-bit hash, :obj:`None` if keys of the type cannot
+        be published.
+    """
+    if isinstance(key, str):
+        data = b"s" + key.encode("utf-8", "surrogatepass")
+    elif isinstance(key, int) or (isinstance(key, float) and key.is_integer()):
+        data = b"i%d" % key
+    elif isinstance(key, float):
+        data = b"f" + repr(key).encode("ascii")
+    elif key is None:
+        data = b"N"
+    elif isinstance(key, datetime.datetime):
+        offset = key.utcoffset()
+        if offset is not None:
+            key = (key - offset).replace(tzinfo=None)
+        data = b"d" + key.isoformat().encode("ascii")
+    else:
+        return None
+    return zlib.crc32(data)
+
+
+def _slots(count):
+    """Number of the slots of the hash table of a mapping."""
+    return 1 << (2 * count - 1).bit_length() if count else 0
+
+
+class _Writer(object):
+    """Encoder of a decoded tree into the binary layout."""
+
+    def __init__(self):
+        self.out = bytearray(HEADER.size)
+        self._strings = {}
+
+    def _text(self, tag, string):
+        data = string.encode("utf-8", "surrogatepass")
+        offset = len(self.out)
+        self.out.append(tag)
+        self.out += _U32.pack(len(data))
+        self.out += data
+        return offset
+
+    def _mapping(self, mapping, offsets):
+        start = len(offsets) - 2 * len(mapping)
+        items = list(zip(offsets[start::2], offsets[start + 1 :: 2]))
+        del offsets[start:]
+        mask = _slots(len(items)) - 1
+        table = [(0, 0)] * (mask + 1)
+        for position, key in enumerate(mapping, 1):
+            digest = _hash(key)
+            if digest is None:
+                msg = "Cannot publish keys of type {!r}."
+                raise TypeError(msg.format(type(key).__name__))
+            slot = digest & mask
+            while table[slot][1]:
+                slot = (slot + 1) & mask
+            table[slot] = (digest, position)
+        offset = len(self.out)
+        self.out.append(_MAPPING)
+        self.out += _U32.pack(len(items))
+        for pair in items + table:
+            self.out += _PAIR.pack(*pair)
+        return offset
+
+    def _sequence(self, sequence, offsets):
+        count = len(sequence)
+        items = offsets[len(offsets) - count :]
+        del offsets[len(offsets) - count :]
+        offset = len(self.out)
+        self.out.append(_SEQUENCE)
+        self.out += _U32.pack(count)
+        self.out += struct.pack("<{}I".format(count), *items)
+        return offset
+
+    def _entity(self, entity, offsets):
+        pair = offsets[-2:]
+        del offsets[-2:]
+        offset = len(self.out)
+        self.out.append(_ENTITY)
+        self.out += _PAIR.pack(*pair)
+        return offset
+
+    def _scalar(self, value):
+        if isinstance(value, str):
+            offset = self._strings.get(value)
+            if offset is None:
+                offset = self._strings[value] = self._text(_STR, value)
+            return offset
+        if isinstance(value, datetime.datetime):
+            return self._text(_DATETIME, value.isoformat())
+
+        offset = len(self.out)
+        if value is None:
+            self.out.append(_NONE)
+        elif value is True or value is False:
+            self.out.append(_TRUE if value else _FALSE)
+        elif isinstance(value, int):
+            try:
+                data = _INT64.pack(value)
+            except struct.error:
+                return self._text(_BIGINT, str(value))
+            self.out.append(_INT)
+            self.out += data
+        elif isinstance(value, float):
+            self.out.append(_FLOAT)
+            self.out += _FLOAT64.pack(value)
+        else:
+            msg = "Cannot publish values of type {!r}."
+            raise TypeError(msg.format(type(value).__name__))
+        return offset
+
+    def write(self, value):
+        """Appends the records of the value.
+
+        The records of the items are appended before the records of their
+        containers. The tree is traversed with an explicit stack, so it
+        can be nested deeper than the recursion limit.
+
+        :return: Offset of the record of the value.
+        :raises: :class:`TypeError` if the value cannot be published.
+        """
+        # Entries are pairs of a value and the method appending its
+        # record once the offsets of its items are known, the values to
+        # visit have no method. The offsets of the records are kept in
+        # the order of the items.
+        offsets = []
+        stack = [(value, None)]
+        while stack:
+            value, finish = stack.pop()
+            if finish is not None:
+                offsets.append(finish(value, offsets))
+            elif isinstance(value, str):
+                offsets.append(self._scalar(value))
+            elif isinstance(value, Mapping):
+                stack.append((value, self._mapping))
+                for key, item in reversed(list(value.items())):
+                    stack.append((item, None))
+                    stack.append((key, None))
+            elif isinstance(value, Entity):
+                stack.append((value, self._entity))
+                stack.append((value.attributes, None))
+                stack.append((value.value, None))
+            elif isinstance(value, Sequence) and not isinstance(
+                value, (bytes, bytearray)
+            ):
+                stack.append((value, self._sequence))
+                stack.extend((item, None) for item in reversed(value))
+            else:
+                offsets.append(self._scalar(value))
+        return offsets[0]
+
+
+def encode(tree):
+    """Encodes the decoded tree into the binary layout.
+
+    :param tree: Decoded tree of mappings, sequences, entities and
+        scalars.
+    :return: The layout.
+    :rtype: bytearray
+    :raises: :class:`TypeError` if the tree contains values that cannot
+        be published, :class:`ValueError` if it is too large.
+    """
+    writer = _Writer()
+    root = writer.write(tree)
+    out = writer.out
+    if len(out) > MAX_SIZE:
+        raise ValueError("Document is too large to be published.")
+    HEADER.pack_into(out, 0, MAGIC, root, len(out))
+    return out
+
+
+def _value(memory, buf, offset):
+    """Reads the value of the record at the offset.
+
+    Containers are returned as views, scalars are decoded.
+    """
+    tag = buf[offset]
+    if tag == _STR:
+        (size,) = _U32.unpack_from(buf, offset + 1)
+        start = offset + 1 + _U32.size
+        return str(buf[start : start + size], "utf-8", "surrogatepass")
+    if tag == _MAPPING:
+        return SharedMapping(memory, buf, offset)
+    if tag == _SEQUENCE:
+        return SharedSequence(memory, buf, offset)
+    if tag == _INT:
+        return _INT64.unpack_from(buf, offset + 1)[0]
+    if tag == _FLOAT:
+        return _FLOAT64.unpack_from(buf, offset + 1)[0]
+    if tag == _TRUE or tag == _FALSE:
+        return tag == _TRUE
+    if tag == _NONE:
+        return None
+    if tag == _ENTITY:
+        return SharedEntity(memory, buf, offset)
+    (size,) = _U32.unpack_from(buf, offset + 1)
+    start = offset + 1 + _U32.size
+    text = str(buf[start : start + size], "ascii")
+    if tag == _DATETIME:
+        return datetime.datetime.fromisoformat(text)
+    return int(text)
+
+
+class _ItemsView(ItemsView):
+    def __iter__(self):
+        return self._mapping._items()
+
+
+class _ValuesView(ValuesView):
+    def __iter__(self):
+        for key, value in self._mapping._items():
+            yield value
+
+
+class SharedMapping(Mapping):
+    """Read-only view of a published mapping.
+
+    Keys are looked up in a hash table, the values are decoded on every
+    access.
+    """
+
+    __slots__ = ("_memory", "_buf", "_offset", "_count")
+
+    def __init__(self, memory, buf, offset):
+        self._memory = memory
+        self._buf = buf
+        self._offset = offset
+        self._count = _U32.unpack_from(buf, offset + 1)[0]
+
+    def _items(self):
+        memory, buf = self._memory, self._buf
+        start = self._offset + _COUNTED
+        for position in range(self._count):
+            key, value = _PAIR.unpack_from(buf, start + position * _PAIR.size)
+            yield _value(memory, buf, key), _value(memory, buf, value)
+
+    def __getitem__(self, key):
+        digest = _hash(key)
+        if digest is not None and self._count:
+            buf = self._buf
+            start = self._offset + _COUNTED
+            table = start + self._count * _PAIR.size
+            mask = _slots(self._count) - 1
+            slot = digest & mask
+            while True:
+                found, position = _PAIR.unpack_from(buf, table + slot * _PAIR.size)
+                if not position:
+                    break
+                if found == digest:
+                    record = start + (position - 1) * _PAIR.size
+                    key_offset, value_offset = _PAIR.unpack_from(buf, record)
+                    if _value(self._memory, buf, key_offset) == key:
+                        return _value(self._memory, buf, value_offset)
+                slot = (slot + 1) & mask
+        raise KeyError(key)
+
+    def __iter__(self):
+        for key, value in self._items():
+            yield key
+
+    def __len__(self):
+        return self._count
+
+    def items(self):
+        return _ItemsView(self)
+
+    def values(self):
+        return _ValuesView(self)
+
+    def __repr__(self):
+        return repr(dict(self._items()))
+
+
+class SharedSequence(Sequence):
+    """Read-only view of a published sequence.
+
+    The items are decoded on every access. The view is equal to other
+    sequences with equal items, e.g. lists.
+    """
+
+    __slots__ = ("_memory", "_buf", "_offset", "_count")
+
+    __hash__ = None
+
+    def __init__(self, memory, buf, offset):
+        self._memory = memory
+        self._buf = buf
+        self._offset = offset
+        self._count = _U32.unpack_from(buf, offset + 1)[0]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("sequence index out of range")
+        start = self._offset + _COUNTED + index * _U32.size
+        return _value(self._memory, self._buf, _U32.unpack_from(self._buf, start)[0])
+
+    def __iter__(self):
+        memory, buf = self._memory, self._buf
+        offsets = struct.unpack_from(
+            "<{}I".format(self._count), buf, self._offset + _COUNTED
+        )
+        for offset in offsets:
+            yield _value(memory, buf, offset)
+
+    def __len__(self):
+        return self._count
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class SharedEntity(Entity):
+    """Read-only view of a published entity."""
+
+    def __init__(self, memory, buf, offset):
+        self._memory = memory
+        self._buf = buf
+        self._offset = offset
+
+    @property
+    def value(self):
+        offset = _PAIR.unpack_from(self._buf, self._offset + 1)[0]
+        return _value(self._memory, self._buf, offset)
+
+    @property
+    def attributes(self):
+        offset = _PAIR.unpack_from(self._buf, self._offset + 1)[1]
+        return SharedMapping(self._memory, self._buf, offset)
+
+
+class SharedConfig(object):
+    """Decoded document published in shared memory.
+
+    The decoded tree is available as :attr:`tree`, where mappings,
+    sequences and entities are read-only views of the shared buffer.
+    Datetimes are read by :meth:`datetime.datetime.fromisoformat`, so
+    their time zones are fixed offsets. The views cannot be used once the
+    document is closed.
+
+    Pickling the document, e.g. to pass it to the workers of
+    a :mod:`multiprocessing` pool, attaches the unpickled document to the
+    same shared memory.
+
+    :param memory: Shared memory with the layout.
+    :type memory: :class:`multiprocessing.shared_memory.SharedMemory`
+    :param owner: Whether the shared memory is removed when the document
+        is used as a context manager.
+    :type owner: bool
+    :raises: :class:`ValueError` if the shared memory does not contain
+        a published document.
+    """
+
+    def __init__(self, memory, owner=False):
+        magic = None
+        if memory.size >= HEADER.size:
+            magic, root, size = HEADER.unpack_from(memory.buf)
+        if magic != MAGIC or size > memory.size:
+            memory.close()
+            msg = "Shared memory {!r} does not contain a published document."
+            raise ValueError(msg.format(memory.name))
+        self._memory = memory
+        self.owner = owner
+        self.name = memory.name
+        self.size = size
+        self.tree = _value(memory, memory.buf, root)
+
+    def close(self):
+        """Closes the access to the shared memory from this process."""
+        self.tree = None
+        self._memory.close()
+
+    def unlink(self):
+        """Removes the shared memory once all the processes close it."""
+        self._memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    def __reduce__(self):
+        return attach, (self.name,)
+
+
+def _shared_memory():
+    """Imports :mod:`multiprocessing.shared_memory`, new in Python 3.8.
+
+    :raises: :class:`RuntimeError` if it is not available.
+    """
+    try:
+        from multiprocessing import shared_memory
+    except ImportError:
+        raise RuntimeError("Shared memory requires Python 3.8 or later.")
+    return shared_memory
+
+
+def publish(tree, name=None):
+    """Publishes the decoded tree in shared memory.
+
+    The returned document owns the shared memory, which exists until it
+    is unlinked, even after the publishing process exits.
+
+    :param tree: Decoded tree.
+    :param name: Name of the shared memory, a unique name by default.
+    :type name: str
+    :rtype: :class:`SharedConfig`
+    :raises: :class:`TypeError` if the tree contains values that cannot
+        be published, :class:`FileExistsError` if the name is taken,
+        :class:`RuntimeError` before Python 3.8.
+    """
+    shared_memory = _shared_memory()
+    data = encode(tree)
+    memory = shared_memory.SharedMemory(name, create=True, size=len(data))
+    memory.buf[: len(data)] = data
+    return SharedConfig(memory, owner=True)
+
+
+def attach(name):
+    """Attaches to a document published by another process.
+
+    Before Python 3.13 the attached shared memory is tracked by the
+    resource tracker of :mod:`multiprocessing`, so processes outside of
+    the process tree of the publisher remove it when they exit.
+
+    :param name: Name of the shared memory.
+    :type name: str
+    :rtype: :class:`SharedConfig`
+    :raises: :class:`FileNotFoundError` if there is no such shared memory,
+        :class:`ValueError` if it does not contain a published document,
+        :class:`RuntimeError` before Python 3.8.
+    """
+    shared_memory = _shared_memory()
+
+    try:
+        memory = shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        memory = shared_memory.SharedMemory(name)
+    return SharedConfig(memory)
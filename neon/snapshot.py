@@ -0,0 +1,411 @@
+"""Snapshots of decoded files stored on disk, similar to ``.pyc`` files.
+
+A snapshot starts with :data:`MAGIC` followed by a key, which is a hash
+of the content of the source file, the version of the parser and the
+options of decoding. The rest of the snapshot is the tree in prefix
+order, each value is a tag byte followed by:
+
+* nothing for :obj:`None` and booleans,
+* a signed 64-bit integer or a double,
+* a 32-bit length and the UTF-8 encoded text of strings and integers
+  that do not fit in 64 bits,
+* the tag of the time zone, the offset of the time zone in seconds, the
+  name of the time zone and the text of the naive datetime in ISO 8601
+  for datetimes,
+* the number of the items and the items for sequences, the number of
+  the items and the keys followed by their values for mappings,
+* the value and the mapping of the attributes for entities.
+
+All numbers are little-endian. Unlike pickles, snapshots contain only
+the types of decoded trees, so a snapshot cannot run any code when it is
+read. Snapshots are still trusted to contain the tree of the file, so the
+cache directory is created accessible only by its owner and snapshots in
+directories or files of other users are ignored.
+"""
+import datetime
+import os
+import struct
+
+from .decoder import parse
+from .entity import Entity
+from .version import version
+
+#: Marks the start of a snapshot, changed with the format of snapshots.
+MAGIC = b"NEONC\x00\x02"
+
+#: Suffix of the snapshot files.
+SUFFIX = ".neonc"
+
+#: Tags of the values.
+_NONE, _TRUE, _FALSE, _INT, _BIGINT, _FLOAT, _STR, _DATETIME = b"NTFiIfsd"
+_MAPPING, _SEQUENCE, _ENTITY = b"mle"
+
+#: Tags of the time zones of datetimes, the classes of :mod:`dateutil.tz`
+#: returned by the ``dateutil`` engine and fixed offsets of
+#: :class:`datetime.timezone`.
+_NAIVE, _UTC, _LOCAL, _OFFSET, _FIXED = b"nulot"
+
+_U32 = struct.Struct("<I")
+_INT64 = struct.Struct("<q")
+_FLOAT64 = struct.Struct("<d")
+_TIMEZONE = struct.Struct("<Bi")
+
+
+def _text(out, tag, string):
+    data = string.encode("utf-8", "surrogatepass")
+    out.append(tag)
+    out += _U32.pack(len(data))
+    out += data
+
+
+def _timezone(tzinfo):
+    """Tag of the time zone of a datetime.
+
+    :raises: :class:`TypeError` if the time zone cannot be stored.
+    """
+    if tzinfo is None:
+        return _NAIVE
+    if tzinfo.__class__ is datetime.timezone:
+        return _FIXED
+    from dateutil import tz
+
+    if isinstance(tzinfo, tz.tzutc):
+        return _UTC
+    if isinstance(tzinfo, tz.tzlocal):
+        return _LOCAL
+    if isinstance(tzinfo, tz.tzoffset):
+        return _OFFSET
+    raise TypeError(
+        "Cannot store time zones of type {!r}.".format(type(tzinfo).__name__)
+    )
+
+
+def encode(tree, out):
+    """Appends the encoded tree.
+
+    The tree is traversed with an explicit stack, so it can be nested
+    deeper than the recursion limit.
+
+    :param tree: Decoded tree.
+    :param out: Buffer of the snapshot.
+    :type out: bytearray
+    :raises: :class:`TypeError` if the tree contains values that cannot
+        be stored.
+    """
+    # The values are encoded in prefix order, the items of containers
+    # are pushed in reverse, so they are popped in their order.
+    stack = [tree]
+    while stack:
+        tree = stack.pop()
+        cls = tree.__class__
+        if cls is str:
+            _text(out, _STR, tree)
+        elif cls is dict:
+            out.append(_MAPPING)
+            out += _U32.pack(len(tree))
+            for key, value in reversed(list(tree.items())):
+                stack.append(value)
+                stack.append(key)
+        elif cls is list:
+            out.append(_SEQUENCE)
+            out += _U32.pack(len(tree))
+            stack.extend(reversed(tree))
+        elif cls is Entity:
+            out.append(_ENTITY)
+            stack.append(tree.attributes)
+            stack.append(tree.value)
+        elif tree is None:
+            out.append(_NONE)
+        elif cls is bool:
+            out.append(_TRUE if tree else _FALSE)
+        elif cls is int:
+            try:
+                data = _INT64.pack(tree)
+            except struct.error:
+                _text(out, _BIGINT, str(tree))
+            else:
+                out.append(_INT)
+                out += data
+        elif cls is float:
+            out.append(_FLOAT)
+            out += _FLOAT64.pack(tree)
+        elif cls is datetime.datetime:
+            tag = _timezone(tree.tzinfo)
+            offset = tree.utcoffset()
+            out.append(_DATETIME)
+            out += _TIMEZONE.pack(
+                tag, offset // datetime.timedelta(seconds=1) if offset else 0
+            )
+            name = tree.tzname() if tag == _OFFSET else None
+            if name is None:
+                out.append(_NONE)
+            else:
+                _text(out, _STR, name)
+            _text(out, _STR, tree.replace(tzinfo=None).isoformat())
+        else:
+            raise TypeError("Cannot store values of type {!r}.".format(cls.__name__))
+
+
+class _Reader(object):
+    """Decoder of the tree of a snapshot.
+
+    :param data: Encoded tree.
+    :type data: bytes
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def _unpack(self, layout):
+        value = layout.unpack_from(self.data, self.pos)
+        self.pos += layout.size
+        return value
+
+    def _text(self):
+        (size,) = self._unpack(_U32)
+        start = self.pos
+        self.pos += size
+        if self.pos > len(self.data):
+            raise ValueError("Truncated snapshot.")
+        return str(self.data[start : self.pos], "utf-8", "surrogatepass")
+
+    def _datetime(self):
+        tag, offset = self._unpack(_TIMEZONE)
+        name = self.read()
+        value = datetime.datetime.fromisoformat(self.read())
+        if tag == _NAIVE:
+            return value
+        if tag == _FIXED:
+            tzinfo = datetime.timezone(datetime.timedelta(seconds=offset))
+        else:
+            from dateutil import tz
+
+            if tag == _UTC:
+                tzinfo = tz.tzutc()
+            elif tag == _LOCAL:
+                tzinfo = tz.tzlocal()
+            elif tag == _OFFSET:
+                tzinfo = tz.tzoffset(name, offset)
+            else:
+                raise ValueError("Unknown time zone tag {!r}.".format(tag))
+        return value.replace(tzinfo=tzinfo)
+
+    def _scalar(self, tag):
+        if tag == _STR:
+            return self._text()
+        if tag == _NONE:
+            return None
+        if tag == _TRUE or tag == _FALSE:
+            return tag == _TRUE
+        if tag == _INT:
+            return self._unpack(_INT64)[0]
+        if tag == _FLOAT:
+            return self._unpack(_FLOAT64)[0]
+        if tag == _BIGINT:
+            return int(self._text())
+        if tag == _DATETIME:
+            return self._datetime()
+        raise ValueError("Unknown tag {!r}.".format(tag))
+
+    def read(self):
+        """Reads the next value.
+
+        The containers being read are kept in an explicit stack, so the
+        tree can be nested deeper than the recursion limit.
+
+        :raises: :class:`ValueError` or :class:`struct.error` if the
+            snapshot is corrupted.
+        """
+        # Entries are lists of the tag, the container, the number of the
+        # values still to read and the last key, or the value of an
+        # entity. Keys and values of mappings alternate, so a key is
+        # expected while an even number of values is left.
+        stack = []
+        while True:
+            tag = self.data[self.pos]
+            self.pos += 1
+            if tag == _MAPPING or tag == _SEQUENCE:
+                (count,) = self._unpack(_U32)
+                if tag == _MAPPING:
+                    value, count = {}, 2 * count
+                else:
+                    value = []
+                if count:
+                    stack.append([tag, value, count, None])
+                    continue
+            elif tag == _ENTITY:
+                stack.append([tag, None, 2, None])
+                continue
+            else:
+                value = self._scalar(tag)
+
+            while stack:
+                entry = stack[-1]
+                tag, container, count, key = entry
+                if tag == _SEQUENCE:
+                    container.append(value)
+                elif count % 2 == 0:
+                    entry[3] = value
+                elif tag == _MAPPING:
+                    container[key] = value
+                else:
+                    container = Entity(key, value)
+                entry[2] = count - 1
+                if count > 1:
+                    break
+                stack.pop()
+                value = container
+            else:
+                return value
+
+
+def decode(data):
+    """Decodes the tree of a snapshot.
+
+    :param data: Encoded tree.
+    :type data: bytes
+    :return: Decoded tree.
+    :raises: :class:`ValueError`, :class:`IndexError` or
+        :class:`struct.error` if the data are corrupted.
+    """
+    reader = _Reader(data)
+    tree = reader.read()
+    if reader.pos != len(data):
+        raise ValueError("Trailing data in snapshot.")
+    return tree
+
+
+def _owned(stat):
+    """Tells whether the file is owned by the current user, always true
+    on systems without owners of files."""
+    return not hasattr(os, "getuid") or stat.st_uid == os.getuid()
+
+
+def snapshot_path(path, cache_dir):
+    """Path of the snapshot of the given file.
+
+    :param path: Path to the source file.
+    :param cache_dir: Directory with snapshots.
+    :rtype: str
+    """
+    import hashlib  # imported on first use with the other slow imports
+
+    name = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, name + SUFFIX)
+
+
+def snapshot_key(content, options):
+    """Key identifying the snapshot of the given content.
+
+    :param content: Content of the source file.
+    :type content: bytes
+    :param options: Options of decoding.
+    :type options: dict
+    :rtype: bytes
+    """
+    import hashlib
+
+    digest = hashlib.sha256()
+    digest.update(repr((version, sorted(options.items()))).encode("utf-8"))
+    digest.update(content)
+    return digest.digest()
+
+
+def read(path, key):
+    """Reads the tree from a snapshot.
+
+    :param path: Path to the snapshot.
+    :param key: Expected key of the snapshot.
+    :return: Pair (found, tree), the snapshot is not found if it does
+        not exist, its key does not match or it is corrupted.
+    """
+    try:
+        if not _owned(os.stat(os.path.dirname(path))):
+            return False, None
+        with open(path, "rb") as fp:
+            if not _owned(os.fstat(fp.fileno())):
+                return False, None
+            data = fp.read()
+    except OSError:
+        return False, None
+    header = MAGIC + key
+    if not data.startswith(header):
+        return False, None
+    try:
+        return True, decode(memoryview(data)[len(header) :])
+    except Exception:
+        return False, None
+
+
+def write(path, key, tree):
+    """Writes the tree to a snapshot atomically.
+
+    The snapshot is written to a temporary file first, which then
+    replaces the old snapshot. A missing directory is created accessible
+    only by the current user, nothing is written to a directory of
+    another user. Snapshots are only a cache, so errors of the file
+    system and trees with values that cannot be stored are ignored,
+    other errors are raised.
+
+    :param path: Path to the snapshot.
+    :param key: Key of the snapshot.
+    :param tree: Decoded tree.
+    """
+    import tempfile
+
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if not _owned(os.stat(directory)):
+            return
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=SUFFIX + ".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            out = bytearray(MAGIC + key)
+            encode(tree, out)
+            fp.write(out)
+        os.replace(temp_path, path)
+    except BaseException as error:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        if not isinstance(error, (OSError, TypeError)):
+            raise
+
+
+def _source(content):
+    """Decodes the content of a file like a file opened in text mode.
+
+    :param content: UTF-8 encoded content.
+    :type content: bytes
+    :return: Content with ``\\r\\n`` and ``\\r`` translated to ``\\n``.
+    :rtype: str
+    """
+    return content.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def load_file(path, cache_dir=None, **options):
+    """Decodes a file, reusing its snapshot if the file did not change.
+
+    :param path: Path to the NEON file.
+    :param cache_dir: Directory with snapshots, snapshots are not used
+        if it is :obj:`None`.
+    :param options: Options of :func:`neon.decoder.parse`.
+    :return: Decoded tree.
+    """
+    with open(path, "rb") as fp:
+        content = fp.read()
+    if cache_dir is None:
+        return parse(_source(content), **options)
+
+    location = snapshot_path(path, cache_dir)
+    key = snapshot_key(content, options)
+    found, tree = read(location, key)
+    if not found:
+        tree = parse(_source(content), **options)
+        write(location, key, tree)
+    return tree
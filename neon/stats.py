@@ -0,0 +1,76 @@
+"""Statistics of parsing, collected only on request."""
+import collections
+
+from .tokens import TOKENS
+
+#: Phases of parsing measured by :class:`ParseStats`.
+PHASES = ("tokenize", "convert", "parse", "build")
+
+
+class ParseStats(object):
+    """Statistics of parsing collected when passed to
+    :func:`neon.decoder.parse`.
+
+    The phases are timed exclusively of each other, in seconds:
+
+    - ``tokenize``: reading, scanning and indentation handling,
+    - ``convert``: conversion of the matched strings to values,
+    - ``parse``: the parser generating events of the tokens,
+    - ``build``: building the tree of the events.
+
+    The counters accumulate over all parsings the object is passed to,
+    so one object can collect the statistics of many documents. Cache
+    hits and misses are the lookups of the parsing in
+    :attr:`neon.tokens.DateTime.cache`, not those of other threads
+    sharing the cache. Interned
+    strings are those replaced by an equal string of the intern table,
+    their bytes are the memory saved.
+
+    Collecting the statistics slows down the parsing, the timings are
+    meant to be compared with each other rather than with the time of
+    parsing without statistics.
+    """
+
+    def __init__(self):
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.total_time = 0.0
+        self.documents = 0
+        self.tokens = collections.Counter()
+        self.max_depth = 0
+        self.datetime_parses = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.interned = 0
+        self.interned_bytes = 0
+
+    def info(self):
+        """Statistics as a flat dictionary, e.g. for a metrics system.
+
+        Token counts are keyed by ``tokens.<id of the token>``, times by
+        ``time.<phase>``.
+
+        :rtype: dict
+        """
+        info = {
+            "documents": self.documents,
+            "time.total": self.total_time,
+            "max_depth": self.max_depth,
+            "datetime_parses": self.datetime_parses,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "interned": self.interned,
+            "interned_bytes": self.interned_bytes,
+        }
+        for phase, elapsed in self.times.items():
+            info["time." + phase] = elapsed
+        for kind, count in sorted(self.tokens.items()):
+            info["tokens." + TOKENS[kind].id] = count
+        return info
+
+    def __repr__(self):
+        return "{}({} documents, {} tokens, {:.6f} s)".format(
+            type(self).__name__,
+            self.documents,
+            sum(self.tokens.values()),
+            self.total_time,
+        )
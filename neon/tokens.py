@@ -1,18 +1,32 @@
-import functools
-
-import dateutil.parser
+import datetime
+import re
 
 from . import errors
-from .entity import Entity
-from .utils import camel_case_to_underscore, classproperty, variants
+from .utils import LRUCache, camel_case_to_underscore, classproperty, variants
 
 #: List of all tokens.
 TOKENS = []
 
+#: Prefix of the literals that may be accepted by int() or float().
+_number_re = re.compile(r"\s*[+-]?(?:[\d.]|inf|nan)", re.IGNORECASE)
+
+#: Marker of a missing cached value.
+_missing = object()
+
+#: Default maximum number of literals with cached datetime conversion.
+DATETIME_CACHE_SIZE = 4096
+
+#: Patterns used to tell whether a literal may be a date, it starts with
+#: digit groups separated by ``-``, ``/``, ``:`` or ``.``, or contains
+#: a name of a month or weekday.
+_date_re = re.compile(r"\d{1,4}[-/:.]\d")
+_word_re = re.compile(r"[^\W\d_]+")
+
 
 def token(cls):
     """Registers a token class."""
     assert issubclass(cls, Token), "Tokens must subclass the Token class."
+    cls.kind = len(TOKENS)
     TOKENS.append(cls)
     return cls
 
@@ -26,31 +40,17 @@ class Token(object):
     #: Unique ID of the token.
     id = None
 
+    #: Integer code of the token, assigned when the token is registered.
+    kind = None
+
     @classproperty
     def name(cls):
         return camel_case_to_underscore(cls.__name__).replace("_", " ")
 
-    def __init__(self, value=None, line=None):
-        self.value = value
-        self.line = line
-
-    def parse(self, tokens):
-        return self.value
-
-    def __eq__(self, other):
-        return type(self) == type(other) and self.value == other.value
-
-    def __str__(self):
-        name = type(self).__name__
-        value = "" if self.value is None else self.value
-        return "{}({})".format(name, value)
-
-    def __repr__(self):
-        return str(self)
-
     @classmethod
     def do(cls, scanner, string):
-        return cls(string)
+        """Converts a matched string to a pair (kind, value)."""
+        return cls.kind, string
 
     @classmethod
     def getscan(cls):
@@ -60,13 +60,6 @@ class Token(object):
 class Primitive(Token):
     """Represents primitive type."""
 
-    def parse(self, tokens):
-        peek = tokens.peek()
-        if peek.id == LeftRound.id:
-            attributes = tokens.advance().parse(tokens)
-            return Entity(self.value, attributes)
-        return self.value
-
 
 @token
 class String(Primitive):
@@ -87,7 +80,7 @@ class String(Primitive):
             string = string.strip(single).replace(r"\'", "'")
         # TODO: refactor to deal with \t, \n, \r, \xXX, \uXXXX etc
         string = string.replace("\\\\", "\\")
-        return cls(string)
+        return cls.kind, string
 
 
 @token
@@ -156,17 +149,73 @@ class DateTime(Primitive):
     re = None
     id = "datetime"
 
+    #: Engines that can be used to parse datetimes.
+    engines = ("off", "iso", "dateutil")
+
+    #: Cache of the datetimes parsed by dateutil.
+    cache = LRUCache(DATETIME_CACHE_SIZE)
+    _names = frozenset(
+        [
+            "jan", "january", "feb", "february", "mar", "march", "apr",
+            "april", "may", "jun", "june", "jul", "july", "aug", "august",
+            "sep", "sept", "september", "oct", "october", "nov", "november",
+            "dec", "december", "mon", "monday", "tue", "tuesday", "wed",
+            "wednesday", "thu", "thursday", "fri", "friday", "sat",
+            "saturday", "sun", "sunday",
+        ]
+    )  # fmt: skip
+
     @classmethod
-    @functools.lru_cache(maxsize=None)
-    def convert(cls, string):
-        try:
-            return dateutil.parser.parse(string)
-        except (ValueError, TypeError):
-            return
+    def matches(cls, string):
+        """Tells whether the string may be parsed as a date, i.e.
+        whether it starts with digit groups separated by ``-``, ``/``,
+        ``:`` or ``.``, e.g. ``2015-05-12`` or ``10:30``, or contains
+        a name of a month or weekday, e.g. ``12 May``.
+
+        :param string: String to check.
+        :rtype: bool
+        """
+        if _date_re.match(string):
+            return True
+        return any(word.lower() in cls._names for word in _word_re.findall(string))
+
+    @classmethod
+    def convert(cls, string, engine="dateutil", stats=None):
+        """Converts the string to datetime.
+
+        :param string: String to convert.
+        :param engine: Name of the engine parsing the datetime, ``iso``
+            for :meth:`datetime.datetime.fromisoformat` or ``dateutil``
+            for :func:`dateutil.parser.parse` with cached results.
+        :param stats: Statistics counting the hits and misses of the
+            cache, if any.
+        :type stats: :class:`neon.stats.ParseStats`
+        :return: Datetime or :obj:`None` if the string is not a date.
+        """
+        if engine == "iso":
+            try:
+                return datetime.datetime.fromisoformat(string)
+            except ValueError:
+                return
+        value = cls.cache.get(string, _missing)
+        if stats is not None:
+            if value is _missing:
+                stats.cache_misses += 1
+            else:
+                stats.cache_hits += 1
+        if value is _missing:
+            import dateutil.parser  # imported on first use, it is slow to import
+
+            try:
+                value = dateutil.parser.parse(string)
+            except (ValueError, TypeError):
+                value = None
+            cls.cache.set(string, value)
+        return value
 
 
 @token
-class Literal(Token):
+class Literal(Primitive):
     """Represents literal token."""
 
     re = r"""
@@ -176,15 +225,35 @@ class Literal(Token):
           """
     id = "literal"
 
+    #: Pairs (kind, value) of the boolean and null literals.
+    _keywords = dict(
+        [
+            (name, (Boolean.kind, value))
+            for value, names in Boolean._mapping.items()
+            for name in names
+        ]
+        + [(name, (NoneValue.kind, None)) for name in NoneValue._variants]
+    )
+
     @classmethod
     def do(cls, scanner, string):
-        for Type in [Integer, Float, Boolean, DateTime]:
-            value = Type.convert(string)
+        if not scanner.infer:
+            return cls.kind, string
+        keyword = cls._keywords.get(string)
+        if keyword is not None:
+            return keyword
+        if _number_re.match(string):
+            for Type in (Integer, Float):
+                value = Type.convert(string)
+                if value is not None:
+                    return Type.kind, value
+        if scanner.datetime != "off" and DateTime.matches(string):
+            if scanner.stats is not None:
+                scanner.stats.datetime_parses += 1
+            value = DateTime.convert(string, scanner.datetime, scanner.stats)
             if value is not None:
-                return Type(value)
-        if string in NoneValue._variants:
-            return NoneValue(None)
-        return String(string)
+                return DateTime.kind, value
+        return String.kind, string
 
 
 class Symbol(Token):
@@ -198,7 +267,7 @@ class Symbol(Token):
 
     @classmethod
     def do(cls, scanner, string):
-        return cls()
+        return cls.kind, None
 
 
 @token
@@ -240,32 +309,6 @@ class LeftRound(Symbol):
     re = r"\("
     id = "leftround"
 
-    def parse(self, tokens):
-        data = {}
-        tok = tokens.advance(skip=NewLine)
-        iteration = 0
-
-        while tok.id != RightRound.id:
-            key = tok.parse(tokens)
-            tok = tokens.advance((EqualSign, Comma, RightRound))
-
-            if tok.id == EqualSign.id:
-                data[key] = tokens.advance().parse(tokens)
-                tok = tokens.advance((Comma, RightRound))
-                if tok.id == Comma.id:
-                    tok = tokens.advance(skip=NewLine)
-
-            elif tok.id == Comma.id:
-                data[iteration] = key
-                tok = tokens.advance(skip=NewLine)
-
-            elif tok.id == RightRound.id:
-                data[iteration] = key
-
-            iteration += 1
-
-        return data
-
 
 @token
 class RightRound(Symbol):
@@ -282,20 +325,6 @@ class LeftSquare(Symbol):
     re = r"\["
     id = "leftsquare"
 
-    def parse(self, tokens):
-        data = []
-        tok = tokens.advance(skip=NewLine)
-
-        while tok.id != RightSquare.id:
-            value = tok.parse(tokens)
-            data.append(value)
-
-            tok = tokens.advance((Comma, RightSquare))
-            if tok.id == Comma.id:
-                tok = tokens.advance(skip=NewLine)
-
-        return data
-
 
 @token
 class RightSquare(Symbol):
@@ -312,21 +341,6 @@ class LeftBrace(Symbol):
     re = r"{"
     id = "leftbrace"
 
-    def parse(self, tokens):
-        data = {}
-        tok = tokens.advance(skip=NewLine)
-
-        while tok.id != RightBrace.id:
-            key = tok.parse(tokens)
-            tokens.advance(Colon)
-            data[key] = tokens.advance().parse(tokens)
-
-            tok = tokens.advance((Comma, RightBrace))
-            if tok.id == Comma.id:
-                tok = tokens.advance(skip=NewLine)
-
-        return data
-
 
 @token
 class RightBrace(Symbol):
@@ -352,70 +366,9 @@ class Indent(Token):
     re = r"^[\t\ ]+"
     id = "indent"
 
-    def _parse_list(self, tokens, tok):
-        data = []
-
-        while tok.id not in [Dedent.id, End.id]:
-            while tok.id == Hyphen.id:
-                old_tok = tok
-                tok = tokens.advance(skip=(NewLine, Indent))
-                # in this case, the list looks like this:
-                # -
-                # - a
-                if old_tok.id == tok.id == Hyphen.id:
-                    data.append(None)
-            if tokens.peek().id == Colon.id:
-                tokens.advance()
-                key = tok.parse(tokens)
-                tok = tokens.advance(skip=NewLine)
-                value = {key: tok.parse(tokens)}
-            else:
-                value = tok.parse(tokens)
-            data.append(value)
-
-            tok = tokens.advance((End, NewLine, Dedent))
-            if tok.id == NewLine.id:
-                tok = tokens.advance((Hyphen, Dedent))
-
-        return data
-
-    def _parse_dict(self, tokens, tok):
-        data = {}
-
-        while tok.id not in [Dedent.id, End.id]:
-            key = tok.parse(tokens)
-            tokens.advance(Colon)
-
-            tok = tokens.advance()
-            if tok.id == NewLine.id:
-                tok = tokens.advance()
-                if tok.id not in [Indent.id, Dedent.id]:
-                    data[key] = None
-                    continue
-            data[key] = tok.parse(tokens)
-
-            tok = tokens.advance((End, NewLine, Dedent))
-            if tok.id == NewLine.id:
-                tok = tokens.advance(skip=NewLine)
-
-        return data
-
-    def parse(self, tokens):
-        tok = tokens.advance()
-
-        while tok.id == NewLine.id:
-            tok = tokens.advance()
-
-        if tok.id == Hyphen.id:
-            return self._parse_list(tokens, tok)
-        elif tokens.peek().id == End.id:
-            return tok.parse(tokens)
-        else:
-            return self._parse_dict(tokens, tok)
-
     @classmethod
     def do(cls, scanner, string):
-        return cls(len(string))
+        return cls.kind, len(string)
 
 
 @token
@@ -435,7 +388,7 @@ class NewLine(Token):
 
     @classmethod
     def do(cls, scanner, string):
-        return cls(len(string))
+        return cls.kind, len(string)
 
 
 @token
@@ -1,5 +1,7 @@
+import collections
 import itertools
 import re
+import threading
 
 
 class classproperty(object):
@@ -52,3 +54,68 @@ def camel_case_to_underscore(name):
     """
     s1 = re.sub(r"(.)([A-Z][a-z]+)", r"\1_\2", name)
     return re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
+
+
+class LRUCache(object):
+    """Dictionary of limited size discarding the least recently used items.
+
+    Hits, misses and evictions of the cache are counted. The cache can be
+    shared by threads, every operation holds a lock, so that an item
+    evicted by one thread is never moved by another one and no counts are
+    lost on free-threaded builds.
+
+    :param maxsize: Maximum number of cached items.
+    :type maxsize: int
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key, default=None):
+        """Returns the cached item, or the default if it is not cached."""
+        with self._lock:
+            try:
+                value = self._items[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Caches the item, evicting the least recently used one if full."""
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Discards all items and resets the counters."""
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        """Counters and size of the cache.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._items),
+                "maxsize": self.maxsize,
+            }
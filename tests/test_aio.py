@@ -0,0 +1,81 @@
+import asyncio
+import threading
+
+import pytest
+
+import neon
+from neon import aio
+
+NEON_CONFIG = """
+name: Homer
+children: [Bart, Lisa, Maggie]
+"""
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "config.neon"
+    path.write_text(NEON_CONFIG)
+    return str(path)
+
+
+@pytest.fixture
+def blocked(monkeypatch):
+    """Decoding that waits until the event is set, counting the calls."""
+    event = threading.Event()
+    calls = []
+    load_path = aio.load_path
+
+    def load(path, datetime):
+        calls.append(path)
+        event.wait(5)
+        return load_path(path, datetime)
+
+    monkeypatch.setattr(aio, "load_path", load)
+    return event, calls
+
+
+def test_aload(path):
+    tree = asyncio.run(neon.aload(path))
+    assert tree == neon.decode(NEON_CONFIG)
+
+
+def test_adump(tmp_path):
+    path = str(tmp_path / "dumped.neon")
+    tree = {"name": "Homer", "children": ["Bart", "Lisa"]}
+    asyncio.run(neon.adump(tree, path, chunk_size=4))
+    assert asyncio.run(neon.aload(path)) == tree
+
+
+def test_aload_coalesced(path, blocked):
+    event, calls = blocked
+
+    async def main():
+        first = asyncio.ensure_future(neon.aload(path))
+        second = asyncio.ensure_future(neon.aload(path))
+        await asyncio.sleep(0.01)
+        event.set()
+        return await asyncio.gather(first, second)
+
+    first, second = asyncio.run(main())
+    assert first is second
+    assert len(calls) == 1
+    assert not aio._pending
+
+
+def test_aload_cancelled(path, blocked):
+    event, calls = blocked
+
+    async def main():
+        first = asyncio.ensure_future(neon.aload(path))
+        second = asyncio.ensure_future(neon.aload(path))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        await asyncio.sleep(0.01)
+        event.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == neon.decode(NEON_CONFIG)
+    assert len(calls) == 1
@@ -0,0 +1,101 @@
+import copy
+
+import pytest
+
+import neon
+from neon.changes import DELETE, SET, SPLICE
+from neon.entity import Entity
+
+NEON_OLD = """
+name: Homer
+children: [Bart, Lisa, Maggie]
+column: Column(integer, size=10)
+address:
+    city: Springfield
+    street: Evergreen Terrace
+"""
+
+NEON_NEW = """
+name: Homer
+children: [Bart, Hugo, Lisa, Maggie]
+column: Column(integer, size=20)
+address:
+    city: Springfield
+    number: 742
+"""
+
+
+def test_diff():
+    old, new = neon.decode(NEON_OLD), neon.decode(NEON_NEW)
+    assert neon.diff(old, new) == [
+        (SPLICE, ("children",), (1, 1, ["Hugo"])),
+        (SET, ("column", "size"), 20),
+        (DELETE, ("address", "street"), None),
+        (SET, ("address", "number"), 742),
+    ]
+    assert neon.diff(old, neon.decode(NEON_OLD)) == []
+
+
+@pytest.mark.parametrize(
+    "old, new, changes",
+    [
+        ({"a": [1, 2, 3]}, {"a": [1, 5, 3]}, [(SET, ("a", 1), 5)]),
+        ({"a": [1, 2, 3]}, {"a": []}, [(SPLICE, ("a",), (0, 3, []))]),
+        ({"a": 1}, {"a": "1"}, [(SET, ("a",), "1")]),
+        ({"a": [{"b": 1}]}, {"a": [{"b": 2}]}, [(SET, ("a", 0, "b"), 2)]),
+        (Entity("A", {0: 1}), Entity("B", {0: 1}), [(SET, (), Entity("B", {0: 1}))]),
+        ([1, 2], {"a": 1}, [(SET, (), {"a": 1})]),
+        ({"a": Entity("E", {0: 1})}, {"a": 5}, [(SET, ("a",), 5)]),
+        ({"a": 5}, {"a": Entity("E", {0: 1})}, [(SET, ("a",), Entity("E", {0: 1}))]),
+        ([Entity("E", {0: 1}), 2], [3, 2], [(SET, (0,), 3)]),
+        ({"a": 1}, {"a": True}, [(SET, ("a",), True)]),
+        ([1, 0], [True, False], [(SET, (0,), True), (SET, (1,), False)]),
+        (
+            {"a": [1.0, {"b": 0}]},
+            {"a": [1, {"b": False}]},
+            [
+                (SET, ("a", 0), 1),
+                (SET, ("a", 1, "b"), False),
+            ],
+        ),
+    ],
+)
+def test_diff_values(old, new, changes):
+    assert neon.diff(old, new) == changes
+    assert neon.patch(copy.deepcopy(old), changes) == new
+
+
+def test_patch_in_place():
+    old, new = neon.decode(NEON_OLD), neon.decode(NEON_NEW)
+    address, children = old["address"], old["children"]
+    tree = neon.patch(old, neon.diff(old, new))
+    assert tree is old
+    assert tree == new
+    assert tree["address"] is address
+    assert tree["children"] is children
+
+
+def test_patch_unknown_operation():
+    with pytest.raises(ValueError):
+        neon.patch({"a": 1}, [("move", ("a",), None)])
+
+
+def deep_tree(leaf):
+    tree = leaf
+    for index in range(5000):
+        tree = {"a": [tree, 0]} if index % 2 else [tree]
+    return tree
+
+
+@pytest.mark.parametrize("leaf, changes", [(1, 0), (True, 1), (2, 1)])
+def test_diff_deep(leaf, changes):
+    old, new = deep_tree(1), deep_tree(leaf)
+    result = neon.diff(old, new)
+    assert len(result) == changes
+    if changes:
+        operation, path, value = result[0]
+        assert (operation, len(path), value) == (SET, 7500, leaf)
+        tree = neon.patch(old, result)
+        for key in path:
+            tree = tree[key]
+        assert tree is leaf
@@ -0,0 +1,84 @@
+import io
+
+import pytest
+
+import neon
+from neon import errors
+
+from .test_decoder import NEON_DECODE_SAMPLE
+
+NEON_UNICODE = """
+město: Praha
+kůň: "žluťoučký
+kůň"
+poznámky: [ěšč, řžý]
+"""
+
+NEON_BAD_SYNTAX = """
+a: b
+město: [ěšč, řžý}
+"""
+
+
+@pytest.fixture
+def write(tmp_path):
+    def write(content):
+        path = tmp_path / "config.neon"
+        path.write_bytes(content.encode("utf-8"))
+        return str(path)
+
+    return write
+
+
+@pytest.mark.parametrize("content", [NEON_DECODE_SAMPLE, NEON_UNICODE, ""])
+def test_decode_file(write, content):
+    assert neon.decode_file(write(content)) == neon.decode(content)
+
+
+def test_decode_file_error_line(write):
+    with pytest.raises(errors.ParserError) as excinfo:
+        neon.decode_file(write(NEON_BAD_SYNTAX))
+    assert str(excinfo.value) == "Unexpected '}' on line 3, expected ',' or ']'."
+
+
+@pytest.mark.parametrize("newline", ["\r\n", "\r"])
+def test_decode_file_newlines(write, newline):
+    content = NEON_DECODE_SAMPLE.replace("\n", newline)
+    assert neon.decode_file(write(content)) == neon.decode(NEON_DECODE_SAMPLE)
+    with pytest.raises(errors.ParserError) as excinfo:
+        neon.decode_file(write(NEON_BAD_SYNTAX.replace("\n", newline)))
+    assert str(excinfo.value) == "Unexpected '}' on line 3, expected ',' or ']'."
+
+
+def test_load_bytes():
+    fp = io.BytesIO(NEON_UNICODE.encode("utf-8"))
+    assert neon.load(fp, chunk_size=3) == neon.decode(NEON_UNICODE)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "a: -\xa0x",
+        "a: 1\n\u2003# c\nb: 2",
+        "a: [b,\u3000c]",
+        "a:\n    b: x\u2028y\n    c: \x85z",
+        "a: b\xa0",
+    ],
+)
+def test_decode_bytes_as_string(write, content):
+    try:
+        expected = neon.decode(content)
+    except (errors.ParserError, errors.TokenError) as error:
+        expected = error
+    for decode in (
+        lambda: neon.decode(content.encode("utf-8")),
+        lambda: neon.decode_file(write(content)),
+        lambda: neon.load(io.BytesIO(content.encode("utf-8"))),
+    ):
+        try:
+            result = decode()
+        except (errors.ParserError, errors.TokenError) as error:
+            assert type(error) is type(expected)
+            assert str(error) == str(expected)
+        else:
+            assert result == expected
@@ -26,3 +26,23 @@ NEON_SIMPLE_LIST_VALUE = """
 
 def test_simple_list_value():
     assert neon.decode(NEON_SIMPLE_LIST_VALUE) == [None]
+
+
+NEON_DEEP_BRACKETS = "a: " + "{b: [" * 5000 + "c" + "]}" * 5000
+
+
+def test_deep_brackets():
+    value = neon.decode(NEON_DEEP_BRACKETS)["a"]
+    for _ in range(5000):
+        value = value["b"][0]
+    assert value == "c"
+
+
+NEON_DEEP_INDENT = "\n".join(" " * i + "k:" for i in range(1000)) + " v"
+
+
+def test_deep_indent():
+    value = neon.decode(NEON_DEEP_INDENT)
+    for _ in range(1000):
+        value = value["k"]
+    assert value == "v"
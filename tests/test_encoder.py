@@ -0,0 +1,55 @@
+import io
+
+import neon
+
+TREE = {
+    "name": "Homer",
+    "address": {"street": "742 Evergreen Terrace", "zip": None},
+    "children": ["Bart", ["Lisa"], {"baby": "Maggie"}],
+    "empty": {},
+}
+
+NEON_ENCODED = "\n".join(
+    [
+        "",
+        "name: Homer",
+        "",
+        "address: ",
+        "\tstreet: 742 Evergreen Terrace",
+        "\tzip: Null",
+        "",
+        "children: ",
+        "\t- Bart",
+        "\t- ",
+        "\t\t- Lisa",
+        "\t- ",
+        "\t\tbaby: Maggie",
+        "",
+        "empty: ",
+        "",
+    ]
+)
+
+
+def test_encode():
+    assert neon.encode(TREE) == NEON_ENCODED
+
+
+def test_encode_scalar():
+    assert neon.encode(5) == "5"
+    assert neon.encode(None) == "Null"
+
+
+def test_dump_chunks():
+    fp = io.StringIO()
+    neon.dump(TREE, fp, chunk_size=4)
+    assert fp.getvalue() == NEON_ENCODED
+
+
+def test_dump_deep():
+    tree = []
+    for _ in range(10000):
+        tree = [tree]
+    fp = io.StringIO()
+    neon.dump(tree, fp)
+    assert fp.getvalue().count("- ") == 10000
@@ -0,0 +1,77 @@
+import io
+
+import pytest
+
+import neon
+from neon import errors
+
+NEON_EVENTS = """
+name: Homer
+children:
+    - Bart
+    -
+    - age: 10
+phones: {home: 555-6528, work: [1, 2]}
+entity: Column(integer, unique=no)
+"""
+
+NEON_DEEP = "a: " + "[" * 10000 + "]" * 10000
+
+
+def test_events():
+    assert list(neon.iterparse(NEON_EVENTS)) == [
+        ("start_mapping", None),
+        ("key", "name"),
+        ("scalar", "Homer"),
+        ("key", "children"),
+        ("start_sequence", None),
+        ("scalar", "Bart"),
+        ("scalar", None),
+        ("start_mapping", None),
+        ("key", "age"),
+        ("scalar", 10),
+        ("end_mapping", None),
+        ("end_sequence", None),
+        ("key", "phones"),
+        ("start_mapping", None),
+        ("key", "home"),
+        ("scalar", "555-6528"),
+        ("key", "work"),
+        ("start_sequence", None),
+        ("scalar", 1),
+        ("scalar", 2),
+        ("end_sequence", None),
+        ("end_mapping", None),
+        ("key", "entity"),
+        ("start_entity", "Column"),
+        ("key", 0),
+        ("scalar", "integer"),
+        ("key", "unique"),
+        ("scalar", False),
+        ("end_entity", None),
+        ("end_mapping", None),
+    ]
+
+
+def test_events_scalar():
+    assert list(neon.iterparse("")) == [("scalar", None)]
+    assert list(neon.iterparse("5")) == [("scalar", 5)]
+
+
+def test_events_file():
+    events = neon.iterparse(io.StringIO(NEON_EVENTS), chunk_size=8)
+    assert list(events) == list(neon.iterparse(NEON_EVENTS))
+
+
+def test_events_deep():
+    depth = 0
+    for event, value in neon.iterparse(NEON_DEEP):
+        if event == "start_sequence":
+            depth += 1
+    assert depth == 10000
+
+
+def test_events_invalid_key():
+    with pytest.raises(errors.ParserError) as excinfo:
+        list(neon.iterparse("a: {[b]: c}"))
+    assert str(excinfo.value) == "Unexpected '[' on line 1."
@@ -0,0 +1,67 @@
+import io
+import types
+
+import pytest
+
+import neon
+from neon.entity import Entity
+from neon.stats import ParseStats
+
+NEON_HOOKS = """
+name: Homer
+children: [Bart, Lisa, {name: Maggie, toys: []}]
+column: Column(integer, size=10)
+name: Marge
+"""
+
+
+class Column(object):
+    def __init__(self, value, attributes):
+        self.value = value
+        self.attributes = attributes
+
+
+def test_object_pairs_hook():
+    tree = neon.decode(NEON_HOOKS, object_pairs_hook=list)
+    assert tree[0] == ("name", "Homer")
+    assert tree[1] == ("children", ["Bart", "Lisa", [("name", "Maggie"), ("toys", [])]])
+    assert tree[2][1] == Entity("Column", {0: "integer", "size": 10})
+    assert tree[3] == ("name", "Marge")
+
+
+def test_duplicate_keys():
+    def unique(pairs):
+        keys = [key for key, _ in pairs]
+        if len(keys) != len(set(keys)):
+            raise ValueError("Duplicate keys")
+        return dict(pairs)
+
+    with pytest.raises(ValueError):
+        neon.decode(NEON_HOOKS, object_pairs_hook=unique)
+    assert neon.decode("a: [{b: 1}]", object_pairs_hook=unique) == {"a": [{"b": 1}]}
+
+
+def test_frozen_containers():
+    def frozen(pairs):
+        return types.MappingProxyType(dict(pairs))
+
+    tree = neon.load(
+        io.StringIO(NEON_HOOKS),
+        chunk_size=4,
+        object_pairs_hook=frozen,
+        list_hook=tuple,
+    )
+    assert isinstance(tree, types.MappingProxyType)
+    assert tree["children"][:2] == ("Bart", "Lisa")
+    assert tree["children"][2]["toys"] == ()
+    with pytest.raises(TypeError):
+        tree["children"][2]["name"] = "Lisa"
+
+
+def test_entity_hook():
+    tree = neon.decode(NEON_HOOKS, entity_hook=Column, stats=ParseStats())
+    column = tree["column"]
+    assert isinstance(column, Column)
+    assert column.value == "Column"
+    assert column.attributes == {0: "integer", "size": 10}
+    assert tree["children"][2] == {"name": "Maggie", "toys": []}
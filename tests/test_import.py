@@ -0,0 +1,51 @@
+import subprocess
+import sys
+
+import dateutil.parser
+
+from neon.tokens import DateTime
+
+
+def imported_modules(code):
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    return {
+        line.rsplit("|", 1)[-1].strip()
+        for line in process.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+def test_import_is_lazy():
+    modules = imported_modules("import neon")
+    assert "neon.decoder" in modules
+    assert not any(name.startswith("dateutil") for name in modules)
+    assert "more_itertools" not in modules
+    assert "concurrent.futures" not in modules
+    assert "pickle" not in modules
+    assert "asyncio" not in modules
+    assert "tempfile" not in modules
+    assert "dataclasses" not in modules
+    assert "multiprocessing" not in modules
+
+
+def test_decode_without_dates_is_lazy():
+    modules = imported_modules("import neon; neon.decode('a: [b, 5, yes, May 2015]')")
+    assert "dateutil.parser" in modules
+    modules = imported_modules("import neon; neon.decode('a: [b, 5, yes, null]')")
+    assert not any(name.startswith("dateutil") for name in modules)
+
+
+def test_scanner_compiled_on_first_use():
+    code = "import neon; assert neon.decoder._compile.cache_info().currsize == 0"
+    imported_modules(code)
+
+
+def test_datetime_names():
+    info = dateutil.parser.parserinfo
+    names = {name.lower() for names in info.MONTHS + info.WEEKDAYS for name in names}
+    assert DateTime._names == names
@@ -0,0 +1,88 @@
+import io
+
+import pytest
+
+import neon
+from neon import errors
+
+NEON_DOCUMENT = """
+# services
+name: Homer
+address:
+    city: Springfield
+    street: Evergreen Terrace
+children: [
+    Bart,
+    Lisa
+]
+column: Column(integer, size=10)
+"""
+
+NEON_LIST = """
+- Bart
+- Lisa
+"""
+
+
+def edited(document, old, new):
+    offset = document.source.index(old)
+    document.edit(offset, len(old), new)
+    return document.tree
+
+
+def test_decode_incremental():
+    document = neon.decode_incremental(NEON_DOCUMENT)
+    assert document.tree == neon.decode(NEON_DOCUMENT)
+    assert repr(document) == "IncrementalDocument(4 blocks)"
+
+
+@pytest.mark.parametrize("source", [io.BytesIO, bytes])
+def test_decode_incremental_bytes(source):
+    document = neon.decode_incremental(source(NEON_DOCUMENT.encode("utf-8")))
+    assert document.source == NEON_DOCUMENT
+    assert edited(document, "Homer", "Žluťoučký")["name"] == "Žluťoučký"
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        ("Springfield", "Shelbyville"),
+        ("Lisa", "Lisa,\n    Maggie"),
+        ("name: Homer\n", ""),
+        ("column", "type: int\ncolumn"),
+        ("size=10)", "size=10)\nmother: Marge"),
+        ("    street", "street"),
+        ("# services\n", "  "),
+    ],
+)
+def test_edit(old, new):
+    document = neon.decode_incremental(NEON_DOCUMENT)
+    expected = NEON_DOCUMENT.replace(old, new)
+    assert edited(document, old, new) == neon.decode(expected)
+    assert document.source == expected
+
+
+def test_edit_keeps_blocks():
+    document = neon.decode_incremental(NEON_DOCUMENT)
+    address = document.tree["address"]
+    edited(document, "Bart", "Maggie")
+    assert document.tree["address"] is address
+
+
+def test_edit_syntax_error():
+    document = neon.decode_incremental(NEON_DOCUMENT)
+    document.edit(document.source.index("Lisa\n]"), 6, "Lisa\n")
+    with pytest.raises(errors.ParserError):
+        document.tree
+    assert edited(document, "Lisa\n", "Lisa\n]") == neon.decode(NEON_DOCUMENT)
+
+
+def test_edit_list():
+    document = neon.decode_incremental(NEON_LIST)
+    assert edited(document, "Lisa", "Maggie") == ["Bart", "Maggie"]
+
+
+def test_edit_out_of_document():
+    document = neon.decode_incremental(NEON_DOCUMENT)
+    with pytest.raises(ValueError):
+        document.edit(len(NEON_DOCUMENT), 1, "")
@@ -0,0 +1,55 @@
+import io
+
+import neon
+from neon import decoder
+from neon.stats import ParseStats
+
+NEON_SERVICES = """
+first:
+    class: "App\\\\Handler"
+    tags: [web, internal]
+second:
+    class: "App\\\\Handler"
+    tags: [web, Column(web)]
+"""
+
+
+def test_intern_document():
+    tree = neon.decode(NEON_SERVICES, intern=True)
+    first, second = tree["first"], tree["second"]
+    assert tree == neon.decode(NEON_SERVICES)
+    assert first["class"] is second["class"]
+    assert first["tags"][0] is second["tags"][0]
+    assert first["tags"][0] is second["tags"][1].attributes[0]
+    assert list(first)[0] is list(second)[0]
+
+
+def test_intern_not_by_default():
+    tree = neon.decode(NEON_SERVICES)
+    assert tree["first"]["class"] is not tree["second"]["class"]
+
+
+def test_intern_shared_table():
+    strings = {}
+    first = neon.load(io.StringIO(NEON_SERVICES), chunk_size=8, intern=strings)
+    second = neon.decode(NEON_SERVICES, intern=strings)
+    assert first["first"]["class"] is second["second"]["class"]
+    assert strings["web"] is second["first"]["tags"][0]
+
+
+def test_intern_long_strings(monkeypatch):
+    monkeypatch.setattr(decoder, "INTERN_LENGTH", 4)
+    tree = neon.decode(NEON_SERVICES, intern=True)
+    assert tree["first"]["tags"][0] is tree["second"]["tags"][0]
+    assert tree["first"]["class"] is not tree["second"]["class"]
+
+
+def test_intern_stats():
+    stats = ParseStats()
+    neon.decode(NEON_SERVICES, intern=True, stats=stats)
+    # the second class, tags and App\Handler, the second and third web
+    assert stats.interned == 5
+    assert stats.interned_bytes > 5 * 40
+    assert neon.decode(NEON_SERVICES, intern=True, schema=dict)["first"]["class"] == (
+        "App\\Handler"
+    )
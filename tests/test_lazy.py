@@ -0,0 +1,67 @@
+import io
+
+import pytest
+
+import neon
+from neon import errors
+
+from .test_decoder import NEON_DECODE_SAMPLE
+
+NEON_LAZY = """
+# header
+version: 5
+app:
+    name: Homer
+    list: [1,
+2, {a: b}]
+text: "multi
+line: string"
+1: one
+broken: [a, b}
+last:
+"""
+
+
+def test_lazy_sample():
+    document = neon.decode_lazy(NEON_DECODE_SAMPLE)
+    assert dict(document) == neon.decode(NEON_DECODE_SAMPLE)
+
+
+@pytest.mark.parametrize("source", [io.BytesIO, bytes])
+def test_lazy_bytes(source):
+    document = neon.decode_lazy(
+        source(NEON_LAZY.replace("Homer", "Žluťoučký").encode())
+    )
+    assert document["app"]["name"] == "Žluťoučký"
+    assert document["text"] == "multi\nline: string"
+
+
+def test_lazy_access():
+    document = neon.decode_lazy(NEON_LAZY)
+    assert document["version"] == 5
+    assert document["app"] == {"name": "Homer", "list": [1, 2, {"a": "b"}]}
+    assert document["text"] == "multi\nline: string"
+    assert document[1] == "one"
+    assert document["last"] is None
+    assert "line" not in document
+    assert list(document) == ["version", "app", "text", 1, "broken", "last"]
+    with pytest.raises(KeyError):
+        document["missing"]
+
+
+def test_lazy_error_line():
+    document = neon.decode_lazy(NEON_LAZY)
+    with pytest.raises(errors.ParserError) as excinfo:
+        document["broken"]
+    assert str(excinfo.value) == "Unexpected '}' on line 11, expected ',' or ']'."
+
+
+def test_lazy_stops_at_key():
+    document = neon.decode_lazy(NEON_LAZY)
+    assert document["app"]["name"] == "Homer"
+    assert "broken" not in document._spans
+
+
+def test_lazy_memoized():
+    document = neon.decode_lazy(NEON_LAZY)
+    assert document["app"] is document["app"]
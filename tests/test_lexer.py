@@ -0,0 +1,93 @@
+import importlib
+import io
+import pkgutil
+import random
+
+import pytest
+
+import neon
+import tests
+from neon import errors
+from neon.decoder import END, Scanner, tokenize
+
+from .test_decoder import NEON_DECODE_SAMPLE
+
+#: Documents of the other tests, all NEON_* strings of the test modules.
+NEON_CORPUS = [
+    value
+    for info in pkgutil.iter_modules(tests.__path__)
+    if info.name != "test_lexer"
+    for name, value in vars(importlib.import_module("tests." + info.name)).items()
+    if name.startswith("NEON_") and isinstance(value, str)
+]
+
+#: Documents with the edge cases of the lexicon.
+NEON_EDGE_CASES = [
+    "",
+    "a: 1\n# comment\nb: 2",
+    "a: 1\n\n   \n  # indented comment\n\nb: 2",
+    "a: 1  # comment\n",
+    "a: 1\r\n# comment\r\nb: 2",
+    "a: 1\r\nb: 2",
+    "a:b, -1, :x, - y, :",
+    "a: b c  d\t e  , f  # g",
+    "a: \"multi\nline\", b: 'it\\'s'",
+    'a: "escaped \\" quote \\\\"',
+    'a: "escaped\\\nnew line"',
+    'a: "unterminated',
+    "a: !b",
+    "a: `b`",
+    "a: \x00",
+    "a: \xa0b\xa0# c",
+    "é: ü # ö",
+    "\n\n  a: 1\n  b:\n    - [1, 2]\n",
+]
+PIECES = [
+    "a", "1", " ", "  ", "\t", "\n", "\n  ", ":", ": ", "-", "- ", ",", "=",
+    "(", ")", "[", "]", "{", "}", "#", '"', "'", "\\", '\\"', "!", "\r", "\xa0",
+    "x y", "2015-01-01", "key: value\n", "# c\n", '"q\nr"',
+]  # fmt: skip
+
+
+def scanned(document, lexer, chunk_size=None):
+    """Tokens of the document, or the error of scanning it."""
+    if chunk_size == "bytes":
+        document, chunk_size = io.BytesIO(document.encode("utf-8")), 5
+    elif chunk_size is not None:
+        document = io.StringIO(document)
+    tokens = tokenize(document, chunk_size or 1024, Scanner(infer=False, lexer=lexer))
+    result = []
+    try:
+        kind = None
+        while kind != END:
+            kind = tokens.advance()
+            result.append((kind, tokens.value, tokens.line, tokens.starts[tokens.pos]))
+    except (errors.TokenError, errors.ParserError) as e:
+        result.append(str(e))
+    return result
+
+
+def random_documents(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 40)))
+
+
+@pytest.mark.parametrize("chunk_size", [None, 3, 64, "bytes"])
+def test_same_tokens(chunk_size):
+    documents = NEON_CORPUS + NEON_EDGE_CASES + list(random_documents(500))
+    for document in documents:
+        expected = scanned(document, "re", chunk_size)
+        assert scanned(document, "linear", chunk_size) == expected, document
+
+
+def test_decode_linear():
+    expected = neon.decode(NEON_DECODE_SAMPLE)
+    assert neon.decode(NEON_DECODE_SAMPLE, lexer="linear") == expected
+    fp = io.StringIO(NEON_DECODE_SAMPLE)
+    assert neon.load(fp, chunk_size=8, lexer="linear") == expected
+
+
+def test_unknown_lexer():
+    with pytest.raises(ValueError):
+        neon.decode("a: 1", lexer="fast")
@@ -0,0 +1,91 @@
+import io
+
+import pytest
+
+import neon
+from neon import errors
+
+NEON_LIMITS = """
+name: Homer
+address:
+    city: Springfield
+    street: "Evergreen Terrace"
+children: [Bart, [Lisa, Maggie]]
+"""
+
+
+def test_within_limits():
+    limits = neon.Limits(max_depth=2, max_tokens=29, max_bytes=109, max_length=19)
+    assert neon.decode(NEON_LIMITS, limits=limits) == neon.decode(NEON_LIMITS)
+
+
+@pytest.mark.parametrize(
+    "limits, message",
+    [
+        (neon.Limits(max_depth=1), "Nesting exceeds the limit of 1 levels on line 6."),
+        (
+            neon.Limits(max_tokens=28),
+            "Document exceeds the limit of 28 tokens on line 6.",
+        ),
+        (neon.Limits(max_bytes=108), "Input exceeds the limit of 108 bytes."),
+        (
+            neon.Limits(max_length=18),
+            "Scalar exceeds the limit of 18 characters on line 5.",
+        ),
+    ],
+)
+def test_limit_exceeded(limits, message):
+    with pytest.raises(errors.LimitError) as e:
+        neon.decode(NEON_LIMITS, limits=limits)
+    assert str(e.value) == message
+
+
+def test_limit_of_file():
+    fp = io.StringIO("k: [" * 1000 + "]" * 1000)
+    with pytest.raises(errors.LimitError):
+        neon.load(fp, chunk_size=16, limits=neon.Limits(max_bytes=64))
+    assert fp.tell() < 100
+
+
+def test_limit_stops_reading():
+    fp = io.StringIO("k: " + "[\n" * 100000)
+    with pytest.raises(errors.LimitError):
+        neon.load(fp, chunk_size=64, limits=neon.Limits(max_depth=64))
+    assert fp.tell() < 20000
+
+
+@pytest.mark.parametrize(
+    "document, line",
+    [
+        ("k: " + "a " * 100000, 1),
+        ("a: b\nk: " + "a" * 100000, 2),
+        ("k: [x, '" + "a\n" * 100000 + "']", 1),
+        ("k: x\n\nk: {a: " + '"' + "a" * 100000 + '"}', 3),
+    ],
+    ids=["spaced literal", "long literal", "multi-line string", "string"],
+)
+def test_limit_stops_reading_scalar(document, line):
+    fp = io.StringIO(document)
+    with pytest.raises(errors.LimitError) as e:
+        neon.load(fp, chunk_size=64, limits=neon.Limits(max_length=100))
+    assert str(e.value) == (
+        "Scalar exceeds the limit of 100 characters on line {}.".format(line)
+    )
+    assert fp.tell() < 1000
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64])
+def test_limit_of_long_line(chunk_size):
+    document = "k: [" + ", ".join(["abc def"] * 1000) + "] # " + "c" * 1000
+    limits = neon.Limits(max_length=7)
+    result = neon.load(io.StringIO(document), chunk_size=chunk_size, limits=limits)
+    assert result == neon.decode(document)
+
+
+def test_limit_error_is_parser_error():
+    assert issubclass(errors.LimitError, errors.ParserError)
+
+
+def test_limits_of_schema():
+    with pytest.raises(errors.LimitError):
+        neon.decode("a: [1, 2]", schema={"a": [int]}, limits=neon.Limits(max_tokens=4))
@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pytest
+
+import neon
+from neon import errors
+from neon.entity import Entity
+
+NEON_FILES = [
+    "name: Homer\nborn: 1956-05-12",
+    "entity: Column(type=integer)",
+    "broken: [a, b}",
+    "- Bart\n- Lisa",
+]
+
+
+@pytest.fixture
+def paths(tmp_path):
+    paths = []
+    for number, content in enumerate(NEON_FILES * 3):
+        path = tmp_path / "config{}.neon".format(number)
+        path.write_text(content)
+        paths.append(str(path))
+    return paths
+
+
+def check_results(results):
+    assert len(results) == len(NEON_FILES) * 3
+    for offset in range(0, len(results), len(NEON_FILES)):
+        homer, entity, error, children = results[offset : offset + len(NEON_FILES)]
+        assert homer == {"name": "Homer", "born": datetime(1956, 5, 12)}
+        assert entity == {"entity": Entity("Column", {"type": "integer"})}
+        assert isinstance(error, errors.ParserError)
+        assert str(error) == "Unexpected '}' on line 1, expected ',' or ']'."
+        assert children == ["Bart", "Lisa"]
+
+
+@pytest.mark.parametrize("executor", ["process", "thread"])
+def test_decode_many(paths, executor):
+    check_results(neon.decode_many(paths, workers=2, executor=executor))
+
+
+def test_decode_many_single_worker(paths):
+    check_results(neon.decode_many(paths, workers=1))
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_decode_many_unreadable(paths, tmp_path, workers):
+    invalid = tmp_path / "invalid.neon"
+    invalid.write_bytes(b"name: \xff")
+    missing = str(tmp_path / "missing.neon")
+    results = neon.decode_many([missing, paths[0], str(invalid)], workers=workers)
+    assert isinstance(results[0], FileNotFoundError)
+    assert results[0].filename == missing
+    assert results[1] == {"name": "Homer", "born": datetime(1956, 5, 12)}
+    assert isinstance(results[2], UnicodeDecodeError)
+
+
+def test_decode_many_options(paths):
+    results = neon.decode_many(paths[:1], datetime="off")
+    assert results == [{"name": "Homer", "born": "1956-05-12"}]
+
+
+def test_decode_many_unknown_executor(paths):
+    with pytest.raises(ValueError):
+        neon.decode_many(paths, executor="gpu")
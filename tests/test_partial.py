@@ -0,0 +1,113 @@
+import io
+
+import pytest
+
+import neon
+from neon import errors
+from neon.decoder import BATCH_SIZE
+from neon.tokens import DateTime
+
+from .test_decoder import NEON_DECODE_SAMPLE
+
+NEON_PATH = """
+# header
+version: 5
+app:
+    name: Homer
+    list: [1,
+2, {a: b}]
+    database:
+        host: localhost
+        ports:
+            - 5432
+            - 5433
+    column: Column(integer, size=10)
+1: one
+broken: [a, b}
+"""
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("version", 5),
+        ("app.name", "Homer"),
+        ("app.list", [1, 2, {"a": "b"}]),
+        ("app.list.2.a", KeyError),
+        (("app", "list", 2, "a"), "b"),
+        ("app.database", {"host": "localhost", "ports": [5432, 5433]}),
+        (("app", "database", "ports", 1), 5433),
+        ("app.column.size", 10),
+        ("1", "one"),
+        ((1,), "one"),
+        ("app.missing", KeyError),
+        ("version.major", KeyError),
+        ("missing", KeyError),
+    ],
+)
+def test_decode_path(path, expected):
+    if expected is KeyError:
+        with pytest.raises(KeyError):
+            neon.decode_path(NEON_PATH, path)
+    else:
+        assert neon.decode_path(NEON_PATH, path) == expected
+
+
+@pytest.mark.parametrize("source", [io.BytesIO, bytes])
+def test_decode_path_bytes(source):
+    document = source(NEON_PATH.replace("Homer", "Žluťoučký").encode("utf-8"))
+    assert neon.decode_path(document, "app.name") == "Žluťoučký"
+
+
+def test_decode_path_sample():
+    tree = neon.decode(NEON_DECODE_SAMPLE)
+    for key, value in tree.items():
+        assert neon.decode_path(NEON_DECODE_SAMPLE, (key,)) == value
+
+
+def test_decode_path_stops_early():
+    # The syntax error after the value is never parsed.
+    assert neon.decode_path(io.StringIO(NEON_PATH), "app.database.host") == "localhost"
+    with pytest.raises(errors.ParserError):
+        neon.decode_path(NEON_PATH, "broken")
+
+
+def test_decode_path_skips_tail():
+    # The invalid character after the value is never tokenized.
+    document = "key: [1]\n" + "pad: x\n" * BATCH_SIZE + "\x00"
+    assert neon.decode_path(document, "key") == [1]
+    with pytest.raises(errors.TokenError):
+        neon.decode(document)
+
+
+@pytest.mark.parametrize(
+    "document, path, expected",
+    [
+        ("a: 1\nb: 2\na: 3", "a", 1),
+        ("a:\n    b: 1\n    b: [2]\nc: 3", "a.b", 1),
+        ("a:\n    b: 1\na:\n    b: 2", "a.b", 1),
+        ("a:\n    c: 1\na:\n    b: 2", "a.b", KeyError),
+    ],
+)
+def test_decode_path_repeated_key(document, path, expected):
+    # Unlike neon.decode, the first value of a repeated key is used.
+    if expected is KeyError:
+        with pytest.raises(KeyError):
+            neon.decode_path(document, path)
+    else:
+        assert neon.decode_path(document, path) == expected
+
+
+def test_decode_path_not_mapping():
+    assert neon.decode_path("- a: 1\n- b: 2", (1, "b")) == 2
+    assert neon.decode_path("app:\n    - a\n    - b", ("app", 1)) == "b"
+
+
+def test_decode_path_skips_conversions(monkeypatch):
+    def fail(*args):
+        raise AssertionError("literal converted")
+
+    monkeypatch.setattr(DateTime, "convert", classmethod(fail))
+    assert neon.decode_path("skipped: 2015-01-20\nkey: [a]", "key") == ["a"]
+    with pytest.raises(AssertionError):
+        neon.decode_path("skipped: 2015-01-20\nkey: [a]", "skipped")
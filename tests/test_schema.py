@@ -0,0 +1,129 @@
+import dataclasses
+import io
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+import neon
+from neon import errors
+from neon.entity import Entity
+from neon.stats import ParseStats
+
+NEON_SCHEMA = """
+name: Homer
+code: 0123
+born: 1956-05-12
+active: yes
+ratio: 0.5
+children:
+    - {name: Bart, code: null, born: 1980-04-01}
+    - {name: Lisa, code: '42', born: 1982-05-09}
+extra:
+    column: Column(type=integer)
+    5: [1, on]
+"""
+
+
+@dataclasses.dataclass
+class Person:
+    name: str
+    code: Optional[str]
+    born: datetime
+    active: bool = False
+    ratio: float = 1.0
+    children: List["Person"] = dataclasses.field(default_factory=list)
+    extra: Dict[str, Any] = dataclasses.field(default_factory=dict)
+
+
+def test_dataclass_schema():
+    homer = neon.decode(NEON_SCHEMA, schema=Person)
+    assert homer.name == "Homer"
+    assert homer.code == "0123"
+    assert homer.born == datetime(1956, 5, 12)
+    assert homer.active is True
+    assert homer.ratio == 0.5
+    bart, lisa = homer.children
+    assert bart == Person("Bart", None, datetime(1980, 4, 1))
+    assert lisa.code == "42"
+    assert homer.extra == {
+        "column": Entity("Column", {"type": "integer"}),
+        "5": [1, True],
+    }
+
+
+def test_spec_schema():
+    schema = {"a": [int], "b": Dict[int, Optional[float]], "c": str, "d": Any}
+    tree = neon.load(
+        io.StringIO("a: [1, 0x10]\nb: {1: 2.5, 2: null}\nc: 'yes'\nd: {5: no}"),
+        schema=schema,
+    )
+    assert tree == {"a": [1, 16], "b": {1: 2.5, 2: None}, "c": "yes", "d": {5: False}}
+    assert neon.decode("- yes\n- null", schema=list) == [True, None]
+
+
+@pytest.mark.parametrize(
+    "document, schema, message",
+    [
+        ("a: 1\nb: x", {"a": int, "b": int}, "Invalid int 'x' on line 2."),
+        ("a: '1'", {"a": int}, "Invalid int '1' on line 1."),
+        ("a:\n  - 1", {"a": str}, "Unexpected sequence on line 2, expected str."),
+        ("a: 1\n\nb: 2", {"a": int}, "Unknown field 'b' of mapping on line 3."),
+        ("a:\nb: [1]", {"a": int, "b": [int]}, "Invalid int None on line 1."),
+        ('"1": a', Dict[int, str], "Invalid int '1' on line 1."),
+        (NEON_SCHEMA, Entity, "Unexpected mapping on line 2, expected entity."),
+        (
+            "- {name: Bart, code: 1}",
+            [Person],
+            "Missing field 'born' of Person on line 1.",
+        ),
+        (
+            "extra: Column(a)",
+            {"extra": Dict[str, int]},
+            "Unexpected entity on line 1, expected typing.Dict[str, int].",
+        ),
+    ],
+)
+def test_schema_errors(document, schema, message):
+    with pytest.raises(errors.SchemaError) as excinfo:
+        neon.decode(document, schema=schema)
+    assert str(excinfo.value) == message
+
+
+@pytest.mark.parametrize("schema", [dict, Any, Dict[str, str]])
+def test_schema_quoted_keys(schema):
+    tree = neon.decode('"1": a\n"yes": b\n2: c', schema=schema)
+    expected = {"1": "a", "yes": "b", 2: "c"}
+    if schema == Dict[str, str]:
+        expected = {"1": "a", "yes": "b", "2": "c"}
+    assert tree == expected
+
+
+@pytest.mark.parametrize("schema", [Any, {"x": Entity}, Dict[str, Entity]])
+def test_schema_null_entity(schema):
+    for document in ["x: null(a=1)", "x: null(1, 2)", "x: null()"]:
+        tree = neon.decode(document, schema=schema)
+        assert tree == neon.decode(document)
+        assert tree["x"].value is None
+
+
+def test_schema_unsupported():
+    with pytest.raises(TypeError):
+        neon.decode("a: 1", schema={"a": set})
+
+
+@pytest.mark.parametrize("hook", ["object_pairs_hook", "list_hook", "entity_hook"])
+def test_schema_hooks(hook):
+    with pytest.raises(TypeError, match="Hooks cannot be combined with a schema."):
+        neon.decode("a: 1", schema=dict, **{hook: list})
+    with pytest.raises(TypeError, match="Hooks cannot be combined with a schema."):
+        neon.load(io.StringIO("a: 1"), schema=dict, **{hook: list})
+
+
+def test_schema_skips_inference():
+    stats = ParseStats()
+    neon.decode(
+        "a: May 2015\nb: [2015-05-01]", schema={"a": str, "b": list}, stats=stats
+    )
+    assert stats.datetime_parses == 1
+    assert stats.documents == 1
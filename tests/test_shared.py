@@ -0,0 +1,185 @@
+import multiprocessing
+import sys
+from collections.abc import Mapping, MutableMapping, MutableSequence, Sequence
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import neon
+from neon import shared
+from neon.entity import Entity
+
+from .test_decoder import NEON_DECODE_SAMPLE
+
+NEON_KEYS = """
+1: one
+2.5: two and a half
+null: none
+2015-01-01: new year
+name: Homer
+"""
+
+NEON_LISTS = """
+children: [Bart, Lisa, Maggie]
+empty: []
+nested: [[1, 2], [], {a: b}]
+"""
+
+
+@pytest.fixture
+def publish():
+    pytest.importorskip("multiprocessing.shared_memory")
+    documents = []
+
+    def publish(config):
+        document = neon.publish(config)
+        documents.append(document)
+        return document
+
+    yield publish
+    for document in documents:
+        document.close()
+        document.unlink()
+
+
+def test_publish(publish):
+    document = publish(NEON_DECODE_SAMPLE)
+    attached = neon.attach(document.name)
+    try:
+        assert attached.tree == neon.decode(NEON_DECODE_SAMPLE)
+        assert attached.size == document.size
+    finally:
+        attached.close()
+
+
+def test_views_are_read_only(publish):
+    tree = publish(NEON_DECODE_SAMPLE).tree
+    assert isinstance(tree, Mapping)
+    assert not isinstance(tree, MutableMapping)
+    assert isinstance(tree["children"], Sequence)
+    assert not isinstance(tree["children"], MutableSequence)
+    with pytest.raises(TypeError):
+        tree["name"] = "Bart"
+
+
+def test_mapping(publish):
+    tree = publish(NEON_KEYS).tree
+    assert list(tree) == list(neon.decode(NEON_KEYS))
+    assert tree[1] == tree[1.0] == "one"
+    assert tree[2.5] == "two and a half"
+    assert tree[True] == "one"
+    assert tree[None] == "none"
+    assert tree[datetime(2015, 1, 1)] == "new year"
+    assert tree["name"] == "Homer"
+    assert "name" in tree
+    assert "Name" not in tree
+    assert [1] not in tree
+    with pytest.raises(KeyError):
+        tree["1"]
+    assert dict(tree.items()) == neon.decode(NEON_KEYS)
+    assert list(tree.values()) == list(neon.decode(NEON_KEYS).values())
+
+
+def test_sequence(publish):
+    tree = publish(NEON_LISTS).tree
+    children = tree["children"]
+    assert len(children) == 3
+    assert children[0] == "Bart"
+    assert children[-1] == "Maggie"
+    assert children[1:] == ["Lisa", "Maggie"]
+    assert children == ["Bart", "Lisa", "Maggie"]
+    assert children != ["Bart", "Lisa"]
+    assert children != "BartLisaMaggie"
+    with pytest.raises(IndexError):
+        children[3]
+    assert tree["empty"] == []
+    assert tree["nested"] == [[1, 2], [], {"a": "b"}]
+
+
+def test_entity(publish):
+    tree = publish("column: Column(integer, nullable=yes)").tree
+    column = tree["column"]
+    assert isinstance(column, Entity)
+    assert column.value == "Column"
+    assert column.attributes[0] == "integer"
+    assert column == Entity("Column", {0: "integer", "nullable": True})
+
+
+def test_scalars():
+    pytest.importorskip("multiprocessing.shared_memory")
+    tree = [
+        None,
+        False,
+        -(2**63),
+        2**64,
+        1.5,
+        "žluťoučký",
+        datetime(2015, 1, 1, 12, tzinfo=timezone(timedelta(hours=2))),
+    ]
+    document = shared.publish(tree)
+    try:
+        assert document.tree == tree
+        assert document.tree[1] is False
+    finally:
+        document.close()
+        document.unlink()
+
+
+def test_equal_strings_stored_once():
+    layout = shared.encode([{"name": "Homer"}, {"name": "Homer"}])
+    assert layout.count(b"Homer") == 1
+    assert layout.count(b"name") == 1
+
+
+def test_publish_deep(publish):
+    tree = publish("a: " + "[{b: " * 5000 + "c" + "}]" * 5000).tree["a"]
+    for _ in range(5000):
+        tree = tree[0]["b"]
+    assert tree == "c"
+
+
+def test_unsupported_values():
+    with pytest.raises(TypeError, match="Cannot publish values of type 'set'."):
+        shared.encode({"a": {1, 2}})
+    with pytest.raises(TypeError, match="Cannot publish keys of type 'tuple'."):
+        shared.encode({(1, 2): "a"})
+
+
+def test_close(publish):
+    document = publish(NEON_LISTS)
+    children = document.tree["children"]
+    document.close()
+    with pytest.raises(ValueError):
+        children[0]
+
+
+def test_attach_not_published():
+    shared_memory = pytest.importorskip("multiprocessing.shared_memory")
+    memory = shared_memory.SharedMemory(create=True, size=64)
+    try:
+        with pytest.raises(ValueError, match="does not contain a published document"):
+            neon.attach(memory.name)
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def test_shared_memory_unavailable(monkeypatch):
+    monkeypatch.setitem(sys.modules, "multiprocessing.shared_memory", None)
+    monkeypatch.delattr(multiprocessing, "shared_memory", raising=False)
+    with pytest.raises(RuntimeError, match="requires Python 3.8"):
+        neon.publish(NEON_LISTS)
+    with pytest.raises(RuntimeError, match="requires Python 3.8"):
+        neon.attach("neon")
+
+
+def read_children(document):
+    return list(document.tree["children"][:3])
+
+
+def test_workers(publish):
+    document = publish(NEON_DECODE_SAMPLE)
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(2) as pool:
+        results = pool.map(read_children, [document] * 4)
+    assert results == [["Bart", "Lisa", "Maggie"]] * 4
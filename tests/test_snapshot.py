@@ -0,0 +1,153 @@
+import os
+import pickle
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from dateutil.tz import tz
+
+import neon
+from neon import snapshot
+from neon.entity import Entity
+
+NEON_SNAPSHOT = """
+name: Homer
+born: 1956-05-12 10:30:00+0000
+entity: Column(type=integer, 5)
+list: [1, 2.5, yes, null]
+"""
+
+EXPECTED = {
+    "name": "Homer",
+    "born": datetime(1956, 5, 12, 10, 30, tzinfo=tz.tzutc()),
+    "entity": Entity("Column", {"type": "integer", 1: 5}),
+    "list": [1, 2.5, True, None],
+}
+
+
+@pytest.fixture
+def config(tmp_path):
+    path = tmp_path / "config.neon"
+    path.write_text(NEON_SNAPSHOT, encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / "cache")
+
+
+def fail_parse(*args, **kwargs):
+    raise AssertionError("snapshot not used")
+
+
+def test_load_file(config):
+    assert neon.load_file(config) == EXPECTED
+
+
+@pytest.mark.parametrize("newline", ["\r\n", "\r"])
+def test_load_file_newlines(tmp_path, cache_dir, newline):
+    path = tmp_path / "config.neon"
+    path.write_bytes(NEON_SNAPSHOT.replace("\n", newline).encode("utf-8"))
+    assert neon.load_file(str(path)) == EXPECTED
+    assert neon.load_file(str(path), cache_dir) == EXPECTED
+    assert neon.load_file(str(path), cache_dir) == EXPECTED
+
+
+def test_snapshot_reused(config, cache_dir, monkeypatch):
+    assert neon.load_file(config, cache_dir) == EXPECTED
+    assert os.listdir(cache_dir) == [
+        os.path.basename(snapshot.snapshot_path(config, cache_dir))
+    ]
+
+    monkeypatch.setattr(snapshot, "parse", fail_parse)
+    result = neon.load_file(config, cache_dir)
+    assert result == EXPECTED
+    assert result["born"].tzinfo == tz.tzutc()
+
+
+def test_snapshot_invalidated(config, cache_dir):
+    neon.load_file(config, cache_dir)
+    with open(config, "a", encoding="utf-8") as fp:
+        fp.write("age: 39\n")
+    assert neon.load_file(config, cache_dir)["age"] == 39
+    assert neon.load_file(config, cache_dir, datetime="off")["born"] == (
+        "1956-05-12 10:30:00+0000"
+    )
+    assert len(os.listdir(cache_dir)) == 1
+
+
+def test_snapshot_corrupted(config, cache_dir):
+    neon.load_file(config, cache_dir)
+    path = snapshot.snapshot_path(config, cache_dir)
+    with open(path, "r+b") as fp:
+        fp.truncate(len(snapshot.MAGIC) + 40)
+    assert neon.load_file(config, cache_dir) == EXPECTED
+    assert neon.load_file(config, cache_dir) == EXPECTED
+
+
+@pytest.mark.parametrize(
+    "tree",
+    [
+        None,
+        [True, False, -(2**63), 2**64, 1.5, "žluťoučký", ""],
+        {1: {"a": []}, 2.5: Entity("Column", {})},
+        datetime(2015, 1, 1, 12, 30, 15, 500),
+        datetime(2015, 1, 1, tzinfo=tz.tzoffset(None, -7200)),
+        datetime(2015, 1, 1, tzinfo=tz.tzoffset("CET", 3600)),
+        datetime(2015, 1, 1, tzinfo=tz.tzlocal()),
+        datetime(2015, 1, 1, tzinfo=timezone(timedelta(hours=2))),
+    ],
+)
+def test_encode(tree):
+    out = bytearray()
+    snapshot.encode(tree, out)
+    decoded = snapshot.decode(bytes(out))
+    assert decoded == tree
+    assert type(decoded) is type(tree)
+    if isinstance(tree, datetime):
+        assert decoded.tzinfo == tree.tzinfo
+        assert decoded.tzname() == tree.tzname()
+
+
+def test_snapshot_deep(tmp_path, cache_dir, monkeypatch):
+    path = tmp_path / "deep.neon"
+    path.write_text("a: " + "[{b: E(" * 5000 + "c" + ")}]" * 5000, encoding="utf-8")
+    neon.load_file(str(path), cache_dir)
+    assert os.path.exists(snapshot.snapshot_path(str(path), cache_dir))
+
+    monkeypatch.setattr(snapshot, "parse", fail_parse)
+    value = neon.load_file(str(path), cache_dir)["a"]
+    for _ in range(5000):
+        value = value[0]["b"]
+        assert value.value == "E"
+        value = value.attributes[0]
+    assert value == "c"
+
+
+def test_encode_unsupported():
+    with pytest.raises(TypeError, match="Cannot store values of type 'set'."):
+        snapshot.encode({"a": {1, 2}}, bytearray())
+
+
+def test_snapshot_not_pickled(config, cache_dir):
+    neon.load_file(config, cache_dir)
+    path = snapshot.snapshot_path(config, cache_dir)
+    with open(path, "rb") as fp:
+        header = fp.read(len(snapshot.MAGIC) + 32)
+    with open(path, "wb") as fp:
+        fp.write(header + pickle.dumps("unpickled"))
+    assert neon.load_file(config, cache_dir) == EXPECTED
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="files have no owners")
+def test_snapshot_permissions(config, cache_dir, monkeypatch):
+    neon.load_file(config, cache_dir)
+    assert os.stat(cache_dir).st_mode & 0o777 == 0o700
+
+    uid = os.getuid() + 1
+    monkeypatch.setattr(os, "getuid", lambda: uid)
+    monkeypatch.setattr(snapshot, "parse", lambda *args, **kwargs: "parsed")
+    assert neon.load_file(config, cache_dir) == "parsed"
+    os.remove(snapshot.snapshot_path(config, cache_dir))
+    assert neon.load_file(config, cache_dir) == "parsed"
+    assert os.listdir(cache_dir) == []
@@ -0,0 +1,64 @@
+import io
+
+import pytest
+
+import neon
+from neon import decoder, errors
+from neon.stats import PHASES, ParseStats
+from neon.tokens import DateTime
+
+NEON_STATS = """
+name: Homer
+born: 1956-05-12
+children:
+    - Bart
+    - {name: Lisa, toys: [saxophone]}
+column: Column(type=integer)
+"""
+
+
+def test_stats_collected():
+    stats = ParseStats()
+    tree = neon.decode(NEON_STATS, stats=stats)
+    assert tree == neon.decode(NEON_STATS)
+    assert stats.documents == 1
+    assert stats.max_depth == 4
+    assert stats.datetime_parses == 1
+    assert stats.cache_hits + stats.cache_misses == stats.datetime_parses
+    info = stats.info()
+    assert "tokens.literal" not in info
+    assert info["tokens.datetime"] == 1
+    assert info["tokens.colon"] == 6
+    assert info["tokens.indent"] == 1
+    assert info["tokens.dedent"] == 1
+    assert info["tokens.leftsquare"] == info["tokens.rightsquare"] == 1
+    assert all(stats.times[phase] >= 0 for phase in PHASES)
+    assert sum(stats.times.values()) == pytest.approx(stats.total_time)
+
+
+def test_stats_accumulate():
+    stats = ParseStats()
+    neon.load(io.StringIO(NEON_STATS), chunk_size=8, stats=stats)
+    tokens = sum(stats.tokens.values())
+    neon.decode("- [[1, 2]]", datetime="off", stats=stats)
+    assert stats.documents == 2
+    assert stats.max_depth == 4
+    assert stats.datetime_parses == 1
+    assert sum(stats.tokens.values()) == tokens + 9
+
+
+def test_stats_of_error():
+    stats = ParseStats()
+    with pytest.raises(errors.ParserError):
+        neon.decode("a: [b, c}", stats=stats)
+    assert stats.documents == 1
+    assert stats.total_time > 0
+
+
+def test_stats_disabled(monkeypatch):
+    def fail(*args):
+        raise AssertionError("statistics collected")
+
+    monkeypatch.setattr(decoder, "_measured_parse", fail)
+    DateTime.cache.clear()
+    assert neon.decode(NEON_STATS)["name"] == "Homer"
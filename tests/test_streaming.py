@@ -0,0 +1,93 @@
+import io
+
+import pytest
+
+import neon
+from neon import errors
+
+from .test_decoder import NEON_DECODE_SAMPLE
+
+NEON_MULTILINE_STRING = """
+a: "first
+second"
+b: 'x'
+"""
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_load_chunks(chunk_size):
+    expected = neon.decode(NEON_DECODE_SAMPLE)
+    assert neon.load(io.StringIO(NEON_DECODE_SAMPLE), chunk_size) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64])
+def test_load_multiline_string(chunk_size):
+    expected = {"a": "first\nsecond", "b": "x"}
+    assert neon.load(io.StringIO(NEON_MULTILINE_STRING), chunk_size) == expected
+
+
+NEON_SURROUNDING_WHITESPACE = """
+
+- a
+- b
+\t
+"""
+
+
+def test_load_surrounding_whitespace():
+    fp = io.StringIO(NEON_SURROUNDING_WHITESPACE)
+    assert neon.load(fp, 2) == ["a", "b"]
+
+
+NEON_BAD_INDENT = """
+# comment
+
+a:
+  - b
+   - c
+"""
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 64])
+def test_load_error_line(chunk_size):
+    with pytest.raises(errors.ParserError) as excinfo:
+        neon.load(io.StringIO(NEON_BAD_INDENT), chunk_size)
+    assert str(excinfo.value) == "Unexpected indent on line 6."
+
+
+def test_decode_file_object():
+    assert neon.decode(io.StringIO("a: b")) == {"a": "b"}
+
+
+NEON_CHUNK_BOUNDARIES = [
+    "a:\n\tb: 1\n  \n# comment\nc: 2\n",
+    "a: 1  \n\n \t \n  # comment\n\nb: 2",
+    "a:\n  b: 1\n    \n  c: 2\n",
+    "a: \"first\n  \n# not a comment\nsecond\"\nb: 'x\\'y\n'\n",
+    'a: "escaped \\" quote"\nb: "never\\\nc: d\n',
+    "a: [b,\n  \n   # c\n d]\n\n\n",
+    "a: b\r\n",
+    "\r\na: b",
+    "a: b\n\x0c",
+    "\xa0a: b",
+    " \r\n\t\u2003\na:\n  b: 1\n \x0c\n\u3000",
+    NEON_DECODE_SAMPLE,
+]
+
+
+def decoded(decode):
+    try:
+        return decode()
+    except (errors.ParserError, errors.TokenError) as error:
+        return type(error), str(error)
+
+
+@pytest.mark.parametrize("lexer", ["re", "linear"])
+@pytest.mark.parametrize("document", NEON_CHUNK_BOUNDARIES)
+def test_load_any_chunk_size(document, lexer):
+    expected = decoded(lambda: neon.decode(document, lexer=lexer))
+    # White-space around the document is dropped as by str.strip.
+    assert decoded(lambda: neon.decode(document.strip(), lexer=lexer)) == expected
+    for chunk_size in range(1, len(document) + 1):
+        fp = io.StringIO(document)
+        assert decoded(lambda: neon.load(fp, chunk_size, lexer=lexer)) == expected
@@ -0,0 +1,69 @@
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import neon
+from neon.stats import ParseStats
+from neon.utils import LRUCache
+
+from .test_decoder import NEON_DECODE_SAMPLE
+
+NEON_DATES = "\n".join(
+    "date{0}: 2015-01-{1:02d}".format(number, number % 28 + 1) for number in range(60)
+)
+
+
+@pytest.fixture
+def switching():
+    """Switches threads as often as possible to expose races."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_decode_in_threads(switching):
+    documents = [NEON_DECODE_SAMPLE, NEON_DATES] * 20
+    expected = [neon.decode(document) for document in documents]
+    with ThreadPoolExecutor(8) as executor:
+        assert list(executor.map(neon.decode, documents)) == expected
+
+
+def test_stats_in_threads(switching):
+    def decode(document):
+        stats = ParseStats()
+        neon.decode(document, stats=stats)
+        return stats
+
+    with ThreadPoolExecutor(8) as executor:
+        for stats in executor.map(decode, [NEON_DATES] * 20):
+            assert stats.cache_hits + stats.cache_misses == stats.datetime_parses
+
+
+def test_lru_cache_in_threads(switching):
+    cache = LRUCache(4)
+
+    def lookup(offset):
+        for number in range(20000):
+            key = (number * 7 + offset) % 6
+            if cache.get(key) is None:
+                cache.set(key, key)
+
+    threads = [threading.Thread(target=lookup, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    info = cache.info()
+    assert info["hits"] + info["misses"] == 8 * 20000
+    assert info["size"] == 4
+
+
+def test_lazy_in_threads(switching):
+    document = neon.decode_lazy(NEON_DATES)
+    keys = ["date{}".format(number) for number in range(60)]
+    with ThreadPoolExecutor(8) as executor:
+        values = list(executor.map(document.__getitem__, reversed(keys)))
+    assert values[::-1] == [neon.decode(NEON_DATES)[key] for key in keys]
@@ -0,0 +1,97 @@
+import pytest
+
+from neon import decoder, errors
+from neon.tokens import (
+    Colon,
+    Comma,
+    Dedent,
+    End,
+    Hyphen,
+    Indent,
+    Integer,
+    LeftSquare,
+    NewLine,
+    RightSquare,
+    String,
+)
+
+NEON_TOKENS = """
+a:
+  b: [1, c]
+d: e
+"""
+
+
+def test_token_kinds():
+    tokens = decoder.tokenize(NEON_TOKENS)
+    kinds = []
+    while tokens.next() != End.kind:
+        kinds.append(tokens.kinds[tokens.pos])
+    assert kinds == [
+        String.kind,
+        Colon.kind,
+        NewLine.kind,
+        Indent.kind,
+        String.kind,
+        Colon.kind,
+        LeftSquare.kind,
+        Integer.kind,
+        Comma.kind,
+        String.kind,
+        RightSquare.kind,
+        NewLine.kind,
+        Dedent.kind,
+        NewLine.kind,
+        String.kind,
+        Colon.kind,
+        String.kind,
+    ]
+
+
+def test_token_positions():
+    tokens = decoder.tokenize(NEON_TOKENS)
+    found = []
+    while tokens.next() != End.kind:
+        if tokens.kinds[tokens.pos] == String.kind:
+            start, end = tokens.starts[tokens.pos], tokens.ends[tokens.pos]
+            found.append((tokens.value, tokens.line, NEON_TOKENS[start:end]))
+    assert found == [
+        ("a", 2, "a"),
+        ("b", 3, "b"),
+        ("c", 3, "c"),
+        ("d", 4, "d"),
+        ("e", 4, "e"),
+    ]
+
+
+def test_token_lookahead():
+    tokens = decoder.tokenize("a: b")
+    assert tokens.peek() == String.kind
+    assert tokens.advance(decoder.Kinds(String)) == String.kind
+    assert tokens.peek() == Colon.kind
+    tokens.advance()
+    tokens.advance()
+    assert tokens.peek() == End.kind
+    assert tokens.advance() == End.kind
+    assert tokens.advance() == End.kind
+
+
+def test_advance_kinds():
+    tokens = decoder.tokenize("a\n\n  - b")
+    assert tokens.advance(skip=decoder.SKIP_NEWLINE) == String.kind
+    assert tokens.advance(skip=decoder.SKIP_BLANK) == Hyphen.kind
+    with pytest.raises(errors.ParserError) as excinfo:
+        tokens.advance(decoder.EXPECT_ROUND_ITEM)
+    assert str(excinfo.value) == (
+        "Unexpected string on line 3, expected '=' or ',' or ')'."
+    )
+
+
+def test_consumed_tokens_discarded(monkeypatch):
+    monkeypatch.setattr(decoder, "BATCH_SIZE", 16)
+    tokens = decoder.tokenize("\n".join("- {}".format(i) for i in range(1000)))
+    count = 0
+    while tokens.next() != End.kind:
+        count += 1
+        assert len(tokens.kinds) < 64
+    assert count == 1000 * 3 - 1
@@ -1,8 +1,10 @@
 from datetime import datetime
 
+import pytest
 from dateutil.tz import tz
 
 import neon
+from neon.utils import LRUCache
 
 NEON_ENTITY = """
 entity: Column(something, type=int)
@@ -66,3 +68,95 @@ def test_string_escaping():
     assert neon.decode('key: "msg \\" end"') == {"key": 'msg " end'}
     assert neon.decode("key: 'msg \\' end'") == {"key": "msg ' end"}
     assert neon.decode('src: "\\\\usr\\\\share"') == {"src": "\\usr\\share"}
+
+
+NEON_WORDS = """
+- Springfield
+- App\\Service\\Handler
+- Homer Simpson
+- w1x2
+- sha256
+- v1.2
+- 3rd party
+- 5x
+"""
+
+
+def test_words_skip_datetime(monkeypatch):
+    def convert(string, engine):
+        raise AssertionError("{!r} is not a date".format(string))
+
+    monkeypatch.setattr(neon.tokens.DateTime, "convert", convert)
+    expected = ["Springfield", "App\\Service\\Handler", "Homer Simpson"]
+    expected += ["w1x2", "sha256", "v1.2", "3rd party", "5x"]
+    assert neon.decode(NEON_WORDS) == expected
+
+
+@pytest.mark.parametrize(
+    "string, expected",
+    [
+        ("2015-05-12", True),
+        ("12/05/2015", True),
+        ("10:30", True),
+        ("12.5.2015 10:30", True),
+        ("2015-05-12T10:30:00Z", True),
+        ("12 May", True),
+        ("w1x2", False),
+        ("v1.2", False),
+        ("5x", False),
+        ("1st", False),
+    ],
+)
+def test_datetime_matches(string, expected):
+    assert neon.tokens.DateTime.matches(string) is expected
+
+
+def test_datetime_names():
+    result = neon.decode("- May\n- Mayday\n- Sunset")
+    assert isinstance(result[0], datetime)
+    assert result[1:] == ["Mayday", "Sunset"]
+
+
+NEON_DATETIME_ENGINES = """
+- 2015-01-20
+- 2015-01-20 13:24:55
+- 20 May 2015
+"""
+
+
+def test_datetime_engines():
+    assert neon.decode(NEON_DATETIME_ENGINES, datetime="off") == [
+        "2015-01-20",
+        "2015-01-20 13:24:55",
+        "20 May 2015",
+    ]
+    assert neon.decode(NEON_DATETIME_ENGINES, datetime="iso") == [
+        datetime(2015, 1, 20),
+        datetime(2015, 1, 20, 13, 24, 55),
+        "20 May 2015",
+    ]
+    assert neon.decode(NEON_DATETIME_ENGINES, datetime="dateutil") == [
+        datetime(2015, 1, 20),
+        datetime(2015, 1, 20, 13, 24, 55),
+        datetime(2015, 5, 20),
+    ]
+
+
+def test_datetime_engine_unknown():
+    with pytest.raises(ValueError):
+        neon.decode("a: b", datetime="strptime")
+
+
+def test_datetime_cache(monkeypatch):
+    cache = LRUCache(2)
+    monkeypatch.setattr(neon.tokens.DateTime, "cache", cache)
+    neon.decode("- [2015-01-01, 2015-01-02, 2015-01-01, 2015-01-03, 5 May]")
+    assert cache.info() == {
+        "hits": 1,
+        "misses": 4,
+        "evictions": 2,
+        "size": 2,
+        "maxsize": 2,
+    }
+    cache.clear()
+    assert cache.info()["size"] == cache.info()["hits"] == 0